@@ -0,0 +1,15 @@
+from django.apps import AppConfig
+
+
+class CommonConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.common'
+    verbose_name = '公共组件'
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
+
+        from .pagination import invalidate_counts
+
+        post_save.connect(invalidate_counts, dispatch_uid='common_count_post_save')
+        post_delete.connect(invalidate_counts, dispatch_uid='common_count_post_delete')
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.common.query_shapes import check_shapes
+
+
+class Command(BaseCommand):
+    help = '调用各列表接口并比对列表查询的 SELECT 列，多取或少取列时以非零状态退出'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verbose-sql', action='store_true', help='输出完整 SQL')
+
+    def handle(self, *args, **options):
+        failed = 0
+        for name, sql, problems in check_shapes():
+            if problems:
+                failed += 1
+                self.stdout.write(self.style.ERROR(f'✗ {name}: {"；".join(problems)}'))
+            else:
+                self.stdout.write(self.style.SUCCESS(f'✓ {name}'))
+            if sql and (problems or options['verbose_sql']):
+                self.stdout.write(f'    {sql}')
+        if failed:
+            raise CommandError(f'{failed} 个列表接口的查询列与预期不一致')
@@ -0,0 +1,149 @@
+"""
+列表分页公共组件
+
+所有列表接口的 _Page 都继承 BasePage，总数统计经过以下策略：
+1. 精确总数按 (数据库, 规范化后的 SQL 与参数, 相关表的版本号) 缓存；
+   任一相关表发生写入时版本号递增，旧缓存自然失效。
+2. 配置 LIST_COUNT_ESTIMATE_THRESHOLD 后，无过滤条件的列表优先读取数据库统计信息
+   （PostgreSQL pg_class.reltuples、SQLite sqlite_stat1、MySQL information_schema），
+   估算值达到阈值时直接返回，并在响应中以 approximate 标记。
+
+表版本号保存在数据库中（apps.common.versions，名称 table:<表名>），所有 worker 共享，
+CACHES 为进程内缓存时其他进程也能看到写入。递增在写入事务提交后执行，不把计数器行锁带进
+出入库等业务事务；各进程最多每 LIST_COUNT_VERSION_POLL_INTERVAL 秒读取一次版本号，
+即其他 worker 写入后总数的最大滞后。
+"""
+import hashlib
+
+from django.apps import apps as global_apps
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import Paginator
+from django.db import connections, transaction
+from django.utils.functional import cached_property
+from rest_framework.pagination import PageNumberPagination
+
+from . import versions
+
+_VERSION_PREFIX = "table:"
+_COUNT_PREFIX = "listcount:"
+
+
+def _timeout() -> int:
+    return getattr(settings, "LIST_COUNT_CACHE_TIMEOUT", 60)
+
+
+def version_poll_interval() -> float:
+    return getattr(settings, "LIST_COUNT_VERSION_POLL_INTERVAL", 1.0)
+
+
+def bump_table_version(*models) -> None:
+    """标记模型对应数据表已变更；供绕过模型信号的批量写入（bulk_create、update）调用，提交后生效"""
+    names = [_VERSION_PREFIX + model._meta.db_table for model in models]
+    # 在提交后单独递增：写入方事务不持有计数器行锁；回滚的写入不递增
+    transaction.on_commit(lambda: versions.bump(*names), robust=True)
+
+
+def invalidate_counts(sender, **kwargs) -> None:
+    """post_save / post_delete 信号处理；普通更新也可能让行进出过滤条件，同样递增版本"""
+    # 迁移记录（MigrationRecorder.Migration）等不在全局注册表中的模型没有列表，
+    # 且迁移执行期间版本号表可能尚未创建
+    if sender._meta.apps is not global_apps:
+        return
+    bump_table_version(sender)
+
+
+def _estimate(queryset):
+    """读取数据库统计信息中的表行数估算值，不可用时返回 None"""
+    connection = connections[queryset.db]
+    table = queryset.model._meta.db_table
+    sql = {
+        "postgresql": "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+        # 每个索引一行，stat 首个数字为索引条目数；部分索引（如 wh_item_is_low_idx）只覆盖部分行，取最大值
+        "sqlite": "SELECT MAX(CAST(stat AS INTEGER)) FROM sqlite_stat1 WHERE tbl = %s",
+        "mysql": "SELECT table_rows FROM information_schema.tables "
+                 "WHERE table_schema = DATABASE() AND table_name = %s",
+    }.get(connection.vendor)
+    if not sql:
+        return None
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [table])
+            row = cursor.fetchone()
+    except Exception:
+        return None
+    if not row or row[0] is None:
+        return None
+    try:
+        value = int(str(row[0]).split()[0])
+    except ValueError:
+        return None
+    return value if value >= 0 else None
+
+
+def count_objects(object_list):
+    """
+    统计查询集（或列表）的总数，返回 (total, approximate)。
+    """
+    if not hasattr(object_list, "query"):
+        return len(object_list), False
+
+    queryset = object_list.order_by()
+    threshold = getattr(settings, "LIST_COUNT_ESTIMATE_THRESHOLD", None)
+    if threshold is not None and not queryset.query.where:
+        estimate = _estimate(queryset)
+        if estimate is not None and estimate >= threshold:
+            return estimate, True
+
+    try:
+        sql, params = queryset.query.sql_with_params()
+    except EmptyResultSet:
+        return 0, False
+    tables = sorted(
+        {queryset.model._meta.db_table}
+        | {alias.table_name for alias in queryset.query.alias_map.values()}
+    )
+    current = versions.read([_VERSION_PREFIX + t for t in tables], version_poll_interval())
+    signature = "|".join([
+        queryset.db,
+        sql,
+        repr(params),
+        ",".join(f"{t}:{current[_VERSION_PREFIX + t]}" for t in tables),
+    ])
+    key = _COUNT_PREFIX + hashlib.md5(signature.encode()).hexdigest()
+    total = cache.get(key)
+    if total is None:
+        total = queryset.count()
+        cache.set(key, total, _timeout())
+    return total, False
+
+
+class CountingPaginator(Paginator):
+    """总数经 count_objects 计算（缓存 / 估算）的分页器"""
+
+    approximate = False
+
+    @cached_property
+    def count(self):
+        total, self.approximate = count_objects(self.object_list)
+        return total
+
+
+class BasePage(PageNumberPagination):
+    django_paginator_class = CountingPaginator
+    page_size_query_param = "size"
+    page_query_param = "page"
+
+    def get_payload(self, rows):
+        """组装列表响应 {list, total, page, size}；估算总数时附加 approximate"""
+        page = getattr(self, "page", None)
+        payload = {
+            "list": rows,
+            "total": page.paginator.count if page else len(rows),
+            "page": page.number if page else 1,
+            "size": self.get_page_size(self.request),
+        }
+        if page and page.paginator.approximate:
+            payload["approximate"] = True
+        return payload
@@ -0,0 +1,24 @@
+"""
+JSON 解析器
+
+FastJSONRenderer 的对应解析器：安装 orjson 且请求体为 UTF-8 时用它解析，
+否则回退到 DRF 的 JSONParser。orjson 同样拒绝 NaN/Infinity，与 STRICT_JSON 一致。
+"""
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser, get_encoding
+
+from .renderers import FastJSONRenderer, orjson
+
+_UTF8 = ("utf-8", "utf8")
+
+
+class FastJSONParser(JSONParser):
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None or get_encoding(parser_context or {}).lower() not in _UTF8:
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError("JSON parse error - %s" % str(exc))
@@ -0,0 +1,215 @@
+"""
+列表接口查询列检查
+
+SHAPES 列出各列表接口（含 fields 稀疏字段集、游标分页）应当发出的列表查询及其 SELECT 列；
+check_shapes 直接调用视图函数，捕获执行的 SQL，取出主表上的列表查询（跳过 COUNT），
+逐列比对。空表分页时不会发出列表查询，因此检查前在事务中为各表写入一行，结束后回滚。
+多取一列（例如整行加载带出 remark、select_related 带出 auth_user.password）
+或少取一列都判定为不一致。由 check_query_shapes 管理命令调用，可接入 CI。
+"""
+import re
+from datetime import date
+
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+
+_FROM = re.compile(r"\bFROM\s+[\"`]?(\w+)[\"`]?", re.IGNORECASE)
+
+
+def _columns(table, *names):
+    return [f"{table}.{name}" for name in names]
+
+
+def _shapes():
+    """(名称, 视图, 查询参数, 主表, 期望的 SELECT 列)"""
+    from apps.system import views as system_views
+    from apps.users import views as users_views
+    from apps.warehouse.views import inbound, item, outbound
+
+    item_columns = _columns(
+        "warehouse_item", "id", "item_code", "item_name", "category", "specification", "unit", "initial_stock",
+        "current_stock", "min_stock", "location", "remark", "is_low_stock", "created_at", "updated_at",
+    )
+    inbound_columns = (
+        _columns("warehouse_inbound", "id", "item_id")
+        + _columns("warehouse_item", "item_name")
+        + _columns("warehouse_inbound", "quantity", "inbound_date", "supplier")
+        + _columns("auth_user", "username")
+        + _columns("warehouse_inbound", "remark")
+    )
+    outbound_columns = (
+        _columns("warehouse_outbound", "id", "item_id")
+        + _columns("warehouse_item", "item_name")
+        + _columns("warehouse_outbound", "quantity", "outbound_date", "receiver", "reason")
+    )
+    employee_columns = _columns(
+        "users_employee", "id", "work_id", "name", "department", "category", "phone", "enabled", "remark",
+        "created_at", "updated_at",
+    )
+    instance_columns = _columns(
+        "system_flow_instance", "id", "flow_id", "flow_name", "target_type", "target_id", "status", "node_index",
+        "node_name", "approvals", "context", "applicant", "deadline", "created_at", "updated_at", "finished_at",
+    )
+    return [
+        ("stock_list", item.stock_list, {}, "warehouse_item", item_columns),
+        (
+            "stock_list fields",
+            item.stock_list,
+            {"fields": "itemCode,itemName,currentStock"},
+            "warehouse_item",
+            _columns("warehouse_item", "id", "item_code", "item_name", "current_stock"),
+        ),
+        (
+            "stock_list 游标分页 fields",
+            item.stock_list,
+            {"cursor": "", "fields": "itemName"},
+            "warehouse_item",
+            _columns("warehouse_item", "id", "item_name"),
+        ),
+        ("inbound_list", inbound.inbound_list, {}, "warehouse_inbound", inbound_columns),
+        (
+            "inbound_list 游标分页 fields",
+            inbound.inbound_list,
+            {"cursor": "", "fields": "itemName,quantity"},
+            "warehouse_inbound",
+            _columns("warehouse_inbound", "id")
+            + _columns("warehouse_item", "item_name")
+            + _columns("warehouse_inbound", "quantity", "inbound_date"),
+        ),
+        ("outbound_list", outbound.outbound_list, {}, "warehouse_outbound", outbound_columns),
+        (
+            "outbound_list fields",
+            outbound.outbound_list,
+            {"fields": "receiver"},
+            "warehouse_outbound",
+            # 游标排序键始终保留，页码分页下同样返回
+            _columns("warehouse_outbound", "id", "outbound_date", "receiver"),
+        ),
+        ("employee_list", users_views.employee_list, {}, "users_employee", employee_columns),
+        (
+            "employee_list fields",
+            users_views.employee_list,
+            {"fields": "work_id,name"},
+            "users_employee",
+            _columns("users_employee", "id", "work_id", "name"),
+        ),
+        ("flow_instance_list", system_views.flow_instance_list, {}, "system_flow_instance", instance_columns),
+        (
+            "flow_instance_list fields",
+            system_views.flow_instance_list,
+            {"fields": "status,nodeName"},
+            "system_flow_instance",
+            _columns("system_flow_instance", "id", "status", "node_name"),
+        ),
+        (
+            "route_list 快照",
+            system_views.route_list,
+            {},
+            "system_route",
+            _columns(
+                "system_route", "id", "path", "name", "component", "icon", "title", "hidden", "keep_alive", "sort",
+                "enabled", "created_at", "updated_at",
+            ),
+        ),
+        (
+            "api_list 快照",
+            system_views.api_list,
+            {},
+            "system_api",
+            _columns(
+                "system_api", "id", "name", "path", "method", "category", "description", "params", "headers",
+                "response", "timeout", "permission", "require_auth", "enabled", "created_at", "updated_at",
+            ),
+        ),
+        (
+            "flow_list 快照",
+            system_views.flow_list,
+            {},
+            "system_flow",
+            _columns(
+                "system_flow", "id", "name", "type", "description", "level", "timeout", "timeout_action",
+                "auto_pass_condition", "allow_revoke", "allow_transfer", "enabled", "nodes", "creator",
+                "created_at", "updated_at",
+            ),
+        ),
+    ]
+
+
+def _seed():
+    """各列表主表写入一行；bulk_create 不触发信号，列表总数缓存按表版本号失效"""
+    from apps.common.pagination import bump_table_version
+    from apps.system.models import ApiConfig, FlowConfig, FlowInstance, RouteConfig
+    from apps.users.models import Employee
+    from apps.warehouse.models import InboundRecord, Item, OutboundRecord
+
+    (item,) = Item.objects.bulk_create([Item(item_code="__shape_check__", item_name="查询列检查", category="其他")])
+    today = date.today()
+    InboundRecord.objects.bulk_create([InboundRecord(item=item, quantity=1, supplier="-", inbound_date=today)])
+    OutboundRecord.objects.bulk_create([
+        OutboundRecord(item=item, quantity=1, receiver="-", reason="-", outbound_date=today)
+    ])
+    Employee.objects.bulk_create([
+        Employee(work_id="__shape_check__", name="-", department="-", category="正式员工", phone="-")
+    ])
+    FlowInstance.objects.bulk_create([FlowInstance(flow_name="-", target_type="-", target_id=0)])
+    RouteConfig.objects.bulk_create([RouteConfig(path="/__shape_check__", name="-", component="-")])
+    ApiConfig.objects.bulk_create([ApiConfig(name="-", path="/__shape_check__", method="GET", category="-")])
+    FlowConfig.objects.bulk_create([FlowConfig(name="-")])
+    bump_table_version(Item, InboundRecord, OutboundRecord, Employee, FlowInstance)
+
+
+def select_columns(sql: str) -> list:
+    """SELECT 与第一个 FROM 之间的列，去掉别名与引号，形如 table.column"""
+    head = re.split(r"\s+FROM\s+", sql, maxsplit=1, flags=re.IGNORECASE)[0]
+    head = re.sub(r"^\s*SELECT\s+(?:DISTINCT\s+)?", "", head, flags=re.IGNORECASE)
+    columns = (re.split(r"\s+AS\s+", column, flags=re.IGNORECASE)[0] for column in head.split(","))
+    return [column.strip().replace('"', "").replace("`", "") for column in columns]
+
+
+def _list_query(queries, table):
+    for query in queries:
+        sql = query["sql"]
+        match = _FROM.search(sql)
+        if match and match.group(1) == table and not re.match(r"\s*SELECT\s+COUNT\(", sql, re.IGNORECASE):
+            return sql
+    return None
+
+
+def check_shapes():
+    """返回 [(名称, 实际 SQL, 问题列表)]"""
+    from apps.system import cache as config_cache
+
+    factory = APIRequestFactory()
+    results = []
+    with transaction.atomic():
+        _seed()
+        for name, view, params, table, expected in _shapes():
+            results.append(_check(factory, config_cache, name, view, params, table, expected))
+        transaction.set_rollback(True)
+    config_cache.clear_local()
+    return results
+
+
+def _check(factory, config_cache, name, view, params, table, expected):
+    # 快照列表平时命中进程内缓存，清空后才能观察到重建快照的查询
+    config_cache.clear_local()
+    with CaptureQueriesContext(connection) as captured:
+        response = view(factory.get("/", params))
+    sql = _list_query(captured.captured_queries, table)
+    problems = []
+    if response.status_code != 200:
+        problems.append(f"响应状态 {response.status_code}")
+    if sql is None:
+        problems.append(f"未找到 {table} 上的列表查询")
+    else:
+        actual = select_columns(sql)
+        extra = [column for column in actual if column not in expected]
+        missing = [column for column in expected if column not in actual]
+        if extra:
+            problems.append(f"多取列 {', '.join(extra)}")
+        if missing:
+            problems.append(f"缺少列 {', '.join(missing)}")
+        if not extra and not missing and actual != expected:
+            problems.append(f"列顺序不一致 {', '.join(actual)}")
+    return name, sql or "", problems
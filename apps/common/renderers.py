@@ -0,0 +1,49 @@
+"""
+JSON 渲染器
+
+安装 orjson 时用它序列化响应：date/datetime/time、UUID 原生输出，Decimal 转为浮点数，
+其余类型（惰性翻译字符串、QuerySet、timedelta 等）交给 DRF 的 JSONEncoder 处理，
+输出与 JSONRenderer 兼容（紧凑、不转义非 ASCII、转义 U+2028/U+2029）。
+datetime 与序列化器的 DateTimeField 一致：保留微秒，UTC 以 Z 结尾。
+未安装 orjson，或请求要求缩进（可浏览 API、Accept 带 indent）时回退到标准库 json。
+"""
+from decimal import Decimal
+
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - 未安装时回退到标准库
+    orjson = None
+
+# 非字符串键按字符串输出，与标准库 json 一致
+OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z if orjson else 0
+
+_encoder = JSONEncoder()
+
+
+def _default(obj):
+    if isinstance(obj, Decimal):
+        return float(obj)
+    return _encoder.default(obj)
+
+
+def dumps(data) -> bytes:
+    """序列化为 JSON 字节串，供渲染器与需要预先渲染响应体的缓存使用"""
+    if orjson is None:
+        return JSONRenderer().render(data)
+    ret = orjson.dumps(data, default=_default, option=OPTIONS)
+    # 与 JSONRenderer 一致：转义 U+2028/U+2029，保证输出是合法的 JavaScript
+    if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+        ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+    return ret
+
+
+class FastJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data)
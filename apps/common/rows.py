@@ -0,0 +1,130 @@
+"""
+列表行序列化
+
+列表接口逐行构造模型实例、再经 ModelSerializer 逐字段取值，单行开销远大于数据本身。
+RowSerializer 按声明的字段映射（数据库列 → 响应键）生成一个转换函数：
+查询集经 values_list 取出元组，转换函数按位置取值拼出字典，读路径上不创建模型实例。
+需要格式化的列（如与 DRF DateTimeField 一致的时间字符串）通过 converters 指定。
+
+列表接口支持 fields 查询参数（逗号分隔的响应键）请求稀疏字段集：project() 返回只含这些列的
+RowSerializer，查询随之只取这些列；主键与游标排序键始终保留。
+
+    ITEM_ROW = RowSerializer({"id": "id", "item_code": "itemCode", ...})
+    row = ITEM_ROW.project(request.query_params.get(FIELDS_QUERY_PARAM))
+    rows = row.many(row.values(queryset)[:20])
+"""
+from django.conf import settings
+from django.utils import timezone
+
+FIELDS_QUERY_PARAM = "fields"
+
+# 每个 RowSerializer 最多缓存的字段子集数；超出后按需编译、不再缓存
+MAX_PROJECTIONS = 64
+
+
+def iso_datetime(value):
+    """与 DRF DateTimeField 的输出一致：转换到当前时区，ISO 8601 格式，UTC 以 Z 结尾"""
+    if value is None:
+        return None
+    if settings.USE_TZ and timezone.is_aware(value):
+        value = timezone.localtime(value)
+    text = value.isoformat()
+    if text.endswith("+00:00"):
+        text = text[:-6] + "Z"
+    return text
+
+
+def empty_if_none(value):
+    return "" if value is None else value
+
+
+def _follow(obj, parts):
+    """沿外键链取属性，中途为 None 时返回 None（与 LEFT JOIN 的 values_list 结果一致）"""
+    for part in parts:
+        if obj is None:
+            return None
+        obj = getattr(obj, part)
+    return obj
+
+
+class RowSerializer:
+    """
+    fields 为有序映射：values_list 可用的列名（可跨外键，如 item__item_name）→ 响应中的键；
+    converters 为列名 → 单参数转换函数。响应字典的键顺序与 fields 一致。
+    """
+
+    def __init__(self, fields, converters=None):
+        self.fields = dict(fields)
+        self.columns = tuple(self.fields)
+        self.keys = tuple(self.fields.values())
+        self.converters = dict(converters or {})
+        unknown = set(self.converters) - set(self.columns)
+        if unknown:
+            raise ValueError(f"converters 中的列未在 fields 中声明: {', '.join(sorted(unknown))}")
+        self.convert = self._compile("row", lambda index, column: f"row[{index}]")
+        self.from_object = self._compile("obj", self._attribute)
+        self._projections = {}
+
+    def _attribute(self, index, column):
+        parts = column.split("__")
+        if len(parts) == 1:
+            return f"obj.{column}"
+        return f"_follow(obj, {tuple(parts)!r})"
+
+    def _compile(self, arg, accessor):
+        namespace = {"_follow": _follow}
+        items = []
+        for index, (column, key) in enumerate(self.fields.items()):
+            value = accessor(index, column)
+            if column in self.converters:
+                name = f"_c{index}"
+                namespace[name] = self.converters[column]
+                value = f"{name}({value})"
+            items.append(f"{key!r}: {value}")
+        source = f"def convert({arg}):\n    return {{{', '.join(items)}}}\n"
+        exec(compile(source, f"<RowSerializer {self.keys[:3]}>", "exec"), namespace)
+        return namespace["convert"]
+
+    def project(self, requested, keep=("id",)):
+        """
+        稀疏字段集：requested 为逗号分隔的响应键（也接受列名），返回只含这些列的 RowSerializer，
+        键顺序仍按声明顺序；keep 中的列（主键、游标排序键）始终保留。
+        requested 为空或其中没有可识别的字段时返回自身（完整字段集）。
+        """
+        if not requested:
+            return self
+        wanted = {name.strip() for name in str(requested).split(",")}
+        if not any(column in wanted or key in wanted for column, key in self.fields.items()):
+            return self
+        columns = tuple(
+            column for column, key in self.fields.items()
+            if column in wanted or key in wanted or column in keep
+        )
+        if columns == self.columns:
+            return self
+        projection = self._projections.get(columns)
+        if projection is None:
+            projection = RowSerializer(
+                {column: self.fields[column] for column in columns},
+                {column: func for column, func in self.converters.items() if column in columns},
+            )
+            if len(self._projections) < MAX_PROJECTIONS:
+                self._projections[columns] = projection
+        return projection
+
+    def pick(self, rows) -> list:
+        """从已转换的完整行字典（如进程内快照）中只保留本序列化器的键"""
+        keys = self.keys
+        return [{key: row[key] for key in keys} for row in rows]
+
+    def values(self, queryset):
+        """只取声明的列；返回具名元组，游标分页可按属性读取排序键"""
+        return queryset.values_list(*self.columns, named=True)
+
+    def many(self, rows) -> list:
+        """转换 values() 取出的行"""
+        return list(map(self.convert, rows))
+
+    def objects(self, instances) -> list:
+        """转换模型实例（写操作后已在内存中的对象）"""
+        return list(map(self.from_object, instances))
@@ -0,0 +1,44 @@
+"""
+搜索索引公共分词
+
+FTS5 的 unicode61 分词器把连续汉字视为一个词元，无法按子串检索中文。
+这里在写入索引前自行分词：每个汉字拆成独立词元，查询时把连续汉字组成短语；
+字母数字串额外写入全部后缀（长串截断为至多 MAX_SUFFIX_RUN 个字符），配合前缀查询支持子串匹配。
+
+FTS 查询只用于缩小候选集：各词元之间是 AND 关系，不保证相邻（“改11”也命中“改211”，
+“1 2”命中同时含 1 与 2 的行），但包含查询子串的行一定被命中，即候选集是 icontains 结果的超集。
+各应用的搜索模块再以原始关键字的 icontains 过滤候选行，结果与 icontains 完全一致，
+而 icontains 只需在少量候选行上执行。
+"""
+import re
+
+# 字母数字串的后缀截断到该长度，避免长串的索引膨胀；查询词元同样截断，仍按前缀命中
+MAX_SUFFIX_RUN = 32
+
+_CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uac00-\ud7af"
+_TOKEN_RE = re.compile(f"([{_CJK}]+)|([^\\W_{_CJK}]+)")
+
+
+def segment(*texts) -> str:
+    """把字段文本转换为索引文档：汉字逐字分隔，字母数字串附带全部后缀（每个至多 MAX_SUFFIX_RUN 个字符）"""
+    parts = []
+    for text in texts:
+        for cjk, word in _TOKEN_RE.findall((text or "").lower()):
+            if cjk:
+                parts.append(" ".join(cjk))
+            else:
+                parts.extend(word[i:i + MAX_SUFFIX_RUN] for i in range(len(word)))
+    return " ".join(parts)
+
+
+def match_expression(query: str):
+    """
+    把用户输入转换为 FTS5 查询表达式（候选集，需再按 icontains 过滤）；无可用词元时返回 None
+    """
+    terms = []
+    for cjk, word in _TOKEN_RE.findall((query or "").lower()):
+        if cjk:
+            terms.append('"%s"' % " ".join(cjk))
+        else:
+            terms.append('"%s"*' % word[:MAX_SUFFIX_RUN])
+    return " ".join(terms) or None
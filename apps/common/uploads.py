@@ -0,0 +1,159 @@
+"""
+文件导入导出公共组件
+
+read_upload_rows 流式解析上传的 csv/xlsx/xls 文件，stream_csv 流式输出 CSV 下载；
+仓库与员工等模块的导入导出接口共用。
+"""
+import codecs
+import csv
+import io
+import itertools
+from typing import Iterator, Tuple, Union
+
+from django.http import StreamingHttpResponse
+
+EXPORT_CHUNK_SIZE = 2000
+
+
+class _Echo:
+    """供 csv.writer 使用的伪文件对象，write 直接返回写入内容"""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(header, rows, filename: str, batch: int = 500):
+    """
+    以 StreamingHttpResponse 流式输出 CSV：先发送表头，再按批次输出数据行，
+    rows 应为惰性迭代器（例如 values_list().iterator()），内存占用与总行数无关。
+    """
+    writer = csv.writer(_Echo())
+
+    def generate():
+        yield writer.writerow(header)
+        buf = []
+        for row in rows:
+            buf.append(writer.writerow(row))
+            if len(buf) >= batch:
+                yield "".join(buf)
+                buf = []
+        if buf:
+            yield "".join(buf)
+
+    response = StreamingHttpResponse(generate(), content_type="text/csv")
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+_SNIFF_BYTES = 64 * 1024
+
+
+def _sniff_encoding(prefix: bytes) -> Union[str, None]:
+    """根据文件前缀判断编码：依次尝试 UTF-8（含 BOM）与 GBK，前缀末尾被截断的多字节字符不算错误"""
+    for enc in ("utf-8-sig", "gbk"):
+        try:
+            codecs.getincrementaldecoder(enc)().decode(prefix, final=False)
+            return enc
+        except UnicodeDecodeError:
+            continue
+    return None
+
+
+def _cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _rows_from_header(header, rows) -> Iterator[dict]:
+    keys = [str(c if c is not None else "").strip() for c in header]
+    width = len(keys)
+    for values in rows:
+        values = [_cell(v) for v in values]
+        if not any(v != "" for v in values):
+            continue
+        if len(values) < width:
+            values += [""] * (width - len(values))
+        yield dict(zip(keys, values))
+
+
+def _iter_csv(upload, encoding: str) -> Iterator[dict]:
+    upload.file.seek(0)
+    text = io.TextIOWrapper(upload.file, encoding=encoding, errors="replace", newline="")
+    try:
+        reader = csv.reader(text)
+        header = next(reader, None)
+        if header is not None:
+            yield from _rows_from_header(header, reader)
+    finally:
+        # 解除包装，避免 TextIOWrapper 被回收时关闭上传文件；迭代中途放弃时文件可能已先关闭
+        if not text.closed:
+            text.detach()
+
+
+def _iter_xlsx(workbook) -> Iterator[dict]:
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is not None:
+            yield from _rows_from_header(header, rows)
+    finally:
+        workbook.close()
+
+
+def _iter_xls(sheet) -> Iterator[dict]:
+    if sheet.nrows:
+        rows = (sheet.row_values(i) for i in range(1, sheet.nrows))
+        yield from _rows_from_header(sheet.row_values(0), rows)
+
+
+def read_upload_rows(upload) -> Tuple[Union[Iterator[dict], None], Union[str, None]]:
+    """
+    解析上传的 csv/xlsx/xls 文件，返回 (行迭代器, 错误信息)。
+
+    行按需逐条产出：CSV 仅读取一次前缀判断编码后用 csv 模块流式解析，
+    XLSX 使用 openpyxl 只读模式，不会把整个表格复制进内存。
+    """
+    name = (upload.name or "").lower()
+
+    if name.endswith(".csv"):
+        upload.file.seek(0)
+        encoding = _sniff_encoding(upload.file.read(_SNIFF_BYTES))
+        if encoding is None:
+            return None, "CSV 解析失败，请确认编码为 UTF-8/GBK"
+        rows = _iter_csv(upload, encoding)
+        try:
+            first = next(rows)
+        except StopIteration:
+            return iter(()), None
+        except csv.Error:
+            return None, "CSV 解析失败，请确认编码为 UTF-8/GBK"
+        return itertools.chain([first], rows), None
+
+    if name.endswith(".xlsx"):
+        upload.file.seek(0)
+        try:
+            from openpyxl import load_workbook
+
+            workbook = load_workbook(upload.file, read_only=True, data_only=True)
+        except ImportError:
+            return None, "缺少 openpyxl，请安装后再试"
+        except Exception:
+            return None, "Excel 解析失败，请确认文件未损坏"
+        return _iter_xlsx(workbook), None
+
+    if name.endswith(".xls"):
+        upload.file.seek(0)
+        try:
+            import xlrd
+
+            sheet = xlrd.open_workbook(file_contents=upload.file.read()).sheet_by_index(0)
+        except ImportError:
+            return None, "缺少 xlrd==1.2.0，请安装后再试，或另存为 xlsx/csv"
+        except Exception:
+            return None, "Excel 解析失败，请确认文件未损坏"
+        return _iter_xls(sheet), None
+
+    return None, "仅支持 csv、xlsx、xls 文件"
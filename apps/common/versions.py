@@ -0,0 +1,71 @@
+"""
+跨进程版本号
+
+进程内缓存（系统配置快照、认证上下文、列表总数）以版本号为键，版本号保存在数据库
+（apps.system 的 ConfigVersion 表，每个名称一行）中，所有 worker 共享：
+写入方递增版本号，其他进程下一次读取版本号即放弃旧值，不依赖 CACHES 是否为共享后端。
+
+read 可指定轮询间隔：间隔内复用本进程上次读到的值，间隔为 0 时每次都查询。
+bump 在当前事务内递增，与触发它的写入一起提交；本进程在提交后立即读到新值。
+"""
+import threading
+import time
+
+from django.db import transaction
+from django.db.models import F
+
+
+class _Local:
+    def __init__(self):
+        self.values = {}  # 名称 -> (版本号, 读取时的 time.monotonic())
+        self.lock = threading.Lock()
+
+
+_local = _Local()
+
+
+def _model():
+    from apps.system.models import ConfigVersion
+
+    return ConfigVersion
+
+
+def read(names, interval: float = 0) -> dict:
+    """返回 {名称: 版本号}，不存在的名称为 0"""
+    now = time.monotonic()
+    values = _local.values
+    stale = [
+        name for name in names
+        if interval <= 0 or name not in values or now - values[name][1] >= interval
+    ]
+    if stale:
+        rows = dict(_model().objects.filter(name__in=stale).values_list("name", "version"))
+        with _local.lock:
+            for name in stale:
+                values[name] = (rows.get(name, 0), now)
+    return {name: values[name][0] for name in names}
+
+
+def forget(*names) -> None:
+    """丢弃本进程读到的值，下次 read 重新查询；不传名称时全部丢弃"""
+    with _local.lock:
+        if names:
+            for name in names:
+                _local.values.pop(name, None)
+        else:
+            _local.values.clear()
+
+
+def bump(*names) -> None:
+    """递增一组版本号；缺少的行先以 ignore_conflicts 补齐（初值 0），再以一条 UPDATE 递增，并发递增不会丢失"""
+    names = sorted(set(names))
+    if not names:
+        return
+    model = _model()
+    queryset = model.objects.filter(name__in=names)
+    existing = set(queryset.values_list("name", flat=True))
+    missing = [model(name=name) for name in names if name not in existing]
+    if missing:
+        model.objects.bulk_create(missing, ignore_conflicts=True)
+    queryset.update(version=F("version") + 1)
+    transaction.on_commit(lambda: forget(*names))
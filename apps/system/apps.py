@@ -5,3 +5,13 @@ class SystemConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.system'
     verbose_name = '系统管理'
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
+
+        from . import cache
+        from .models import ApiConfig, FlowConfig, Menu, RouteConfig
+
+        for model in (Menu, RouteConfig, ApiConfig, FlowConfig):
+            post_save.connect(cache.on_config_changed, sender=model, dispatch_uid=f'system_config_saved_{model.__name__}')
+            post_delete.connect(cache.on_config_changed, sender=model, dispatch_uid=f'system_config_deleted_{model.__name__}')
@@ -0,0 +1,196 @@
+"""
+系统配置进程内缓存
+
+菜单树：一次查询取出全部菜单，按 parent_id 在内存中组装并用 MenuSerializer 序列化，
+同时预先渲染出完整菜单与“仅可见菜单”两份 JSON 响应体。
+路由、接口、流程配置：整表经 values_list 与行序列化（apps.common.rows）得到的快照，列表接口在快照上过滤、分页，
+导航包只取其中启用的部分。
+
+所有快照以全局配置版本号为键。版本号保存在 ConfigVersion 表中，菜单、路由、接口、
+流程配置的任何写入都经模型信号递增；各进程最多每 CONFIG_VERSION_POLL_INTERVAL 秒
+读取一次版本号，因此多个 worker 之间的配置变更最多滞后一个轮询间隔，
+本进程内的写入在提交后立即可见。
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+
+from apps.common.renderers import dumps
+
+from .models import ApiConfig, ConfigVersion, FlowConfig, Menu, RouteConfig
+from .serializers import API_ROW, FLOW_ROW, ROUTE_ROW, MenuSerializer, build_children_map
+
+VERSION_NAME = "config"
+
+
+class VersionedCache:
+    """按名称保存 (版本号, 值)；版本号与当前一致时直接返回，否则加锁重建"""
+
+    def __init__(self):
+        self._entries = {}
+        # 可重入：重建一个条目时可能读取其他条目（导航包依赖菜单、路由、接口快照）
+        self._lock = threading.RLock()
+
+    def get(self, name, version, build):
+        entry = self._entries.get(name)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None and entry[0] == version:
+                return entry[1]
+            # 版本号在重建前读取：重建期间发生的写入会让下一次读取再次重建
+            value = build()
+            self._entries[name] = (version, value)
+            return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_cache = VersionedCache()
+
+
+# ====== 配置版本 ======
+
+
+class _VersionState:
+    version = 0
+    checked_at = None
+
+
+_state = _VersionState()
+
+
+def poll_interval() -> float:
+    return getattr(settings, "CONFIG_VERSION_POLL_INTERVAL", 1.0)
+
+
+def config_version() -> int:
+    """当前配置版本；轮询间隔内复用上次读到的值"""
+    now = time.monotonic()
+    if _state.checked_at is not None and now - _state.checked_at < poll_interval():
+        return _state.version
+    _state.version = (
+        ConfigVersion.objects.filter(name=VERSION_NAME).values_list("version", flat=True).first() or 0
+    )
+    _state.checked_at = now
+    return _state.version
+
+
+def _expire_local_version() -> None:
+    _state.checked_at = None
+
+
+def clear_local() -> None:
+    """丢弃本进程的全部快照并在下次读取时重新读取版本号（供检查、基准脚本观察重建查询）"""
+    _cache.clear()
+    _expire_local_version()
+
+
+def bump_config_version() -> None:
+    """递增配置版本；提交后本进程下一次读取即看到新版本"""
+    updated = ConfigVersion.objects.filter(name=VERSION_NAME).update(version=F("version") + 1)
+    if not updated:
+        _, created = ConfigVersion.objects.get_or_create(name=VERSION_NAME, defaults={"version": 1})
+        if not created:
+            ConfigVersion.objects.filter(name=VERSION_NAME).update(version=F("version") + 1)
+    transaction.on_commit(_expire_local_version)
+
+
+def on_config_changed(sender, **kwargs):
+    """Menu、RouteConfig、ApiConfig、FlowConfig 的 post_save / post_delete 信号处理"""
+    bump_config_version()
+
+
+def render(data) -> bytes:
+    """渲染为与 views._success 相同的成功响应体"""
+    return dumps({"code": 200, "message": "success", "data": data})
+
+
+def _visible(nodes):
+    # 隐藏的菜单连同其整棵子树一起剔除
+    return [
+        {**node, "children": _visible(node["children"])}
+        for node in nodes
+        if node["visible"]
+    ]
+
+
+class MenuTree:
+    """序列化后的菜单树及其预渲染响应体"""
+
+    def __init__(self, tree):
+        self.tree = tree
+        self.visible_tree = _visible(tree)
+        self.tree_json = render(self.tree)
+        self.visible_json = render(self.visible_tree)
+
+
+def _build_menu_tree() -> MenuTree:
+    children_map = build_children_map(Menu.objects.order_by("sort", "created_at", "id"))
+    roots = children_map.get(None, [])
+    tree = MenuSerializer(roots, many=True, context={"children_map": children_map}).data
+    return MenuTree(tree)
+
+
+def menu_tree() -> MenuTree:
+    return _cache.get("menu", config_version(), _build_menu_tree)
+
+
+def route_snapshot():
+    """全部路由配置，顺序与 route_list 一致"""
+    return _cache.get(
+        "route",
+        config_version(),
+        lambda: ROUTE_ROW.many(ROUTE_ROW.values(RouteConfig.objects.order_by("sort", "-created_at"))),
+    )
+
+
+def api_snapshot():
+    """全部接口配置，顺序与 api_list 一致"""
+    return _cache.get(
+        "api",
+        config_version(),
+        lambda: API_ROW.many(API_ROW.values(ApiConfig.objects.order_by("-created_at"))),
+    )
+
+
+def flow_snapshot():
+    """全部流程配置，顺序与 flow_list 一致"""
+    return _cache.get(
+        "flow",
+        config_version(),
+        lambda: FLOW_ROW.many(FLOW_ROW.values(FlowConfig.objects.order_by("-created_at"))),
+    )
+
+
+def flow_index():
+    """流程配置快照按 id 索引"""
+    return _cache.get("flow_index", config_version(), lambda: {row["id"]: row for row in flow_snapshot()})
+
+
+# ====== 导航包 ======
+
+
+class NavConfig:
+    """导航包中与用户无关的部分：可见菜单树、启用的路由与接口，预渲染为 JSON 片段"""
+
+    def __init__(self, version):
+        self.version = version
+        routes = [row for row in route_snapshot() if row["enabled"]]
+        apis = [row for row in api_snapshot() if row["enabled"]]
+        self.body = b"".join([
+            b'"menus":', dumps(menu_tree().visible_tree),
+            b',"routes":', dumps(routes),
+            b',"apis":', dumps(apis),
+        ])
+
+
+def nav_config() -> NavConfig:
+    version = str(config_version())
+    return _cache.get("nav", version, lambda: NavConfig(version))
@@ -0,0 +1,527 @@
+"""
+审批流程引擎
+
+流程配置（FlowConfig.nodes）编译为只含审批节点的有序步骤，节点 condition 与
+auto_pass_condition 经 predicate 模块编译为条件函数。编译结果按 (流程 id, updated_at)
+缓存，配置未变化时重复使用；流程配置本身取自 apps.system.cache 的快照，不额外查询。
+
+节点格式：
+    {"name": "开始", "type": "start"}
+    {"name": "部门主管审批", "type": "approval", "approvers": ["张三"],
+     "approvalType": "or" | "and", "condition": "quantity > 100"}
+    {"name": "结束", "type": "end"}
+approvalType 为 or 时任一审批人同意即通过，为 and 时需全部审批人同意；
+condition 为假的节点被跳过；auto_pass_condition 为真时流程提交即通过。
+
+流程配置修改后，进行中的实例按新配置继续；当前节点已不存在时从其后的节点继续。
+
+超时：实例进入审批节点时记录截止时间 deadline = 当前时间 + FlowConfig.timeout 小时。
+process_timeouts 沿 (status, deadline) 索引按截止时间顺序分批取出已到期的实例，
+按流程的 timeout_action 自动驳回或升级到下一节点，每次只触及到期的实例。
+timeout_action 默认为 none（不处理），需在流程上显式开启。流程的超时配置修改后，
+reschedule_deadlines 按新配置重算进行中实例的截止时间。
+
+实例结束时在同一事务内发送 flow_finished 信号，业务模块据此落实审批结果。
+"""
+import logging
+import threading
+from datetime import timedelta
+from typing import Callable, FrozenSet, NamedTuple, Optional
+
+from django.db import transaction
+from django.db.models import F
+from django.dispatch import Signal
+from django.utils import timezone
+
+from apps.common.rows import RowSerializer
+
+from . import cache as config_cache
+from .models import FlowAction, FlowInstance
+from .predicate import ConditionError, compile_condition
+
+logger = logging.getLogger(__name__)
+
+EVALUATE_BATCH_SIZE = 1000
+TIMEOUT_BATCH_SIZE = 500
+# 批量处理时取出的字段：流转中读写的字段都要包含，否则每个实例会多一次查询
+_PENDING_FIELDS = (
+    "id", "flow_id", "target_type", "target_id", "status", "node_index", "context", "deadline", "finished_at",
+)
+
+# 实例结束（通过、驳回、撤回）后在写入状态的同一事务内发送，参数 instances 为结束的实例列表；
+# 业务模块据此处理审批结果，例如驳回的出库退回库存
+flow_finished = Signal()
+
+
+class FlowConfigError(ValueError):
+    """流程配置无法编译"""
+
+
+class FlowError(Exception):
+    """审批操作不合法"""
+
+
+class Step(NamedTuple):
+    index: int
+    name: str
+    approvers: FrozenSet[str]
+    mode: str
+    condition: Optional[Callable]
+
+    def applies(self, context) -> bool:
+        return self.condition is None or self.condition(context)
+
+
+class CompiledFlow:
+    def __init__(self, row, steps, auto_pass):
+        self.id = row["id"]
+        self.name = row["name"]
+        self.type = row.get("type") or ""
+        self.enabled = row.get("enabled", True)
+        self.allow_revoke = row.get("allowRevoke", True)
+        self.timeout = row.get("timeout") or 0
+        self.timeout_action = row.get("timeoutAction") or "none"
+        self.steps = steps
+        self.auto_pass = auto_pass
+        self._by_index = {step.index: pos for pos, step in enumerate(steps)}
+
+    def deadline(self, now):
+        """从 now 起进入一个审批节点时的截止时间；未配置超时或超时不处理时为 None"""
+        if self.timeout <= 0 or self.timeout_action == "none":
+            return None
+        return now + timedelta(hours=self.timeout)
+
+    def auto_passes(self, context) -> bool:
+        return self.auto_pass is not None and self.auto_pass(context)
+
+    def step_at(self, index) -> Optional[Step]:
+        pos = self._by_index.get(index)
+        return None if pos is None else self.steps[pos]
+
+    def next_step(self, after_index, context):
+        """返回 (序号大于 after_index 且条件成立的第一个步骤或 None, 被跳过的步骤列表)"""
+        skipped = []
+        for step in self.steps:
+            if step.index <= after_index:
+                continue
+            if step.applies(context):
+                return step, skipped
+            skipped.append(step)
+        return None, skipped
+
+
+# ====== 编译 ======
+
+
+def _compile_condition(source, where):
+    try:
+        return compile_condition(source)
+    except ConditionError as exc:
+        raise FlowConfigError(f"{where}: {exc}") from exc
+
+
+def compile_nodes(nodes, auto_pass_condition=""):
+    """校验并编译节点配置，返回 (步骤元组, 自动通过条件)；配置不合法时抛出 FlowConfigError"""
+    if not isinstance(nodes, list) or not nodes:
+        raise FlowConfigError("流程未配置节点")
+    if not all(isinstance(node, dict) for node in nodes):
+        raise FlowConfigError("节点配置格式错误")
+    types = [node.get("type") for node in nodes]
+    if types[0] != "start" or types[-1] != "end" or types.count("start") != 1 or types.count("end") != 1:
+        raise FlowConfigError("流程必须以唯一的开始节点开头、唯一的结束节点结尾")
+
+    steps = []
+    for index, node in enumerate(nodes):
+        kind = node.get("type")
+        name = str(node.get("name") or f"节点{index}")
+        if kind in ("start", "end"):
+            continue
+        if kind != "approval":
+            raise FlowConfigError(f"第{index + 1}个节点类型不支持: {kind}")
+        approvers = node.get("approvers") or []
+        if not isinstance(approvers, list) or not approvers:
+            raise FlowConfigError(f"审批节点“{name}”未配置审批人")
+        approvers = frozenset(str(a).strip() for a in approvers if str(a).strip())
+        if not approvers:
+            raise FlowConfigError(f"审批节点“{name}”未配置审批人")
+        mode = node.get("approvalType") or "or"
+        if mode not in ("or", "and"):
+            raise FlowConfigError(f"审批节点“{name}”的审批方式不支持: {mode}")
+        condition = _compile_condition(node.get("condition"), f"审批节点“{name}”的条件")
+        steps.append(Step(index, name, approvers, mode, condition))
+    return tuple(steps), _compile_condition(auto_pass_condition, "自动通过条件")
+
+
+def validate_config(nodes, auto_pass_condition="") -> None:
+    """保存配置前校验；尚未配置节点时只校验自动通过条件"""
+    if nodes:
+        compile_nodes(nodes, auto_pass_condition)
+    else:
+        _compile_condition(auto_pass_condition, "自动通过条件")
+
+
+_compiled = {}
+_compiled_lock = threading.Lock()
+
+
+def compiled_flow(row) -> CompiledFlow:
+    """按 (id, updatedAt) 缓存编译结果；row 为 FlowConfigSerializer 输出"""
+    key = row["updatedAt"]
+    entry = _compiled.get(row["id"])
+    if entry is not None and entry[0] == key:
+        return entry[1]
+    steps, auto_pass = compile_nodes(row.get("nodes"), row.get("autoPassCondition"))
+    flow = CompiledFlow(row, steps, auto_pass)
+    with _compiled_lock:
+        _compiled[row["id"]] = (key, flow)
+    return flow
+
+
+def get_flow(flow_id) -> Optional[CompiledFlow]:
+    row = config_cache.flow_index().get(flow_id)
+    return None if row is None else compiled_flow(row)
+
+
+def find_flow(flow_type) -> Optional[CompiledFlow]:
+    """指定类型的最新一个已启用流程"""
+    for row in config_cache.flow_snapshot():
+        if row.get("enabled") and row.get("type") == flow_type:
+            return compiled_flow(row)
+    return None
+
+
+# ====== 状态流转 ======
+
+
+def _action(instance, action, step=None, actor="", comment=""):
+    return FlowAction(
+        instance_id=instance.id,
+        node_index=step.index if step else -1,
+        node_name=step.name if step else "",
+        action=action,
+        actor=actor,
+        comment=comment,
+    )
+
+
+def _send_finished(instances) -> None:
+    finished = [instance for instance in instances if instance.status != "pending"]
+    if finished:
+        flow_finished.send(sender=FlowInstance, instances=finished)
+
+
+def _finish(instance, status, now) -> None:
+    instance.status = status
+    instance.node_index = -1
+    instance.node_name = ""
+    instance.approvals = []
+    instance.deadline = None
+    instance.finished_at = now
+    instance.updated_at = now
+
+
+def _advance(flow, instance, after_index, actions, now) -> None:
+    """移到 after_index 之后第一个条件成立的节点；没有则流程通过"""
+    step, skipped = flow.next_step(after_index, instance.context)
+    actions.extend(_action(instance, "skip", s) for s in skipped)
+    if step is None:
+        _finish(instance, "approved", now)
+    else:
+        instance.node_index = step.index
+        instance.node_name = step.name
+        instance.approvals = []
+        instance.deadline = flow.deadline(now)
+        instance.updated_at = now
+
+
+def _evaluate(flow, instance, actions, now) -> bool:
+    """对进行中的实例应用自动规则（自动通过、条件跳过），返回状态是否变化"""
+    if flow.auto_passes(instance.context):
+        actions.append(_action(instance, "auto_pass"))
+        _finish(instance, "approved", now)
+        return True
+    step = flow.step_at(instance.node_index)
+    if step is not None and step.applies(instance.context):
+        return False
+    if step is not None:
+        actions.append(_action(instance, "skip", step))
+    _advance(flow, instance, instance.node_index, actions, now)
+    return True
+
+
+def start(flow: CompiledFlow, target_type, target_id, context, applicant="") -> FlowInstance:
+    """为业务记录发起审批；自动通过或所有节点均被跳过时实例直接结束"""
+    now = timezone.now()
+    with transaction.atomic():
+        instance = FlowInstance.objects.create(
+            flow_id=flow.id,
+            flow_name=flow.name,
+            target_type=target_type,
+            target_id=target_id,
+            context=context,
+            applicant=applicant,
+        )
+        actions = [_action(instance, "submit", actor=applicant)]
+        _evaluate(flow, instance, actions, now)
+        instance.save()
+        FlowAction.objects.bulk_create(actions)
+        _send_finished([instance])
+    return instance
+
+
+def start_for_type(flow_type, target_type, target_id, context, applicant="") -> Optional[FlowInstance]:
+    """按流程类型发起审批；没有启用的流程或配置不合法时返回 None"""
+    try:
+        flow = find_flow(flow_type)
+    except FlowConfigError as exc:
+        logger.warning("流程“%s”配置不合法，跳过审批: %s", flow_type, exc)
+        return None
+    if flow is None:
+        return None
+    return start(flow, target_type, target_id, context, applicant)
+
+
+def act(instance_id, names, action, comment="") -> FlowInstance:
+    """
+    审批操作。names 为操作人的候选名称（用户名、姓名等），与节点审批人任一匹配即可；
+    action 为 approve / reject / revoke。
+    """
+    names = [name for name in names if name]
+    now = timezone.now()
+    with transaction.atomic():
+        instance = FlowInstance.objects.select_for_update().filter(pk=instance_id).first()
+        if instance is None:
+            raise FlowError("流程实例不存在")
+        if instance.status != "pending":
+            raise FlowError("流程已结束")
+        try:
+            flow = get_flow(instance.flow_id)
+        except FlowConfigError as exc:
+            raise FlowError(f"流程配置不合法: {exc}") from exc
+        if flow is None:
+            raise FlowError("流程配置不存在")
+
+        actor = names[0] if names else ""
+        actions = []
+        if action == "revoke":
+            if not flow.allow_revoke:
+                raise FlowError("该流程不允许撤回")
+            if instance.applicant and instance.applicant not in names:
+                raise FlowError("只有申请人可以撤回")
+            actions.append(_action(instance, "revoke", actor=actor, comment=comment))
+            _finish(instance, "revoked", now)
+        else:
+            step = flow.step_at(instance.node_index)
+            if step is None:
+                raise FlowError("当前节点已失效，请重新评估流程")
+            matched = [name for name in names if name in step.approvers]
+            if not matched:
+                raise FlowError("无权审批当前节点")
+            actor = matched[0]
+            if action == "reject":
+                actions.append(_action(instance, "reject", step, actor, comment))
+                _finish(instance, "rejected", now)
+            elif action == "approve":
+                actions.append(_action(instance, "approve", step, actor, comment))
+                approvals = set(instance.approvals) | {actor}
+                if step.mode == "and" and not step.approvers <= approvals:
+                    instance.approvals = sorted(approvals)
+                    instance.updated_at = now
+                else:
+                    _advance(flow, instance, step.index, actions, now)
+            else:
+                raise FlowError(f"不支持的操作: {action}")
+        instance.save()
+        FlowAction.objects.bulk_create(actions)
+        _send_finished([instance])
+    return instance
+
+
+# ====== 批量评估 ======
+
+
+def _write_changes(changed, actions) -> None:
+    """
+    按结果状态分组，每组一条带原状态条件的 UPDATE；并发操作已改动的实例不会被覆盖，
+    其操作记录也随之丢弃。
+    """
+    groups = {}
+    for instance, old_index in changed:
+        key = (
+            old_index, instance.status, instance.node_index, instance.node_name,
+            instance.deadline, instance.finished_at,
+        )
+        groups.setdefault(key, []).append(instance.id)
+    lost = set()
+    for (old_index, status, node_index, node_name, deadline, finished_at), ids in groups.items():
+        updated = FlowInstance.objects.filter(id__in=ids, status="pending", node_index=old_index).update(
+            status=status,
+            node_index=node_index,
+            node_name=node_name,
+            approvals=[],
+            deadline=deadline,
+            finished_at=finished_at,
+            updated_at=timezone.now(),
+        )
+        if updated != len(ids):
+            current = set(
+                FlowInstance.objects.filter(id__in=ids, status=status, node_index=node_index)
+                .values_list("id", flat=True)
+            )
+            lost.update(set(ids) - current)
+    FlowAction.objects.bulk_create(
+        [action for action in actions if action.instance_id not in lost],
+        batch_size=EVALUATE_BATCH_SIZE,
+    )
+    _send_finished([instance for instance, _ in changed if instance.id not in lost])
+
+
+def evaluate_pending(batch_size: int = EVALUATE_BATCH_SIZE, flow_ids=None) -> dict:
+    """
+    按主键分块扫描进行中的实例，应用自动通过与条件跳过规则，批量写回。
+    用于流程配置或业务数据变化后重新评估；返回 {scanned, changed, approved}。
+    """
+    result = {"scanned": 0, "changed": 0, "approved": 0}
+    last_id = 0
+    while True:
+        queryset = FlowInstance.objects.filter(status="pending", id__gt=last_id)
+        if flow_ids:
+            queryset = queryset.filter(flow_id__in=flow_ids)
+        chunk = list(
+            queryset.order_by("id").only(*_PENDING_FIELDS)[:batch_size]
+        )
+        if not chunk:
+            break
+        last_id = chunk[-1].id
+        now = timezone.now()
+        changed, actions = [], []
+        for instance in chunk:
+            try:
+                flow = get_flow(instance.flow_id)
+            except FlowConfigError:
+                continue
+            if flow is None:
+                continue
+            old_index = instance.node_index
+            if _evaluate(flow, instance, actions, now):
+                changed.append((instance, old_index))
+                if instance.status == "approved":
+                    result["approved"] += 1
+        with transaction.atomic():
+            _write_changes(changed, actions)
+        result["scanned"] += len(chunk)
+        result["changed"] += len(changed)
+    return result
+
+
+# ====== 超时处理 ======
+
+
+def _expire(flow, instance, actions, now) -> None:
+    """按流程的超时处理方式结束或升级一个到期实例"""
+    step = flow.step_at(instance.node_index)
+    actions.append(_action(instance, "timeout", step, comment=f"超过 {flow.timeout} 小时未处理"))
+    if flow.timeout_action == "escalate" and step is not None:
+        mark = len(actions)
+        _advance(flow, instance, step.index, actions, now)
+        if instance.status == "approved":
+            # 后面没有可升级的节点：超时不能让流程直接通过，按驳回处理
+            del actions[mark:]
+            _finish(instance, "rejected", now)
+    else:
+        _finish(instance, "rejected", now)
+
+
+def reschedule_deadlines(config, old_timeout, old_action) -> int:
+    """
+    流程超时配置修改后重算进行中实例的截止时间，返回更新的实例数。
+    截止时间以进入当前节点的时间起算：原先有截止时间的按新旧超时之差平移，
+    原先未开启超时的以 updated_at 近似进入时间；新配置不处理超时时清空截止时间。
+    重算后已到期的实例由下一轮 process_timeouts 处理。
+    """
+    pending = FlowInstance.objects.filter(flow_id=config.pk, status="pending", node_index__gte=0)
+    if config.timeout <= 0 or config.timeout_action == "none":
+        return pending.exclude(deadline=None).update(deadline=None)
+    updated = 0
+    stale = pending
+    if old_timeout > 0 and old_action != "none":
+        updated = pending.exclude(deadline=None).update(
+            deadline=F("deadline") + timedelta(hours=config.timeout - old_timeout)
+        )
+        stale = pending.filter(deadline=None)
+    return updated + stale.update(deadline=F("updated_at") + timedelta(hours=config.timeout))
+
+
+def process_timeouts(now=None, batch_size: int = TIMEOUT_BATCH_SIZE) -> dict:
+    """
+    处理截止时间不晚于 now 的进行中实例，返回 {expired, rejected, escalated, skipped}。
+    每批按 (deadline, id) 顺序取出到期实例，处理后它们的 deadline 被清空或后移，
+    下一批查询自然从剩余的到期实例开始。now 可由调用方注入，便于模拟时钟。
+    """
+    now = now or timezone.now()
+    result = {"expired": 0, "rejected": 0, "escalated": 0, "skipped": 0}
+    while True:
+        chunk = list(
+            FlowInstance.objects.filter(status="pending", deadline__lte=now)
+            .order_by("deadline", "id")
+            .only(*_PENDING_FIELDS)[:batch_size]
+        )
+        if not chunk:
+            return result
+        changed, actions, orphans = [], [], []
+        for instance in chunk:
+            try:
+                flow = get_flow(instance.flow_id)
+            except FlowConfigError:
+                flow = None
+            if flow is None or flow.timeout_action == "none":
+                orphans.append(instance.id)
+                continue
+            old_index = instance.node_index
+            _expire(flow, instance, actions, now)
+            changed.append((instance, old_index))
+            result["rejected" if instance.status == "rejected" else "escalated"] += 1
+        with transaction.atomic():
+            if orphans:
+                # 流程已删除、配置不合法或不处理超时：清除截止时间，避免每次重复取出
+                FlowInstance.objects.filter(id__in=orphans).update(deadline=None)
+            _write_changes(changed, actions)
+        result["expired"] += len(changed)
+        result["skipped"] += len(orphans)
+
+
+INSTANCE_ROW = RowSerializer({
+    "id": "id",
+    "flow_id": "flowId",
+    "flow_name": "flowName",
+    "target_type": "targetType",
+    "target_id": "targetId",
+    "status": "status",
+    "node_index": "nodeIndex",
+    "node_name": "nodeName",
+    "approvals": "approvals",
+    "context": "context",
+    "applicant": "applicant",
+    "deadline": "deadline",
+    "created_at": "createdAt",
+    "updated_at": "updatedAt",
+    "finished_at": "finishedAt",
+})
+
+ACTION_ROW = RowSerializer({
+    "id": "id",
+    "node_index": "nodeIndex",
+    "node_name": "nodeName",
+    "action": "action",
+    "actor": "actor",
+    "comment": "comment",
+    "created_at": "createdAt",
+})
+
+
+def instance_to_front(instance: FlowInstance) -> dict:
+    return INSTANCE_ROW.from_object(instance)
+
+
+def action_to_front(action: FlowAction) -> dict:
+    return ACTION_ROW.from_object(action)
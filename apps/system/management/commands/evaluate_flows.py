@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from apps.system import flow
+
+
+class Command(BaseCommand):
+    help = '重新评估进行中的审批实例（自动通过条件、节点条件跳过）'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=flow.EVALUATE_BATCH_SIZE)
+        parser.add_argument('--flow', type=int, action='append', dest='flow_ids', help='只评估指定流程，可重复')
+
+    def handle(self, *args, **options):
+        result = flow.evaluate_pending(batch_size=options['batch_size'], flow_ids=options['flow_ids'])
+        self.stdout.write(self.style.SUCCESS(
+            f"扫描 {result['scanned']} 个实例，状态变化 {result['changed']} 个，其中通过 {result['approved']} 个"
+        ))
@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.system import flow
+
+
+class Command(BaseCommand):
+    help = '定时处理审批超时：按流程配置自动驳回或升级到下一节点'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='处理完当前到期的实例后退出')
+        parser.add_argument('--interval', type=float, default=30.0, help='两次检查之间的间隔（秒）')
+        parser.add_argument('--batch-size', type=int, default=flow.TIMEOUT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        self.stdout.write('审批超时处理进程已启动')
+        while True:
+            close_old_connections()
+            result = flow.process_timeouts(batch_size=options['batch_size'])
+            if result['expired'] or result['skipped']:
+                self.stdout.write(
+                    f"超时 {result['expired']} 个：驳回 {result['rejected']} 个，升级 {result['escalated']} 个；"
+                    f"跳过 {result['skipped']} 个"
+                )
+            if options['once']:
+                return
+            time.sleep(options['interval'])
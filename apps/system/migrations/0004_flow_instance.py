@@ -0,0 +1,66 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('system', '0003_config_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FlowInstance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('flow_name', models.CharField(max_length=100, verbose_name='流程名称')),
+                ('target_type', models.CharField(max_length=50, verbose_name='业务类型')),
+                ('target_id', models.BigIntegerField(verbose_name='业务记录ID')),
+                ('status', models.CharField(choices=[('pending', '审批中'), ('approved', '已通过'), ('rejected', '已驳回'), ('revoked', '已撤回')], default='pending', max_length=20, verbose_name='状态')),
+                ('node_index', models.IntegerField(default=-1, verbose_name='当前节点序号')),
+                ('node_name', models.CharField(blank=True, max_length=100, verbose_name='当前节点')),
+                ('approvals', models.JSONField(default=list, verbose_name='当前节点已同意人')),
+                ('context', models.JSONField(default=dict, verbose_name='条件变量')),
+                ('applicant', models.CharField(blank=True, max_length=150, verbose_name='申请人')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='创建时间')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='更新时间')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='结束时间')),
+                ('flow', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='instances', to='system.flowconfig', verbose_name='流程')),
+            ],
+            options={
+                'verbose_name': '流程实例',
+                'verbose_name_plural': '流程实例列表',
+                'db_table': 'system_flow_instance',
+                'ordering': ['-id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='FlowAction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('node_index', models.IntegerField(default=-1, verbose_name='节点序号')),
+                ('node_name', models.CharField(blank=True, max_length=100, verbose_name='节点名称')),
+                ('action', models.CharField(choices=[('submit', '提交'), ('approve', '同意'), ('reject', '驳回'), ('revoke', '撤回'), ('auto_pass', '自动通过'), ('skip', '条件跳过')], max_length=20, verbose_name='操作')),
+                ('actor', models.CharField(blank=True, max_length=150, verbose_name='操作人')),
+                ('comment', models.TextField(blank=True, verbose_name='意见')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='操作时间')),
+                ('instance', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='actions', to='system.flowinstance', verbose_name='流程实例')),
+            ],
+            options={
+                'verbose_name': '流程操作',
+                'verbose_name_plural': '流程操作列表',
+                'db_table': 'system_flow_action',
+                'ordering': ['id'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='flowinstance',
+            index=models.Index(fields=['target_type', 'target_id'], name='flow_instance_target_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='flowinstance',
+            index=models.Index(fields=['status', 'id'], name='flow_instance_status_idx'),
+        ),
+    ]
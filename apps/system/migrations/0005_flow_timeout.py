@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('system', '0004_flow_instance'),
+    ]
+
+    # 超时处理需在流程上显式开启，已有流程默认不处理，因此不回填进行中实例的截止时间
+    operations = [
+        migrations.AddField(
+            model_name='flowconfig',
+            name='timeout_action',
+            field=models.CharField(choices=[('reject', '自动驳回'), ('escalate', '升级到下一节点'), ('none', '不处理')], default='none', max_length=20, verbose_name='超时处理'),
+        ),
+        migrations.AddField(
+            model_name='flowinstance',
+            name='deadline',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='当前节点截止时间'),
+        ),
+        migrations.AlterField(
+            model_name='flowaction',
+            name='action',
+            field=models.CharField(choices=[('submit', '提交'), ('approve', '同意'), ('reject', '驳回'), ('revoke', '撤回'), ('auto_pass', '自动通过'), ('skip', '条件跳过'), ('timeout', '超时')], max_length=20, verbose_name='操作'),
+        ),
+        migrations.AddIndex(
+            model_name='flowinstance',
+            index=models.Index(fields=['status', 'deadline'], name='flow_instance_deadline_idx'),
+        ),
+    ]
@@ -102,7 +102,16 @@ class FlowConfig(models.Model):
     type = models.CharField(max_length=50, blank=True, verbose_name='流程类型')
     description = models.TextField(blank=True, verbose_name='描述')
     level = models.CharField(max_length=20, choices=LEVEL_CHOICES, default='普通', verbose_name='审批级别')
+    TIMEOUT_ACTION_CHOICES = [
+        ('reject', '自动驳回'),
+        ('escalate', '升级到下一节点'),
+        ('none', '不处理'),
+    ]
+
     timeout = models.IntegerField(default=24, verbose_name='超时时间(小时)')
+    # 超时处理需显式开启：默认不处理，timeout 只作提示
+    timeout_action = models.CharField(max_length=20, choices=TIMEOUT_ACTION_CHOICES, default='none',
+                                      verbose_name='超时处理')
     auto_pass_condition = models.CharField(max_length=200, blank=True, verbose_name='自动通过条件')
     allow_revoke = models.BooleanField(default=True, verbose_name='是否允许撤回')
     allow_transfer = models.BooleanField(default=False, verbose_name='是否允许转审')
@@ -118,3 +127,94 @@ class FlowConfig(models.Model):
 
     def __str__(self):
         return self.name
+
+
+class ConfigVersion(models.Model):
+    """
+    跨进程版本号（apps.common.versions）：config 在菜单、路由、接口、流程配置任一写入时递增，
+    auth:<用户 id> 在用户认证数据变化时递增，table:<表名> 在数据表写入提交后递增；各进程据此判断本进程缓存是否过期
+    """
+    name = models.CharField(max_length=50, unique=True, verbose_name='名称')
+    version = models.BigIntegerField(default=0, verbose_name='版本号')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='更新时间')
+
+    class Meta:
+        db_table = 'system_config_version'
+        verbose_name = '配置版本'
+        verbose_name_plural = '配置版本列表'
+
+    def __str__(self):
+        return f"{self.name}: {self.version}"
+
+
+class FlowInstance(models.Model):
+    """流程实例：某条业务记录（如出库记录）按流程配置进行的一次审批"""
+    STATUS_CHOICES = [
+        ('pending', '审批中'),
+        ('approved', '已通过'),
+        ('rejected', '已驳回'),
+        ('revoked', '已撤回'),
+    ]
+
+    flow = models.ForeignKey(FlowConfig, on_delete=models.SET_NULL, null=True, related_name='instances',
+                             verbose_name='流程')
+    flow_name = models.CharField(max_length=100, verbose_name='流程名称')
+    target_type = models.CharField(max_length=50, verbose_name='业务类型')
+    target_id = models.BigIntegerField(verbose_name='业务记录ID')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', verbose_name='状态')
+    node_index = models.IntegerField(default=-1, verbose_name='当前节点序号')
+    node_name = models.CharField(max_length=100, blank=True, verbose_name='当前节点')
+    approvals = models.JSONField(default=list, verbose_name='当前节点已同意人')
+    context = models.JSONField(default=dict, verbose_name='条件变量')
+    applicant = models.CharField(max_length=150, blank=True, verbose_name='申请人')
+    deadline = models.DateTimeField(null=True, blank=True, verbose_name='当前节点截止时间')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='创建时间')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='更新时间')
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name='结束时间')
+
+    class Meta:
+        db_table = 'system_flow_instance'
+        verbose_name = '流程实例'
+        verbose_name_plural = '流程实例列表'
+        ordering = ['-id']
+        indexes = [
+            models.Index(fields=['target_type', 'target_id'], name='flow_instance_target_idx'),
+            # 批量评估按状态 + 主键分块扫描
+            models.Index(fields=['status', 'id'], name='flow_instance_status_idx'),
+            # 超时调度按截止时间顺序取到期实例
+            models.Index(fields=['status', 'deadline'], name='flow_instance_deadline_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.flow_name} {self.target_type}#{self.target_id} {self.get_status_display()}"
+
+
+class FlowAction(models.Model):
+    """流程操作记录"""
+    ACTION_CHOICES = [
+        ('submit', '提交'),
+        ('approve', '同意'),
+        ('reject', '驳回'),
+        ('revoke', '撤回'),
+        ('auto_pass', '自动通过'),
+        ('skip', '条件跳过'),
+        ('timeout', '超时'),
+    ]
+
+    instance = models.ForeignKey(FlowInstance, on_delete=models.CASCADE, related_name='actions',
+                                 verbose_name='流程实例')
+    node_index = models.IntegerField(default=-1, verbose_name='节点序号')
+    node_name = models.CharField(max_length=100, blank=True, verbose_name='节点名称')
+    action = models.CharField(max_length=20, choices=ACTION_CHOICES, verbose_name='操作')
+    actor = models.CharField(max_length=150, blank=True, verbose_name='操作人')
+    comment = models.TextField(blank=True, verbose_name='意见')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='操作时间')
+
+    class Meta:
+        db_table = 'system_flow_action'
+        verbose_name = '流程操作'
+        verbose_name_plural = '流程操作列表'
+        ordering = ['id']
+
+    def __str__(self):
+        return f"{self.instance_id} {self.node_name} {self.get_action_display()}"
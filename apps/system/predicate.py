@@ -0,0 +1,217 @@
+"""
+流程条件表达式编译
+
+把 auto_pass_condition、节点 condition 这类字符串（如 "amount > 5000 and category == '电子'"）
+用 ast 解析后逐节点编译为 Python 闭包，执行时只做取值与比较，不调用 eval/exec。
+
+支持：数字、字符串、布尔、None 常量与由它们组成的列表/元组；变量名（从上下文字典取值，
+不存在时为 None）；比较 == != < <= > >= in / not in（可链式）；and / or / not；
+算术 + - /；只接受数字的 * 与 %；一元正负号。兼容前端习惯的 &&、||、!、===、!== 写法。
+比较或运算的类型不匹配、除以零时结果视为 None，条件整体按假处理。
+* 与 % 只接受数字：字符串、列表与整数相乘，或字符串 % 格式化（如 '%0999999999d' % 1），
+都能构造任意大的对象。字符串或列表常量参与时编译即报错，变量参与时结果视为 None。
+"""
+import ast
+import io
+import operator
+import re
+import tokenize
+
+MAX_CONDITION_LENGTH = 500
+
+
+class ConditionError(ValueError):
+    """条件表达式无法编译"""
+
+
+_JS_OPERATORS = [
+    (re.compile(r"&&"), " and "),
+    (re.compile(r"\|\|"), " or "),
+    (re.compile(r"==="), "=="),
+    (re.compile(r"!(?!=)"), " not "),
+]
+
+_COMPARE = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.In: lambda a, b: a in b,
+    ast.NotIn: lambda a, b: a not in b,
+}
+
+
+def _numeric(func):
+    def run(a, b):
+        if not isinstance(a, (int, float)) or not isinstance(b, (int, float)):
+            raise TypeError("只支持数字运算")
+        return func(a, b)
+    return run
+
+
+# 不接受字符串、列表常量的运算及受限的操作数（左、右）
+_NUMERIC_ONLY = {
+    ast.Mult: ("left", "right"),
+    ast.Mod: ("left",),
+}
+
+
+_BINARY = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: _numeric(operator.mul),
+    ast.Div: operator.truediv,
+    ast.Mod: _numeric(operator.mod),
+}
+
+_UNARY = {
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+}
+
+
+def _rewrite(code: str) -> str:
+    # 先替换 !==，避免被 === 规则拆开
+    code = code.replace("!==", "!=")
+    for pattern, replacement in _JS_OPERATORS:
+        code = pattern.sub(replacement, code)
+    return code
+
+
+def _string_spans(source: str):
+    """用 tokenize 找出字符串字面量的 (起, 止) 偏移；无法分词时返回 None"""
+    starts = [0]
+    for line in source.splitlines(keepends=True):
+        starts.append(starts[-1] + len(line))
+    try:
+        tokens = list(tokenize.generate_tokens(io.StringIO(source).readline))
+    except (tokenize.TokenError, SyntaxError):
+        return None
+    return [
+        (starts[tok.start[0] - 1] + tok.start[1], starts[tok.end[0] - 1] + tok.end[1])
+        for tok in tokens if tok.type == tokenize.STRING
+    ]
+
+
+def _normalize(source: str) -> str:
+    """把 &&、||、!、===、!== 改写为 Python 运算符；字符串字面量内的字符原样保留"""
+    spans = _string_spans(source)
+    if spans is None:
+        # 未闭合的字符串等：原样交给 ast.parse 报语法错误
+        return source
+    parts = []
+    pos = 0
+    for start, end in spans:
+        parts.append(_rewrite(source[pos:start]))
+        parts.append(source[start:end])
+        pos = end
+    parts.append(_rewrite(source[pos:]))
+    # 开头的 ! 改写后带前导空格，eval 模式下会被当作缩进
+    return "".join(parts).strip()
+
+
+def _safe(func):
+    def run(*args):
+        try:
+            return func(*args)
+        except (TypeError, ValueError, ArithmeticError, MemoryError):
+            return None
+    return run
+
+
+def _compile(node):
+    if isinstance(node, ast.Constant):
+        if not isinstance(node.value, (int, float, str, bool, type(None))):
+            raise ConditionError(f"不支持的常量: {node.value!r}")
+        value = node.value
+        return lambda ctx: value
+
+    if isinstance(node, ast.Name):
+        name = node.id
+        if name in ("true", "True"):
+            return lambda ctx: True
+        if name in ("false", "False"):
+            return lambda ctx: False
+        if name in ("null", "None"):
+            return lambda ctx: None
+        return lambda ctx: ctx.get(name)
+
+    if isinstance(node, (ast.List, ast.Tuple)):
+        items = [_compile(item) for item in node.elts]
+        return lambda ctx: tuple(item(ctx) for item in items)
+
+    if isinstance(node, ast.BoolOp):
+        operands = [_compile(value) for value in node.values]
+        if isinstance(node.op, ast.And):
+            return lambda ctx: all(operand(ctx) for operand in operands)
+        return lambda ctx: any(operand(ctx) for operand in operands)
+
+    if isinstance(node, ast.UnaryOp):
+        operand = _compile(node.operand)
+        if isinstance(node.op, ast.Not):
+            return lambda ctx: not operand(ctx)
+        func = _UNARY.get(type(node.op))
+        if func is None:
+            raise ConditionError("不支持的一元运算")
+        func = _safe(func)
+        return lambda ctx: func(operand(ctx))
+
+    if isinstance(node, ast.BinOp):
+        func = _BINARY.get(type(node.op))
+        if func is None:
+            raise ConditionError("不支持的算术运算")
+        for side in _NUMERIC_ONLY.get(type(node.op), ()):
+            operand = getattr(node, side)
+            if isinstance(operand, (ast.List, ast.Tuple)) or (
+                isinstance(operand, ast.Constant) and isinstance(operand.value, str)
+            ):
+                raise ConditionError("字符串或列表不支持 * 与 % 运算")
+        func = _safe(func)
+        left, right = _compile(node.left), _compile(node.right)
+        return lambda ctx: func(left(ctx), right(ctx))
+
+    if isinstance(node, ast.Compare):
+        operands = [_compile(node.left)] + [_compile(c) for c in node.comparators]
+        funcs = []
+        for op in node.ops:
+            func = _COMPARE.get(type(op))
+            if func is None:
+                raise ConditionError("不支持的比较运算")
+            funcs.append(_safe(func))
+
+        def compare(ctx):
+            left = operands[0](ctx)
+            for func, operand in zip(funcs, operands[1:]):
+                right = operand(ctx)
+                if not func(left, right):
+                    return False
+                left = right
+            return True
+        return compare
+
+    raise ConditionError(f"不支持的表达式: {type(node).__name__}")
+
+
+def compile_condition(source):
+    """
+    编译条件表达式，返回 predicate(context) -> bool；空条件返回 None（表示恒为真）。
+    表达式非法时抛出 ConditionError。
+    """
+    source = (source or "").strip()
+    if not source:
+        return None
+    if len(source) > MAX_CONDITION_LENGTH:
+        raise ConditionError(f"条件表达式过长（上限 {MAX_CONDITION_LENGTH} 个字符）")
+    try:
+        tree = ast.parse(_normalize(source), mode="eval")
+        evaluate = _compile(tree.body)
+    except SyntaxError as exc:
+        raise ConditionError(f"条件表达式语法错误: {source}") from exc
+    except (MemoryError, RecursionError, OverflowError) as exc:
+        raise ConditionError(f"条件表达式过于复杂: {source}") from exc
+
+    def predicate(context) -> bool:
+        return bool(evaluate(context))
+    return predicate
@@ -1,4 +1,7 @@
+from django.db import transaction
 from rest_framework import serializers
+
+from apps.common.rows import RowSerializer, iso_datetime
 from .models import Menu, ApiConfig, RouteConfig, FlowConfig
 
 
@@ -10,9 +13,21 @@ class MenuSerializer(serializers.ModelSerializer):
         fields = '__all__'
     
     def get_children(self, obj):
-        if obj.children.exists():
-            return MenuSerializer(obj.children.all(), many=True).data
-        return []
+        # 上下文提供 children_map（parent_id -> 子菜单列表）时直接取用，整棵树只需一次查询
+        children_map = self.context.get('children_map')
+        if children_map is not None:
+            children = children_map.get(obj.id, [])
+        else:
+            children = obj.children.all()
+        return MenuSerializer(children, many=True, context=self.context).data
+
+
+def build_children_map(menus):
+    """把已排序的菜单列表按 parent_id 分组"""
+    children_map = {}
+    for menu in menus:
+        children_map.setdefault(menu.parent_id, []).append(menu)
+    return children_map
 
 
 class ApiConfigSerializer(serializers.ModelSerializer):
@@ -28,6 +43,8 @@ class RouteConfigSerializer(serializers.ModelSerializer):
 
 
 class FlowConfigSerializer(serializers.ModelSerializer):
+    timeoutAction = serializers.ChoiceField(source='timeout_action', choices=FlowConfig.TIMEOUT_ACTION_CHOICES,
+                                            required=False)
     autoPassCondition = serializers.CharField(source='auto_pass_condition', required=False, allow_blank=True)
     allowRevoke = serializers.BooleanField(source='allow_revoke', required=False)
     allowTransfer = serializers.BooleanField(source='allow_transfer', required=False)
@@ -37,14 +54,45 @@ class FlowConfigSerializer(serializers.ModelSerializer):
     class Meta:
         model = FlowConfig
         fields = [
-            'id', 'name', 'type', 'description', 'level', 'timeout',
+            'id', 'name', 'type', 'description', 'level', 'timeout', 'timeoutAction',
             'autoPassCondition', 'allowRevoke', 'allowTransfer', 'enabled',
             'nodes', 'creator', 'createdAt', 'updatedAt'
         ]
     
+    def validate(self, attrs):
+        """
+        节点或自动通过条件有变化时才校验：审批引擎上线前保存的配置可能含引擎不支持的节点，
+        只修改名称、启用状态等其他字段时照常保存（这类流程不会被发起，见 flow.start_for_type）
+        """
+        from .flow import FlowConfigError, validate_config
+
+        instance = self.instance
+        nodes = attrs.get('nodes', instance.nodes if instance else [])
+        condition = attrs.get('auto_pass_condition', instance.auto_pass_condition if instance else '')
+        if instance is not None and nodes == instance.nodes and condition == instance.auto_pass_condition:
+            return attrs
+        try:
+            validate_config(nodes, condition)
+        except FlowConfigError as exc:
+            raise serializers.ValidationError(str(exc))
+        return attrs
+
+    def update(self, instance, validated_data):
+        """超时时间或超时处理方式变化时，同步重算进行中实例的截止时间"""
+        from .flow import reschedule_deadlines
+
+        old_timeout, old_action = instance.timeout, instance.timeout_action
+        with transaction.atomic():
+            instance = super().update(instance, validated_data)
+            if (instance.timeout, instance.timeout_action) != (old_timeout, old_action):
+                reschedule_deadlines(instance, old_timeout, old_action)
+        return instance
+
     def to_representation(self, instance):
         data = super().to_representation(instance)
         # 确保使用驼峰命名返回
+        if 'timeout_action' in data:
+            data['timeoutAction'] = data.pop('timeout_action')
         if 'auto_pass_condition' in data:
             data['autoPassCondition'] = data.pop('auto_pass_condition')
         if 'allow_revoke' in data:
@@ -56,3 +104,68 @@ class FlowConfigSerializer(serializers.ModelSerializer):
         if 'updated_at' in data:
             data['updatedAt'] = data.pop('updated_at')
         return data
+
+
+# ====== 列表快照的行序列化：输出与上面对应 ModelSerializer 的 data 一致 ======
+
+_DATETIMES = {"created_at": iso_datetime, "updated_at": iso_datetime}
+
+API_ROW = RowSerializer(
+    {
+        "id": "id",
+        "name": "name",
+        "path": "path",
+        "method": "method",
+        "category": "category",
+        "description": "description",
+        "params": "params",
+        "headers": "headers",
+        "response": "response",
+        "timeout": "timeout",
+        "permission": "permission",
+        "require_auth": "require_auth",
+        "enabled": "enabled",
+        "created_at": "created_at",
+        "updated_at": "updated_at",
+    },
+    converters=_DATETIMES,
+)
+
+ROUTE_ROW = RowSerializer(
+    {
+        "id": "id",
+        "path": "path",
+        "name": "name",
+        "component": "component",
+        "icon": "icon",
+        "title": "title",
+        "hidden": "hidden",
+        "keep_alive": "keep_alive",
+        "sort": "sort",
+        "enabled": "enabled",
+        "created_at": "created_at",
+        "updated_at": "updated_at",
+    },
+    converters=_DATETIMES,
+)
+
+FLOW_ROW = RowSerializer(
+    {
+        "id": "id",
+        "name": "name",
+        "type": "type",
+        "description": "description",
+        "level": "level",
+        "timeout": "timeout",
+        "timeout_action": "timeoutAction",
+        "auto_pass_condition": "autoPassCondition",
+        "allow_revoke": "allowRevoke",
+        "allow_transfer": "allowTransfer",
+        "enabled": "enabled",
+        "nodes": "nodes",
+        "creator": "creator",
+        "created_at": "createdAt",
+        "updated_at": "updatedAt",
+    },
+    converters=_DATETIMES,
+)
@@ -12,6 +12,9 @@ from .views import (
     api_test,
     flow_add,
     flow_detail,
+    flow_instance_action,
+    flow_instance_detail,
+    flow_instance_list,
     flow_list,
     flow_status,
     menu_add,
@@ -40,6 +43,9 @@ urlpatterns = [
     re_path(r'^api/(?P<pk>[^/]+)/?$', api_detail, name='api-detail'),
     re_path(r'^api/test/?$', api_test, name='api-test'),
 
+    re_path(r'^flow/instance/list/?$', flow_instance_list, name='flow-instance-list'),
+    re_path(r'^flow/instance/(?P<pk>\d+)/action/?$', flow_instance_action, name='flow-instance-action'),
+    re_path(r'^flow/instance/(?P<pk>\d+)/?$', flow_instance_detail, name='flow-instance-detail'),
     re_path(r'^flow/list/?$', flow_list, name='flow-list'),
     re_path(r'^flow/add/?$', flow_add, name='flow-add'),
     re_path(r'^flow/(?P<pk>[^/]+)/status/?$', flow_status, name='flow-status'),
@@ -47,6 +53,6 @@ urlpatterns = [
 
     re_path(r'^menu/list/?$', menu_list, name='menu-list'),
     re_path(r'^menu/add/?$', menu_add, name='menu-add'),
-    re_path(r'^menu/(?P<pk>[^/]+)/?$', menu_detail, name='menu-detail'),
     re_path(r'^menu/user/?$', menu_user, name='menu-user'),
+    re_path(r'^menu/(?P<pk>[^/]+)/?$', menu_detail, name='menu-detail'),
 ]
@@ -1,16 +1,25 @@
 from rest_framework import filters, viewsets
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.pagination import PageNumberPagination
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
+from django.http import HttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
 
-from .models import ApiConfig, FlowConfig, Menu, RouteConfig
+from apps.common.pagination import BasePage
+from apps.common.rows import FIELDS_QUERY_PARAM
+
+from . import cache as config_cache
+from .flow import ACTION_ROW, INSTANCE_ROW, FlowError, act, instance_to_front
+from .models import ApiConfig, FlowConfig, FlowInstance, Menu, RouteConfig
 from .serializers import (
+    API_ROW,
+    FLOW_ROW,
+    ROUTE_ROW,
     ApiConfigSerializer,
     FlowConfigSerializer,
     MenuSerializer,
     RouteConfigSerializer,
+    build_children_map,
 )
 
 
@@ -18,9 +27,60 @@ def _success(data=None, message="success"):
     return {"code": 200, "message": message, "data": data}
 
 
-class _Page(PageNumberPagination):
-    page_size_query_param = "size"
-    page_query_param = "page"
+def _error(message="error", code=400):
+    return {"code": code, "message": message, "data": None}
+
+
+class _Page(BasePage):
+    pass
+
+
+def _json_response(body: bytes):
+    """直接返回预渲染的 JSON 响应体，跳过序列化与渲染"""
+    return HttpResponse(body, content_type='application/json')
+
+
+def _to_bool(value):
+    text = str(value).strip().lower()
+    if text in ('1', 'true', 'yes'):
+        return True
+    if text in ('0', 'false', 'no'):
+        return False
+    return None
+
+
+def _filter_snapshot(rows, params, fields=(), search_fields=()):
+    """
+    在配置快照上过滤：fields 中的参数按值精确匹配（布尔字段接受 true/false/1/0），
+    search 参数在 search_fields 上做不区分大小写的包含匹配，与对应视图集的过滤方式一致。
+    """
+    for field in fields:
+        value = params.get(field)
+        if value in (None, ''):
+            continue
+        if rows and isinstance(rows[0].get(field), bool):
+            value = _to_bool(value)
+            if value is None:
+                continue
+        rows = [row for row in rows if row.get(field) == value]
+    search = (params.get('search') or '').strip().lower()
+    if search:
+        rows = [
+            row for row in rows
+            if any(search in str(row.get(field) or '').lower() for field in search_fields)
+        ]
+    return rows
+
+
+def _snapshot_page(request, rows, row, fields=(), search_fields=()):
+    """快照已是完整行，过滤、分页后再按 fields 参数裁剪键"""
+    paginator = _Page()
+    rows = _filter_snapshot(rows, request.query_params, fields, search_fields)
+    page = paginator.paginate_queryset(rows, request)
+    projection = row.project(request.query_params.get(FIELDS_QUERY_PARAM))
+    if projection is not row:
+        page = projection.pick(page)
+    return Response(_success(paginator.get_payload(page)))
 
 
 class MenuViewSet(viewsets.ModelViewSet):
@@ -33,6 +93,11 @@ class MenuViewSet(viewsets.ModelViewSet):
     ordering_fields = ['sort', 'created_at']
     permission_classes = [AllowAny]
 
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['children_map'] = build_children_map(Menu.objects.all())
+        return context
+
 
 class ApiConfigViewSet(viewsets.ModelViewSet):
     """API配置管理视图集"""
@@ -69,17 +134,9 @@ class FlowConfigViewSet(viewsets.ModelViewSet):
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def route_list(request):
-    paginator = _Page()
-    qs = RouteConfig.objects.all().order_by('sort', '-created_at')
-    page = paginator.paginate_queryset(qs, request)
-    serializer = RouteConfigSerializer(page, many=True)
-    payload = {
-        "list": serializer.data,
-        "total": paginator.page.paginator.count if paginator.page else qs.count(),
-        "page": paginator.page.number if paginator.page else 1,
-        "size": paginator.get_page_size(request),
-    }
-    return Response(_success(payload))
+    return _snapshot_page(
+        request, config_cache.route_snapshot(), ROUTE_ROW, ('enabled', 'hidden'), ('name', 'path')
+    )
 
 
 @api_view(['POST'])
@@ -112,17 +169,9 @@ def route_detail(request, pk: int):
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def api_list(request):
-    paginator = _Page()
-    qs = ApiConfig.objects.all().order_by('-created_at')
-    page = paginator.paginate_queryset(qs, request)
-    serializer = ApiConfigSerializer(page, many=True)
-    payload = {
-        "list": serializer.data,
-        "total": paginator.page.paginator.count if paginator.page else qs.count(),
-        "page": paginator.page.number if paginator.page else 1,
-        "size": paginator.get_page_size(request),
-    }
-    return Response(_success(payload))
+    return _snapshot_page(
+        request, config_cache.api_snapshot(), API_ROW, ('method', 'category', 'enabled'), ('name', 'path')
+    )
 
 
 @api_view(['POST'])
@@ -162,17 +211,9 @@ def api_test(request):
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def flow_list(request):
-    paginator = _Page()
-    qs = FlowConfig.objects.all().order_by('-created_at')
-    page = paginator.paginate_queryset(qs, request)
-    serializer = FlowConfigSerializer(page, many=True)
-    payload = {
-        "list": serializer.data,
-        "total": paginator.page.paginator.count if paginator.page else qs.count(),
-        "page": paginator.page.number if paginator.page else 1,
-        "size": paginator.get_page_size(request),
-    }
-    return Response(_success(payload))
+    return _snapshot_page(
+        request, config_cache.flow_snapshot(), FLOW_ROW, ('type', 'level', 'enabled'), ('name', 'description')
+    )
 
 
 @api_view(['POST'])
@@ -214,14 +255,62 @@ def flow_status(request, pk: int):
     return Response(_success(None, f"流程已{'启用' if enabled else '禁用'}"))
 
 
+# ====== 流程实例 ======
+
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
-def menu_list(request):
-    data = MenuSerializer(Menu.objects.filter(parent__isnull=True).order_by('sort'), many=True).data
+def flow_instance_list(request):
+    paginator = _Page()
+    qs = FlowInstance.objects.all().order_by('-id')
+    params = request.query_params
+    if params.get('status'):
+        qs = qs.filter(status=params['status'])
+    if params.get('targetType'):
+        qs = qs.filter(target_type=params['targetType'])
+    if params.get('targetId'):
+        qs = qs.filter(target_id=params['targetId'])
+    if params.get('flowId'):
+        qs = qs.filter(flow_id=params['flowId'])
+    row = INSTANCE_ROW.project(params.get(FIELDS_QUERY_PARAM))
+    page = paginator.paginate_queryset(row.values(qs), request)
+    return Response(_success(paginator.get_payload(row.many(page))))
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def flow_instance_detail(request, pk: int):
+    instance = FlowInstance.objects.filter(pk=pk).first()
+    if not instance:
+        return Response(_success(None, "未找到"))
+    data = instance_to_front(instance)
+    data['actions'] = ACTION_ROW.many(ACTION_ROW.values(instance.actions.all()))
     return Response(_success(data))
 
 
+def _actor_names(request):
+    """操作人候选名称：只取已登录用户的用户名与姓名，不信任请求体中的身份字段"""
+    user = request.user
+    return [user.username, user.get_full_name(), user.first_name]
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def flow_instance_action(request, pk: int):
+    action = request.data.get('action') or 'approve'
+    try:
+        instance = act(pk, _actor_names(request), action, request.data.get('comment') or '')
+    except FlowError as exc:
+        return Response(_error(str(exc)), status=400)
+    return Response(_success(instance_to_front(instance), "操作成功"))
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def menu_list(request):
+    return _json_response(config_cache.menu_tree().tree_json)
+
+
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def menu_add(request):
@@ -252,5 +341,5 @@ def menu_detail(request, pk: int):
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def menu_user(request):
-    data = MenuSerializer(Menu.objects.filter(visible=True).order_by('sort'), many=True).data
-    return Response(_success(data))
+    # 只保留可见菜单；隐藏菜单的子树一并剔除
+    return _json_response(config_cache.menu_tree().visible_json)
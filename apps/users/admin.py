@@ -1,8 +1,15 @@
 from django.contrib import admin
-from .models import UserProfile
+from .models import RevokedToken, UserProfile
 
 
 @admin.register(UserProfile)
 class UserProfileAdmin(admin.ModelAdmin):
     list_display = ['user', 'phone', 'department', 'position']
     search_fields = ['user__username', 'phone']
+
+
+@admin.register(RevokedToken)
+class RevokedTokenAdmin(admin.ModelAdmin):
+    list_display = ['jti', 'token_type', 'user', 'expires_at', 'created_at']
+    list_filter = ['token_type']
+    search_fields = ['jti', 'user__username']
@@ -5,3 +5,26 @@ class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.users'
     verbose_name = '用户管理'
+
+    def ready(self):
+        from django.contrib.auth.models import Group, User
+        from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+
+        from . import auth_cache, search
+        from .models import Employee, UserProfile
+
+        post_save.connect(auth_cache.on_user_changed, sender=User, dispatch_uid='users_authctx_user_saved')
+        post_delete.connect(auth_cache.on_user_changed, sender=User, dispatch_uid='users_authctx_user_deleted')
+        post_save.connect(auth_cache.on_profile_changed, sender=UserProfile, dispatch_uid='users_authctx_profile_saved')
+        post_delete.connect(auth_cache.on_profile_changed, sender=UserProfile, dispatch_uid='users_authctx_profile_deleted')
+        post_save.connect(auth_cache.on_group_changed, sender=Group, dispatch_uid='users_authctx_group_saved')
+        pre_delete.connect(auth_cache.on_group_changed, sender=Group, dispatch_uid='users_authctx_group_deleted')
+        m2m_changed.connect(auth_cache.on_user_relation_changed, sender=User.groups.through,
+                            dispatch_uid='users_authctx_groups')
+        m2m_changed.connect(auth_cache.on_user_relation_changed, sender=User.user_permissions.through,
+                            dispatch_uid='users_authctx_user_permissions')
+        m2m_changed.connect(auth_cache.on_group_permissions_changed, sender=Group.permissions.through,
+                            dispatch_uid='users_authctx_group_permissions')
+
+        post_save.connect(search.on_employee_saved, sender=Employee, dispatch_uid='users_search_employee')
+        post_delete.connect(search.on_employee_deleted, sender=Employee, dispatch_uid='users_search_employee_delete')
@@ -0,0 +1,207 @@
+"""
+用户认证上下文缓存
+
+每个已认证请求都要取用户行，userInfo、登录、导航包还要查资料、角色与权限。
+这里把一个用户的上述数据合并为一份认证上下文（用户行、资料、角色、直接权限、全部权限），
+按用户 id 保存在 Django 缓存中：
+- CachedJWTAuthentication 命中缓存时直接用上下文还原 User，不再查询用户表；
+- _build_user_info 从同一份上下文生成，不再单独查询资料、角色与权限；
+- 还原的 User 预先带上资料与权限缓存，request.user.profile、has_perm 都不查库；
+- perm_hash 概括角色、权限与账号标志，签发令牌时写入声明，
+  StatelessJWTAuthentication 据此判断令牌中的声明是否仍然有效。
+
+缓存键带用户的认证版本号（apps.common.versions，名称 auth:<用户 id>，保存在数据库中）。
+用户、资料、组成员、用户权限、组权限、组名的变化经信号在同一事务内递增相关用户的版本号，
+所有进程读取缓存前先读版本号，因此即使 CACHES 为进程内缓存，停用账号、收回权限
+在提交后对全部 worker 立即生效；提交前按旧数据构建的上下文留在旧版本号下，不会被读到。
+读取版本号每次一条按名称的查询；AUTH_VERSION_POLL_INTERVAL 大于 0 时在该间隔内复用本进程读到的值，
+以最多滞后该间隔为代价省去这条查询。
+"""
+import hashlib
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import User
+from django.core.cache import cache
+
+from apps.common import versions
+
+from .models import UserProfile
+
+_PREFIX = "authctx:"
+
+
+def _timeout() -> int:
+    return getattr(settings, "AUTH_CONTEXT_CACHE_TIMEOUT", 300)
+
+
+def version_poll_interval() -> float:
+    return getattr(settings, "AUTH_VERSION_POLL_INTERVAL", 0)
+
+
+def _version_name(user_id) -> str:
+    return f"auth:{user_id}"
+
+
+def _key(user_id) -> str:
+    """当前认证版本下的缓存键"""
+    name = _version_name(user_id)
+    return f"{_PREFIX}{user_id}:{versions.read([name], version_poll_interval())[name]}"
+
+
+def _row(instance) -> dict:
+    return {field.attname: getattr(instance, field.attname) for field in instance._meta.concrete_fields}
+
+
+def _from_row(model, row):
+    return model.from_db(model.objects.db, list(row), list(row.values()))
+
+
+def _perm_hash(user, roles, all_perms) -> str:
+    flags = f"{user.is_active:d}{user.is_staff:d}{user.is_superuser:d}"
+    source = "|".join([flags, ",".join(roles), ",".join(all_perms)])
+    return hashlib.sha1(source.encode()).hexdigest()[:16]
+
+
+def build_context(user) -> dict:
+    """从数据库读取用户的认证上下文"""
+    profile = UserProfile.objects.filter(user_id=user.pk).first()
+    backend = ModelBackend()
+    # 新实例上计算，避免沿用调用方 user 上已有的权限缓存
+    fresh = _from_row(User, _row(user))
+    user_perms = backend.get_user_permissions(fresh)
+    all_perms = sorted(backend.get_all_permissions(fresh))
+    roles = sorted(user.groups.values_list("name", flat=True))
+    return {
+        "user": _row(user),
+        "profile": _row(profile) if profile else None,
+        "roles": roles,
+        "permissions": sorted(perm.split(".", 1)[1] for perm in user_perms),
+        "user_perms": sorted(user_perms),
+        "all_perms": all_perms,
+        "perm_hash": _perm_hash(user, roles, all_perms),
+    }
+
+
+def cached_context(user_id):
+    """只读缓存，不查库；未命中或缓存为旧格式时返回 None"""
+    context = cache.get(_key(user_id))
+    if context is None or "perm_hash" not in context:
+        return None
+    return context
+
+
+def get_context(user_id, user=None):
+    """取用户的认证上下文；缓存未命中时从数据库构建，用户不存在时返回 None"""
+    key = _key(user_id)
+    context = cache.get(key)
+    if context is not None and "perm_hash" in context:
+        return context
+    if user is None:
+        user = User.objects.filter(pk=user_id).first()
+        if user is None:
+            return None
+    context = build_context(user)
+    cache.set(key, context, _timeout())
+    return context
+
+
+def hydrate(context) -> User:
+    """用上下文还原 User，资料与权限缓存一并填好"""
+    user = _from_row(User, context["user"])
+    profile = _from_row(UserProfile, context["profile"]) if context["profile"] else None
+    User.profile.related.set_cached_value(user, profile)
+    if profile is not None:
+        UserProfile.user.field.set_cached_value(profile, user)
+    # ModelBackend 读取的权限缓存属性
+    user._user_perm_cache = set(context["user_perms"])
+    user._group_perm_cache = set(context["all_perms"]) - user._user_perm_cache
+    user._perm_cache = set(context["all_perms"])
+    return user
+
+
+def get_user(user_id):
+    context = get_context(user_id)
+    return None if context is None else hydrate(context)
+
+
+def token_claims(context) -> dict:
+    """写入令牌的用户声明"""
+    row = context["user"]
+    return {
+        "username": row["username"],
+        "roles": list(context["roles"]),
+        "is_staff": row["is_staff"],
+        "is_superuser": row["is_superuser"],
+        "perm_hash": context["perm_hash"],
+    }
+
+
+def user_info(user) -> dict:
+    """userInfo 响应数据；user 只取主键，其余字段来自上下文"""
+    context = get_context(user.pk, user if isinstance(user, User) else None)
+    row = context["user"]
+    profile = context["profile"]
+    avatar = profile["avatar"] or None if profile else None
+    nickname = (profile["position"] if profile else None) or row["first_name"] or row["username"]
+    return {
+        "id": row["id"],
+        "username": row["username"],
+        "nickname": nickname,
+        "avatar": avatar,
+        "roles": list(context["roles"]),
+        "permissions": list(context["permissions"]),
+    }
+
+
+# ====== 失效 ======
+
+
+def invalidate(*user_ids) -> None:
+    """递增用户的认证版本号；旧版本下的缓存不再被读取，随超时淘汰"""
+    versions.bump(*[_version_name(user_id) for user_id in user_ids if user_id is not None])
+
+
+def _group_members(group_ids):
+    return list(User.groups.through.objects.filter(group_id__in=group_ids).values_list("user_id", flat=True))
+
+
+def on_user_changed(sender, instance, **kwargs):
+    """User 的 post_save / post_delete"""
+    invalidate(instance.pk)
+
+
+def on_profile_changed(sender, instance, **kwargs):
+    """UserProfile 的 post_save / post_delete"""
+    invalidate(instance.user_id)
+
+
+def on_group_changed(sender, instance, **kwargs):
+    """Group 的 post_save / pre_delete：组名即角色名，删除前取出成员"""
+    invalidate(*_group_members([instance.pk]))
+
+
+def on_user_relation_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """User.groups、User.user_permissions 的 m2m_changed；两个方向的增删都要处理"""
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            invalidate(instance.pk)
+        return
+    # 从组或权限一侧操作：instance 为 Group / Permission，pk_set 为用户 id
+    if action in ("post_add", "post_remove"):
+        invalidate(*pk_set)
+    elif action == "pre_clear":
+        invalidate(*instance.user_set.values_list("pk", flat=True))
+
+
+def on_group_permissions_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """Group.permissions 的 m2m_changed：影响组内全部成员"""
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if not reverse:
+        invalidate(*_group_members([instance.pk]))
+    elif action == "pre_clear":
+        invalidate(*_group_members(instance.group_set.values_list("pk", flat=True)))
+    else:
+        invalidate(*_group_members(pk_set))
+
@@ -1,35 +1,46 @@
-from typing import Any, Dict, List
+import hashlib
+from typing import Any, Dict
+
+from django.http import HttpResponse
+from django.utils.http import parse_etags
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
+from rest_framework_simplejwt.exceptions import TokenError
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenObtainPairView
 
+from apps.common.renderers import dumps
+from apps.system.cache import nav_config
+
+from . import auth_cache, revocation
+
 
 def _build_user_info(user) -> Dict[str, Any]:
-    profile = getattr(user, "profile", None)
-    avatar = profile.avatar or None if profile else None
-    nickname = (profile.position if profile else None) or user.first_name or user.username
-    roles: List[str] = list(user.groups.values_list("name", flat=True))
-    permissions: List[str] = list(user.user_permissions.values_list("codename", flat=True))
-
-    return {
-        "id": user.id,
-        "username": user.username,
-        "nickname": nickname,
-        "avatar": avatar,
-        "roles": roles,
-        "permissions": permissions,
-    }
+    # 资料、角色、权限取自认证上下文缓存
+    return auth_cache.user_info(user)
 
 
 def _success(data=None, message="success"):
     return Response({"code": 200, "message": message, "data": data})
 
 
+def _add_claims(token, context) -> None:
+    for name, value in auth_cache.token_claims(context).items():
+        token[name] = value
+
+
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        # 角色、账号标志与 perm_hash 写入令牌，供 StatelessJWTAuthentication 使用
+        token = super().get_token(user)
+        _add_claims(token, auth_cache.get_context(user.pk, user))
+        return token
+
     def validate(self, attrs):
         data = super().validate(attrs)
         refresh = self.get_token(self.user)
@@ -57,12 +68,29 @@ def refresh_token(request):
     if not token_str:
         return Response({"code": 400, "message": "refresh token required", "data": None}, status=status.HTTP_400_BAD_REQUEST)
 
+    invalid = Response({"code": 401, "message": "invalid refresh token", "data": None}, status=status.HTTP_401_UNAUTHORIZED)
     try:
         refresh = RefreshToken(token_str)
-        access_token = refresh.access_token
-        return _success({"token": str(access_token)})
     except Exception:
-        return Response({"code": 401, "message": "invalid refresh token", "data": None}, status=status.HTTP_401_UNAUTHORIZED)
+        return invalid
+    if revocation.is_token_revoked(refresh):
+        return invalid
+    context = auth_cache.get_context(refresh.get(api_settings.USER_ID_CLAIM))
+    if context is None or not context["user"]["is_active"]:
+        return invalid
+
+    # 新令牌使用当前的角色与权限声明，而不是沿用刷新令牌签发时的
+    _add_claims(refresh, context)
+    data = {"token": str(refresh.access_token)}
+    if api_settings.ROTATE_REFRESH_TOKENS:
+        # 旧刷新令牌只能换取一次：撤销记录按 jti 唯一，并发请求中只有一个写入成功
+        if api_settings.BLACKLIST_AFTER_ROTATION and not revocation.revoke(refresh):
+            return invalid
+        refresh.set_jti()
+        refresh.set_exp()
+        refresh.set_iat()
+        data["refresh"] = str(refresh)
+    return _success(data)
 
 
 @api_view(["GET"])
@@ -70,7 +98,37 @@ def user_info(request):
     return _success(_build_user_info(request.user))
 
 
+@api_view(["GET"])
+def nav_bundle(request):
+    """
+    登录后首屏所需数据合并为一次请求：用户信息、可见菜单树、启用的路由与接口配置。
+    ETag 由配置版本与用户信息（含角色、权限）计算，客户端带 If-None-Match 重复加载时返回 304。
+    """
+    user_info = dumps(_build_user_info(request.user))
+    nav = nav_config()
+    etag = '"%s"' % hashlib.sha1(nav.version.encode() + b"|" + user_info).hexdigest()
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if_none_match = parse_etags(request.headers.get("If-None-Match", ""))
+    if etag in if_none_match or "*" in if_none_match:
+        return HttpResponse(status=304, headers=headers)
+
+    body = b'{"code":200,"message":"success","data":{"userInfo":' + user_info + b"," + nav.body + b"}}"
+    return HttpResponse(body, content_type="application/json", headers=headers)
+
+
 @api_view(["POST"])
 def logout_view(request):
-    # Stateless JWT logout, kept for API symmetry
-    return _success(None, "logout success")
\ No newline at end of file
+    """退出登录：撤销当前访问令牌；请求体带 refresh 时一并撤销该刷新令牌"""
+    if request.auth is not None:
+        revocation.revoke(request.auth, request.user)
+    token_str = request.data.get("refresh")
+    if token_str:
+        try:
+            refresh = RefreshToken(token_str)
+        except TokenError:
+            refresh = None
+        # 声明中的用户 id 为字符串
+        if refresh is not None and str(refresh.get(api_settings.USER_ID_CLAIM)) == str(request.user.pk):
+            revocation.revoke(refresh, request.user)
+    return _success(None, "logout success")
@@ -0,0 +1,86 @@
+"""
+JWT 认证
+
+CachedJWTAuthentication（默认）：校验规则与 JWTAuthentication 相同，用户从认证上下文缓存还原。
+StatelessJWTAuthentication（可选）：令牌中的 perm_hash 与缓存中的一致时，
+直接用令牌声明构造只含声明字段的 User；不一致或缓存未命中时按 CachedJWTAuthentication 处理。
+两者都会拒绝撤销列表中的令牌。
+"""
+from django.contrib.auth.models import User
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from . import auth_cache, revocation
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """与 JWTAuthentication 校验规则相同，但用户从认证上下文缓存还原，缓存命中时不查询用户表"""
+
+    def _user_id(self, validated_token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as exc:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from exc
+
+    def _check_revoked(self, validated_token) -> None:
+        if revocation.is_token_revoked(validated_token):
+            raise AuthenticationFailed("登录已失效，请重新登录", code="token_revoked")
+
+    def get_user(self, validated_token):
+        user_id = self._user_id(validated_token)
+        self._check_revoked(validated_token)
+
+        user = auth_cache.get_user(user_id)
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        return user
+
+
+def claims_user(token) -> User:
+    """
+    用令牌声明构造的轻量 User：只加载 id、用户名与账号标志，其余字段为延迟字段，
+    用到时（profile、check_password 等）才各自查询；可直接赋给外键，save 只写已加载的字段。
+    角色放在 roles 属性上
+    """
+    claims = {
+        "id": User._meta.pk.to_python(token[api_settings.USER_ID_CLAIM]),
+        "username": token.get("username", ""),
+        "is_active": True,
+        "is_staff": bool(token.get("is_staff")),
+        "is_superuser": bool(token.get("is_superuser")),
+    }
+    # from_db 要求取值顺序与模型字段顺序一致
+    names = [field.attname for field in User._meta.concrete_fields if field.attname in claims]
+    user = User.from_db(User.objects.db, names, [claims[name] for name in names])
+    user.roles = list(token.get("roles") or [])
+    return user
+
+
+class StatelessJWTAuthentication(CachedJWTAuthentication):
+    """
+    无状态模式：令牌中的 perm_hash 与缓存中的当前值一致时返回 claims_user，不查库、不还原完整的 User。
+    缓存未命中或不一致（角色、权限或账号状态已变化）时按 CachedJWTAuthentication 返回完整的 User，
+    使本次请求按最新权限处理；缓存重建后、或客户端刷新令牌取得新声明后恢复快速路径。
+    """
+
+    def get_user(self, validated_token):
+        user_id = self._user_id(validated_token)
+        self._check_revoked(validated_token)
+
+        claimed = validated_token.get("perm_hash")
+        context = auth_cache.cached_context(user_id)
+        if claimed and context is not None and context["perm_hash"] == claimed:
+            return claims_user(validated_token)
+
+        return super().get_user(validated_token)
@@ -0,0 +1,155 @@
+"""
+员工批量导入
+
+按块处理上传行：每块用一次查询取出库中已存在的工号，与本次文件中已出现的工号合并校验唯一性，
+通过校验的行以 bulk_create 写入。查询次数与块数成正比，而不是与行数成正比。
+校验规则与 EmployeeSerializer 一致，不通过的行逐行报告错误，其余行照常导入。
+"""
+from itertools import islice
+
+from django.db import IntegrityError, transaction
+
+from apps.common.pagination import bump_table_version
+
+from . import search
+from .models import Employee
+
+IMPORT_CHUNK_SIZE = 2000
+
+# 导入文件可使用导出时的英文列名，也可使用中文表头
+COLUMN_ALIASES = {
+    "工号": "work_id",
+    "姓名": "name",
+    "作业区/科室": "department",
+    "作业区": "department",
+    "科室": "department",
+    "人员类别": "category",
+    "手机号": "phone",
+    "是否启用": "enabled",
+    "备注": "remark",
+}
+
+_CATEGORIES = {value for value, _ in Employee.CATEGORY_CHOICES}
+_MAX_LENGTHS = {
+    field: Employee._meta.get_field(field).max_length
+    for field in ("work_id", "name", "department", "phone")
+}
+_LABELS = {
+    "work_id": "工号",
+    "name": "姓名",
+    "department": "作业区/科室",
+    "phone": "手机号",
+}
+
+
+def _text(value) -> str:
+    if value is None:
+        return ""
+    return str(value).strip()
+
+
+def _to_bool(value) -> bool:
+    value = _text(value).lower()
+    if not value:
+        return True
+    return value not in ("0", "false", "no", "否", "停用", "禁用")
+
+
+def _normalize(row) -> dict:
+    return {COLUMN_ALIASES.get(key, key): value for key, value in row.items()}
+
+
+def new_result() -> dict:
+    return {"created": 0, "errors": []}
+
+
+def _parse(idx, row, errors):
+    """校验一行，返回未保存的 Employee；不通过时把 (行号, 错误) 记入 errors 并返回 None"""
+    row = _normalize(row)
+    values = {field: _text(row.get(field)) for field in _LABELS}
+    missing = [_LABELS[field] for field, value in values.items() if not value]
+    if missing:
+        errors.append((idx, f"第{idx}行缺少{'、'.join(missing)}"))
+        return None
+    for field, limit in _MAX_LENGTHS.items():
+        if len(values[field]) > limit:
+            errors.append((idx, f"第{idx}行{_LABELS[field]}超过 {limit} 个字符"))
+            return None
+    category = _text(row.get("category"))
+    if category not in _CATEGORIES:
+        errors.append((idx, f"第{idx}行人员类别无效: {category or '空'}"))
+        return None
+    return Employee(
+        category=category,
+        enabled=_to_bool(row.get("enabled")),
+        remark=_text(row.get("remark")),
+        **values,
+    )
+
+
+def _split_unique(parsed, seen):
+    """一次查询取出已占用的工号，返回 (待写入的员工, 工号冲突的 (行号, 错误))"""
+    taken = set(
+        Employee.objects.filter(work_id__in={employee.work_id for _, employee in parsed})
+        .order_by().values_list("work_id", flat=True)
+    )
+    taken |= seen
+    to_create, conflicts = [], []
+    for idx, employee in parsed:
+        if employee.work_id in taken:
+            conflicts.append((idx, f"第{idx}行工号已存在: {employee.work_id}"))
+            continue
+        taken.add(employee.work_id)
+        to_create.append(employee)
+    return to_create, conflicts
+
+
+def _write(employees) -> None:
+    with transaction.atomic():
+        Employee.objects.bulk_create(employees)
+        if employees:
+            # 批量写入不触发模型信号，显式刷新搜索索引
+            search.index_employees(Employee.objects.filter(work_id__in=[e.work_id for e in employees]))
+
+
+def import_chunk(rows, start: int, result: dict, seen: set) -> None:
+    """
+    导入一块行数据并把计数累加到 result；start 为该块首行的行号（从 1 开始），
+    seen 为本次导入中前面各块已写入的工号，写入后会把本块的工号加进去。
+    """
+    errors, parsed = [], []
+    for idx, row in enumerate(rows, start=start):
+        employee = _parse(idx, row, errors)
+        if employee is not None:
+            parsed.append((idx, employee))
+
+    to_create, conflicts = _split_unique(parsed, seen)
+    try:
+        _write(to_create)
+    except IntegrityError:
+        # 校验与写入之间有并发写入占用了工号：重新查询后再试一次，仍冲突则抛出
+        to_create, conflicts = _split_unique(parsed, seen)
+        _write(to_create)
+
+    # 格式错误与工号冲突按行号合并，错误信息保持文件中的顺序
+    result["errors"].extend(message for _, message in sorted(errors + conflicts))
+    result["created"] += len(to_create)
+    seen.update(employee.work_id for employee in to_create)
+
+
+def import_employees(rows, chunk_size: int = IMPORT_CHUNK_SIZE) -> dict:
+    """逐块导入可迭代的行数据，返回 {created, errors} 汇总"""
+    result = new_result()
+    seen = set()
+    iterator = iter(rows)
+    start = 1
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            break
+        import_chunk(chunk, start, result, seen)
+        start += len(chunk)
+    if result["created"]:
+        # bulk_create 不触发模型信号，手动让列表总数缓存失效
+        bump_table_version(Employee)
+    return result
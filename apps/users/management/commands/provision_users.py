@@ -0,0 +1,41 @@
+import csv
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.users import provisioning
+
+
+class Command(BaseCommand):
+    help = '从 CSV 批量开通用户（列：username,password,email,first_name,last_name,phone,department,position,groups）'
+
+    def add_arguments(self, parser):
+        parser.add_argument('file', help='UTF-8 编码的 CSV 文件，首行为列名；groups 列用 | 分隔多个角色')
+        parser.add_argument(
+            '--default-password', default=None,
+            help=f'未填写密码时使用的密码，需符合密码规则；不指定时为 {provisioning.DEFAULT_PASSWORD}',
+        )
+        parser.add_argument('--workers', type=int, default=None, help='密码哈希进程数，默认 CPU 核数')
+        parser.add_argument('--batch-size', type=int, default=provisioning.BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['file'], newline='', encoding='utf-8-sig') as f:
+                rows = list(csv.DictReader(f))
+        except OSError as exc:
+            raise CommandError(f'无法读取文件: {exc}') from exc
+
+        try:
+            result = provisioning.provision_users(
+                rows,
+                default_password=options['default_password'],
+                workers=options['workers'],
+                batch_size=options['batch_size'],
+            )
+        except ValidationError as exc:
+            raise CommandError(f"默认密码不符合要求: {'；'.join(exc.messages)}") from exc
+        for error in result['errors']:
+            self.stdout.write(self.style.WARNING(f"第 {error['row']} 行: {error['message']}"))
+        self.stdout.write(self.style.SUCCESS(
+            f"创建 {result['created']} 个用户，跳过已存在的 {len(result['skipped'])} 个"
+        ))
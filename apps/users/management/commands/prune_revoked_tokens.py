@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from apps.users import revocation
+
+
+class Command(BaseCommand):
+    help = '删除已过期的令牌撤销记录（过期令牌本身已无法通过校验）'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=revocation.PRUNE_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        deleted = revocation.prune(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'已删除 {deleted} 条过期的令牌撤销记录'))
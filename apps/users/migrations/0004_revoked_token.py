@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:31
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_remove_employee_level'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RevokedToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('jti', models.CharField(max_length=64, unique=True, verbose_name='令牌ID')),
+                ('token_type', models.CharField(choices=[('access', '访问令牌'), ('refresh', '刷新令牌')], max_length=10, verbose_name='令牌类型')),
+                ('expires_at', models.DateTimeField(db_index=True, verbose_name='过期时间')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='撤销时间')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='revoked_tokens', to=settings.AUTH_USER_MODEL, verbose_name='用户')),
+            ],
+            options={
+                'verbose_name': '已撤销令牌',
+                'verbose_name_plural': '已撤销令牌列表',
+                'db_table': 'users_revoked_token',
+            },
+        ),
+    ]
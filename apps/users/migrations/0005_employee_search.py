@@ -0,0 +1,90 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:45
+
+import re
+
+from django.db import migrations, models
+
+# 员工子串搜索：SQLite 使用 FTS5 虚拟表，PostgreSQL 使用 pg_trgm 三元组索引
+FTS_TABLE = 'users_employee_fts'
+
+TRIGRAM_INDEXES = (
+    ('users_employee_name_trgm', 'name'),
+    ('users_employee_work_id_trgm', 'work_id'),
+    ('users_employee_phone_trgm', 'phone'),
+)
+
+
+# 分词规则的固定副本（与 apps.common.search 当时的实现一致）：迁移不依赖会变化的业务代码
+MAX_SUFFIX_RUN = 32
+_CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uac00-\ud7af"
+_TOKEN_RE = re.compile(f"([{_CJK}]+)|([^\\W_{_CJK}]+)")
+
+
+def segment(*texts):
+    parts = []
+    for text in texts:
+        for cjk, word in _TOKEN_RE.findall((text or "").lower()):
+            if cjk:
+                parts.append(" ".join(cjk))
+            elif len(word) <= MAX_SUFFIX_RUN:
+                parts.extend(word[i:] for i in range(len(word)))
+            else:
+                parts.append(word)
+    return " ".join(parts)
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        for name, column in TRIGRAM_INDEXES:
+            schema_editor.execute(
+                f'CREATE INDEX IF NOT EXISTS {name} ON users_employee USING gin (UPPER({column}) gin_trgm_ops)'
+            )
+        return
+    if connection.vendor != 'sqlite':
+        return
+
+    with connection.cursor() as cursor:
+        try:
+            cursor.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(doc, tokenize='unicode61')")
+        except Exception:
+            # 未编译 FTS5 的 SQLite：不建索引，搜索回退为 icontains
+            return
+        Employee = apps.get_model('users', 'Employee')
+        rows = Employee.objects.values_list('id', 'work_id', 'name', 'phone')
+        docs = [(pk, segment(*texts)) for pk, *texts in rows]
+        cursor.executemany(f'INSERT INTO {FTS_TABLE}(rowid, doc) VALUES (%s, %s)', docs)
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        for name, _ in TRIGRAM_INDEXES:
+            schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+    elif connection.vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_revoked_token'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='employee',
+            name='phone',
+            field=models.CharField(db_index=True, max_length=20, verbose_name='手机号'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['-created_at'], name='users_emp_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['department', '-created_at'], name='users_emp_dept_created_idx'),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,55 @@
+# 员工搜索索引重建：超过 32 个字符的字母数字串此前只写入整串，其中的子串查不到；
+# 改为写入全部后缀（各截断到 32 个字符），保证 FTS 候选集覆盖 icontains 的全部结果
+
+import re
+
+from django.db import migrations
+
+FTS_TABLE = 'users_employee_fts'
+
+# 分词规则的固定副本（与 apps.common.search 当前实现一致）
+MAX_SUFFIX_RUN = 32
+_CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uac00-\ud7af"
+_TOKEN_RE = re.compile(f"([{_CJK}]+)|([^\\W_{_CJK}]+)")
+
+
+def segment(*texts):
+    parts = []
+    for text in texts:
+        for cjk, word in _TOKEN_RE.findall((text or "").lower()):
+            if cjk:
+                parts.append(" ".join(cjk))
+            else:
+                parts.extend(word[i:i + MAX_SUFFIX_RUN] for i in range(len(word)))
+    return " ".join(parts)
+
+
+def rebuild_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT count(*) FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+        if not cursor.fetchone()[0]:
+            return
+        Employee = apps.get_model('users', 'Employee')
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        batch = []
+        rows = Employee.objects.order_by().values_list('id', 'work_id', 'name', 'phone')
+        for pk, *texts in rows.iterator(chunk_size=5000):
+            batch.append((pk, segment(*texts)))
+            if len(batch) >= 5000:
+                cursor.executemany(f'INSERT INTO {FTS_TABLE}(rowid, doc) VALUES (%s, %s)', batch)
+                batch = []
+        cursor.executemany(f'INSERT INTO {FTS_TABLE}(rowid, doc) VALUES (%s, %s)', batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_employee_search'),
+    ]
+
+    operations = [
+        migrations.RunPython(rebuild_search_index, migrations.RunPython.noop),
+    ]
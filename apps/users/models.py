@@ -35,7 +35,8 @@ class Employee(models.Model):
     name = models.CharField(max_length=100, verbose_name='姓名')
     department = models.CharField(max_length=100, verbose_name='作业区/科室')
     category = models.CharField(max_length=20, choices=CATEGORY_CHOICES, verbose_name='人员类别')
-    phone = models.CharField(max_length=20, verbose_name='手机号')
+    # 按手机号前缀查找员工
+    phone = models.CharField(max_length=20, db_index=True, verbose_name='手机号')
     enabled = models.BooleanField(default=True, verbose_name='是否启用')
     remark = models.TextField(blank=True, verbose_name='备注')
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='创建时间')
@@ -44,6 +45,35 @@ class Employee(models.Model):
     class Meta:
         db_table = 'users_employee'
         ordering = ['-created_at']
+        indexes = [
+            # 默认排序
+            models.Index(fields=['-created_at'], name='users_emp_created_idx'),
+            # 按作业区/科室筛选后按默认排序取一页
+            models.Index(fields=['department', '-created_at'], name='users_emp_dept_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.work_id} - {self.name}"
+
+
+class RevokedToken(models.Model):
+    """已撤销的 JWT（退出登录等），按 jti 记录，过期后可清理"""
+    TOKEN_TYPE_CHOICES = [
+        ('access', '访问令牌'),
+        ('refresh', '刷新令牌'),
+    ]
+
+    jti = models.CharField(max_length=64, unique=True, verbose_name='令牌ID')
+    token_type = models.CharField(max_length=10, choices=TOKEN_TYPE_CHOICES, verbose_name='令牌类型')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True,
+                             related_name='revoked_tokens', verbose_name='用户')
+    expires_at = models.DateTimeField(db_index=True, verbose_name='过期时间')
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='撤销时间')
+
+    class Meta:
+        db_table = 'users_revoked_token'
+        verbose_name = '已撤销令牌'
+        verbose_name_plural = '已撤销令牌列表'
+
+    def __str__(self):
+        return f"{self.token_type} {self.jti}"
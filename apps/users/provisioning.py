@@ -0,0 +1,179 @@
+"""
+批量开通用户
+
+逐个 create_user 时每个密码都在请求进程里串行哈希（PBKDF2 默认约百万次迭代），
+几千个仓库操作员要很久。这里把密码哈希分发到进程池并行计算，
+再用 bulk_create 一次写入用户、资料与角色关联；已存在的用户名跳过。
+所用算法由 settings.PASSWORD_HASHER 选择，与登录校验一致。
+
+哈希几千个密码要占满多个核数十秒，只经 provision_users 管理命令执行，不在 Web 请求中调用。
+调用方提供的密码（各行 password 与显式指定的默认密码）按 AUTH_PASSWORD_VALIDATORS 校验，
+未通过的行记入 errors 并跳过；未填写密码且未指定默认密码时使用 DEFAULT_PASSWORD，
+与后台新建用户一致。
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher, make_password
+from django.contrib.auth.models import Group, User
+from django.contrib.auth.password_validation import validate_password
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from apps.common.pagination import bump_table_version
+
+from .models import UserProfile
+
+DEFAULT_PASSWORD = "123456"
+BATCH_SIZE = 1000
+# 少于该数量的密码直接在当前进程哈希，进程池的启动开销不划算
+_POOL_THRESHOLD = 16
+
+_PROFILE_FIELDS = ("phone", "department", "position", "avatar")
+
+
+def hash_workers() -> int:
+    return getattr(settings, "PASSWORD_HASH_WORKERS", None) or os.cpu_count() or 1
+
+
+def _init_worker():
+    # spawn 方式启动的子进程需要自行初始化 Django；fork 方式下为空操作
+    import django
+    django.setup()
+
+
+def _hash(args):
+    password, algorithm = args
+    return make_password(password, hasher=algorithm)
+
+
+def hash_passwords(passwords, workers=None):
+    """按当前首选算法哈希一组密码，保持顺序；每个密码各自随机加盐"""
+    algorithm = get_hasher("default").algorithm
+    workers = workers or hash_workers()
+    if workers <= 1 or len(passwords) < _POOL_THRESHOLD:
+        return [make_password(password, hasher=algorithm) for password in passwords]
+    chunksize = max(1, len(passwords) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        return list(pool.map(_hash, [(password, algorithm) for password in passwords], chunksize=chunksize))
+
+
+def _groups_of(row):
+    groups = row.get("groups") or []
+    if isinstance(groups, str):
+        groups = groups.replace("，", ",").replace("|", ",").split(",")
+    return [name.strip() for name in groups if name and name.strip()]
+
+
+def _to_bool(value, default):
+    if value is None or value == "":
+        return default
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("1", "true", "yes", "是")
+
+
+def _password_error(password, username, row):
+    """按 AUTH_PASSWORD_VALIDATORS 校验密码，返回错误信息或 None"""
+    user = User(
+        username=username,
+        email=row.get("email") or "",
+        first_name=row.get("first_name") or "",
+        last_name=row.get("last_name") or "",
+    )
+    try:
+        validate_password(password, user=user)
+    except ValidationError as exc:
+        return f"密码不符合要求: {'；'.join(exc.messages)}"
+    return None
+
+
+def provision_users(rows, default_password=None, workers=None, batch_size=BATCH_SIZE) -> dict:
+    """
+    批量创建用户。rows 为字典列表，字段：username（必填）、password、email、first_name、last_name、
+    is_staff、is_active、phone、department、position、avatar、groups（角色名列表或逗号分隔）。
+    返回 {created, skipped（已存在的用户名）, errors（[{row, message}]）}。
+    default_password 不符合密码规则时抛出 ValidationError。
+    """
+    if default_password is None:
+        default_password = DEFAULT_PASSWORD
+    else:
+        validate_password(default_password)
+    errors, candidates, seen = [], [], set()
+    for index, row in enumerate(rows, start=1):
+        username = str(row.get("username") or "").strip()
+        if not username:
+            errors.append({"row": index, "message": "用户名不能为空"})
+        elif len(username) > 150:
+            errors.append({"row": index, "message": f"用户名过长: {username}"})
+        elif username in seen:
+            errors.append({"row": index, "message": f"用户名重复: {username}"})
+        else:
+            seen.add(username)
+            password = str(row.get("password") or "")
+            message = password and _password_error(password, username, row)
+            if message:
+                errors.append({"row": index, "message": message})
+            else:
+                candidates.append((index, username, row))
+
+    names = [username for _, username, _ in candidates]
+    existing = set()
+    for offset in range(0, len(names), batch_size):
+        existing.update(
+            User.objects.filter(username__in=names[offset:offset + batch_size]).values_list("username", flat=True)
+        )
+    candidates = [item for item in candidates if item[1] not in existing]
+
+    group_names = {name for _, _, row in candidates for name in _groups_of(row)}
+    groups = dict(Group.objects.filter(name__in=group_names).values_list("name", "id"))
+    for index, _, row in candidates:
+        unknown = [name for name in _groups_of(row) if name not in groups]
+        if unknown:
+            errors.append({"row": index, "message": f"角色不存在，已忽略: {'、'.join(unknown)}"})
+
+    hashes = hash_passwords(
+        [str(row.get("password") or default_password) for _, _, row in candidates], workers=workers
+    )
+    users = [
+        User(
+            username=username,
+            password=password,
+            email=row.get("email") or "",
+            first_name=row.get("first_name") or "",
+            last_name=row.get("last_name") or "",
+            is_staff=_to_bool(row.get("is_staff"), False),
+            is_active=_to_bool(row.get("is_active"), True),
+        )
+        for (_, username, row), password in zip(candidates, hashes)
+    ]
+
+    with transaction.atomic():
+        User.objects.bulk_create(users, batch_size=batch_size)
+        if any(user.pk is None for user in users):
+            # 数据库不支持 bulk_create 返回主键时按用户名回查
+            ids = dict(User.objects.filter(username__in=[u.username for u in users]).values_list("username", "id"))
+            for user in users:
+                user.pk = ids[user.username]
+        UserProfile.objects.bulk_create(
+            [
+                UserProfile(user_id=user.pk, **{field: row.get(field) or "" for field in _PROFILE_FIELDS})
+                for user, (_, _, row) in zip(users, candidates)
+            ],
+            batch_size=batch_size,
+        )
+        Membership = User.groups.through
+        Membership.objects.bulk_create(
+            [
+                Membership(user_id=user.pk, group_id=groups[name])
+                for user, (_, _, row) in zip(users, candidates)
+                for name in _groups_of(row)
+                if name in groups
+            ],
+            batch_size=batch_size,
+            ignore_conflicts=True,
+        )
+    # bulk_create 不触发模型信号，手动让列表总数缓存失效
+    bump_table_version(User, UserProfile)
+    return {"created": len(users), "skipped": sorted(existing), "errors": errors}
@@ -0,0 +1,235 @@
+"""
+JWT 撤销列表
+
+退出登录、刷新令牌轮换时把令牌的 jti 写入 RevokedToken 表（jti 唯一索引）。
+认证与刷新时先查进程内的布隆过滤器：
+- 不在过滤器中的 jti 一定未被撤销，直接放行，不查库——绝大多数请求走这条路径；
+- 命中过滤器时再按 jti 查表确认，误判率由 JWT_REVOCATION_FALSE_POSITIVE_RATE 控制。
+
+过滤器最多每 JWT_REVOCATION_REFRESH_INTERVAL 秒从表中增量加入新撤销的 jti（按撤销时间，
+回看 _LAG 秒以覆盖提交较晚的事务）；布隆过滤器不能删除元素，因此每
+JWT_REVOCATION_REBUILD_INTERVAL 秒、或加入的条目超过容量时，按未过期的行重建并重新定容。
+重建分多次进行：每次刷新按主键顺序最多加载 JWT_REVOCATION_REBUILD_BATCH 行到新过滤器，
+不会在一个请求里读完整张表；新过滤器完成前旧过滤器照常使用并继续增量加入。
+进程启动后第一个过滤器建成前没有可用的过滤器，期间按 jti 直接查表。
+内存只与容量相关（百万条约 1.2MB），与撤销记录的字符串大小无关。
+本进程内的撤销在提交后立即生效，其他进程最多滞后一个刷新间隔。
+过期的行由 prune_revoked_tokens 命令定期删除。
+"""
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import RevokedToken
+
+# 增量加载时回看的秒数：撤销时间早于提交时间，慢事务提交的行仍能被读到
+_LAG = timedelta(seconds=60)
+_MIN_CAPACITY = 1024
+PRUNE_BATCH_SIZE = 5000
+
+
+def refresh_interval() -> float:
+    return getattr(settings, "JWT_REVOCATION_REFRESH_INTERVAL", 5.0)
+
+
+def rebuild_interval() -> float:
+    return getattr(settings, "JWT_REVOCATION_REBUILD_INTERVAL", 3600.0)
+
+
+def false_positive_rate() -> float:
+    return getattr(settings, "JWT_REVOCATION_FALSE_POSITIVE_RATE", 0.01)
+
+
+def rebuild_batch_size() -> int:
+    return getattr(settings, "JWT_REVOCATION_REBUILD_BATCH", 20000)
+
+
+class BloomFilter:
+    """定长位数组的布隆过滤器；capacity 为预期条目数，超过后误判率上升"""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = max(capacity, _MIN_CAPACITY)
+        bits = math.ceil(-self.capacity * math.log(error_rate) / (math.log(2) ** 2))
+        self.size = (bits + 7) // 8 * 8
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray(self.size // 8)
+        self.count = 0
+
+    def _positions(self, key: str):
+        # 双重散列：一次 blake2b 得到两个 64 位值，组合出 hashes 个位置
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        size = self.size
+        return [(h1 + i * h2) % size for i in range(self.hashes)]
+
+    def add(self, key: str) -> None:
+        bits = self.bits
+        for pos in self._positions(key):
+            bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        bits = self.bits
+        for pos in self._positions(key):
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+    @property
+    def full(self) -> bool:
+        return self.count > self.capacity
+
+
+class _State:
+    def __init__(self):
+        self.bloom = None
+        self.loaded_at = None  # 上次加载开始时的数据库时间
+        self.checked_at = None  # 上次加载的 time.monotonic()
+        self.built_at = None  # 上次重建的 time.monotonic()
+        self.building = None  # 重建中的新过滤器
+        self.build_after = 0  # 重建已加载到的主键
+        self.build_started = None  # 重建开始时的数据库时间
+        self.lock = threading.Lock()
+
+
+_state = _State()
+
+
+def _active_rows(now):
+    return RevokedToken.objects.filter(expires_at__gt=now)
+
+
+def _add_since(bloom, since, now) -> None:
+    queryset = _active_rows(now).filter(created_at__gte=since - _LAG)
+    for jti in queryset.values_list("jti", flat=True).iterator():
+        bloom.add(jti)
+
+
+def _rebuild_step(now) -> None:
+    """
+    重建推进一步：首次调用按未过期的行数定容（两倍，给后续增量加入留出余量），
+    之后每次按主键顺序加载至多 rebuild_batch_size() 行；加载完毕后补上重建期间
+    提交的行，替换当前过滤器
+    """
+    if _state.building is None:
+        _state.building = BloomFilter(_active_rows(now).count() * 2, false_positive_rate())
+        _state.build_after = 0
+        _state.build_started = now
+    bloom = _state.building
+    batch = rebuild_batch_size()
+    rows = list(
+        _active_rows(_state.build_started).filter(id__gt=_state.build_after)
+        .order_by("id").values_list("id", "jti")[:batch]
+    )
+    for _, jti in rows:
+        bloom.add(jti)
+    if rows:
+        _state.build_after = rows[-1][0]
+    if len(rows) == batch:
+        return
+    _add_since(bloom, _state.build_started, now)
+    _state.bloom = bloom
+    _state.building = None
+    _state.built_at = time.monotonic()
+
+
+def _load() -> None:
+    now = timezone.now()
+    bloom = _state.bloom
+    if bloom is not None and _state.loaded_at is not None:
+        _add_since(bloom, _state.loaded_at, now)
+    stale = _state.built_at is None or time.monotonic() - _state.built_at >= rebuild_interval()
+    if _state.building is not None or stale or bloom.full:
+        _rebuild_step(now)
+    _state.loaded_at = now
+
+
+def _ensure_fresh() -> None:
+    if _state.checked_at is not None and time.monotonic() - _state.checked_at < refresh_interval():
+        return
+    with _state.lock:
+        if _state.checked_at is not None and time.monotonic() - _state.checked_at < refresh_interval():
+            return
+        _load()
+        _state.checked_at = time.monotonic()
+
+
+def build_filter() -> None:
+    """在当前线程完成一次完整重建，供启动预热与基准测试使用"""
+    with _state.lock:
+        _state.built_at = None
+        while True:
+            _load()
+            if _state.building is None:
+                break
+        _state.checked_at = time.monotonic()
+
+
+def might_be_revoked(jti) -> bool:
+    """只查过滤器：False 表示一定未撤销；过滤器尚未建成时返回 True"""
+    _ensure_fresh()
+    bloom = _state.bloom
+    return bloom is None or jti in bloom
+
+
+def is_revoked(jti) -> bool:
+    if not jti:
+        return False
+    if not might_be_revoked(jti):
+        return False
+    return RevokedToken.objects.filter(jti=jti).exists()
+
+
+def is_token_revoked(token) -> bool:
+    return is_revoked(token.get(api_settings.JTI_CLAIM))
+
+
+def _remember(jti) -> None:
+    for bloom in (_state.bloom, _state.building):
+        if bloom is not None:
+            bloom.add(jti)
+
+
+def revoke(token, user=None) -> bool:
+    """
+    撤销一个已校验的令牌。返回 True 表示本次写入了撤销记录；
+    令牌没有 jti 或已被撤销（包括并发请求刚刚撤销）时返回 False
+    """
+    jti = token.get(api_settings.JTI_CLAIM)
+    if not jti:
+        return False
+    try:
+        with transaction.atomic():
+            RevokedToken.objects.create(
+                jti=jti,
+                token_type=token.get(api_settings.TOKEN_TYPE_CLAIM) or "access",
+                user_id=getattr(user, "pk", None) or token.get(api_settings.USER_ID_CLAIM),
+                expires_at=datetime.fromtimestamp(token["exp"], tz=dt_timezone.utc),
+            )
+    except IntegrityError:
+        return False
+    transaction.on_commit(lambda: _remember(jti))
+    return True
+
+
+def prune(batch_size: int = PRUNE_BATCH_SIZE) -> int:
+    """分批删除已过期的撤销记录，返回删除条数；过期令牌本身已无法通过校验"""
+    now = timezone.now()
+    deleted = 0
+    while True:
+        ids = list(
+            RevokedToken.objects.filter(expires_at__lte=now).order_by("expires_at")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        if not ids:
+            return deleted
+        count, _ = RevokedToken.objects.filter(id__in=ids).delete()
+        deleted += count
@@ -0,0 +1,130 @@
+"""
+员工搜索
+
+选择领料人等场景按关键字查找员工：
+1. 工号、手机号按前缀匹配，走 B-tree 索引（工号唯一索引、手机号索引）；
+   SQLite 的 LIKE 不区分大小写、用不上索引，改写为等价的区间比较。
+2. 姓名、工号、手机号按子串匹配：SQLite 下查 FTS5 虚拟表 users_employee_fts
+   （rowid 即员工主键，分词规则见 apps.common.search）取候选行，再以 icontains 过滤，
+   结果与 icontains 一致；PostgreSQL 下由 pg_trgm
+   三元组 GIN 索引加速 icontains。只含字母数字且短于 MIN_SUBSTRING_LENGTH 的关键字
+   只做前缀匹配，避免一两个数字命中几乎全表。
+批量导入绕过模型信号，由导入代码显式调用 index_employees；可执行 rebuild_search_index 重建。
+"""
+from django.db import connection, transaction
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from apps.common.search import match_expression, segment
+
+EMPLOYEE_TABLE = "users_employee_fts"
+
+# 纯字母数字关键字达到该长度才做子串匹配（如手机号后四位）
+MIN_SUBSTRING_LENGTH = 3
+
+_available = None
+
+
+def backend():
+    """当前可用的搜索后端：'fts5'、'trigram' 或 None（回退到 icontains）"""
+    global _available
+    if _available is None:
+        if connection.vendor == "postgresql":
+            _available = "trigram"
+        elif connection.vendor == "sqlite":
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT count(*) FROM sqlite_master WHERE type = 'table' AND name = %s", [EMPLOYEE_TABLE]
+                )
+                _available = "fts5" if cursor.fetchone()[0] else ""
+        else:
+            _available = ""
+    return _available or None
+
+
+def prefix_q(field: str, prefix: str) -> Q:
+    """可走 B-tree 索引的前缀匹配（区分大小写）"""
+    if connection.vendor != "sqlite":
+        # PostgreSQL 为唯一 / db_index 的字符字段额外创建 varchar_pattern_ops 索引，LIKE 'x%' 可直接使用
+        return Q(**{f"{field}__startswith": prefix})
+    # SQLite 默认按字节比较，前缀 p 的全部字符串落在 [p, p 末字符加一) 区间内
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return Q(**{f"{field}__gte": prefix, f"{field}__lt": upper})
+
+
+def employee_q(query: str) -> Q:
+    query = (query or "").strip()
+    if not query:
+        return Q()
+    condition = prefix_q("work_id", query) | prefix_q("phone", query)
+    if query.upper() != query:
+        # 工号多为大写字母加数字，小写输入同时按大写前缀匹配
+        condition |= prefix_q("work_id", query.upper())
+    if query.isascii() and query.isalnum() and len(query) < MIN_SUBSTRING_LENGTH:
+        return condition
+    substring = Q(name__icontains=query) | Q(work_id__icontains=query) | Q(phone__icontains=query)
+    expression = match_expression(query) if backend() == "fts5" else None
+    if expression is None:
+        return condition | substring
+    candidates = Q(id__in=RawSQL(f"SELECT rowid FROM {EMPLOYEE_TABLE} WHERE {EMPLOYEE_TABLE} MATCH %s",
+                                 [expression]))
+    return condition | (candidates & substring)
+
+
+# ====== 索引维护 ======
+
+
+def employee_docs(rows):
+    """rows: (id, work_id, name, phone)"""
+    return ((pk, segment(work_id, name, phone)) for pk, work_id, name, phone in rows)
+
+
+def _write(docs, replace: bool = True) -> None:
+    docs = list(docs)
+    if docs and backend() == "fts5":
+        verb = "INSERT OR REPLACE" if replace else "INSERT"
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.executemany(f"{verb} INTO {EMPLOYEE_TABLE}(rowid, doc) VALUES (%s, %s)", docs)
+
+
+def index_employees(queryset) -> None:
+    _write(employee_docs(queryset.values_list("id", "work_id", "name", "phone")))
+
+
+def on_employee_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    _write(employee_docs([(instance.pk, instance.work_id, instance.name, instance.phone)]))
+
+
+def on_employee_deleted(sender, instance, **kwargs):
+    if backend() == "fts5":
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {EMPLOYEE_TABLE} WHERE rowid = %s", [instance.pk])
+
+
+def rebuild(batch_size: int = 5000, stdout=None) -> None:
+    """清空并重建员工搜索索引"""
+    from .models import Employee
+
+    global _available
+    _available = None
+    if backend() != "fts5":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {EMPLOYEE_TABLE}")
+    batch = []
+    total = 0
+    rows = Employee.objects.order_by().values_list("id", "work_id", "name", "phone")
+    for row in rows.iterator(chunk_size=batch_size):
+        batch.append(row)
+        if len(batch) >= batch_size:
+            _write(employee_docs(batch), replace=False)
+            total += len(batch)
+            batch = []
+    _write(employee_docs(batch), replace=False)
+    total += len(batch)
+    with connection.cursor() as cursor:
+        cursor.execute(f"INSERT INTO {EMPLOYEE_TABLE}({EMPLOYEE_TABLE}) VALUES ('optimize')")
+    if stdout:
+        stdout.write(f"{EMPLOYEE_TABLE}: {total}")
@@ -1,5 +1,8 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
+
+from apps.common.rows import RowSerializer, iso_datetime
+
 from .models import UserProfile, Employee
 
 
@@ -82,3 +85,21 @@ class EmployeeSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("工号已存在")
         
         return value
+
+
+# 员工列表的行序列化：输出与 EmployeeSerializer 的 data 一致
+EMPLOYEE_ROW = RowSerializer(
+    {
+        "id": "id",
+        "work_id": "work_id",
+        "name": "name",
+        "department": "department",
+        "category": "category",
+        "phone": "phone",
+        "enabled": "enabled",
+        "remark": "remark",
+        "created_at": "created_at",
+        "updated_at": "updated_at",
+    },
+    converters={"created_at": iso_datetime, "updated_at": iso_datetime},
+)
@@ -1,7 +1,15 @@
 from django.urls import path, include, re_path
 from rest_framework.routers import DefaultRouter
 
-from .views import UserViewSet, EmployeeViewSet, employee_list, employee_add, employee_detail
+from .views import (
+    UserViewSet,
+    EmployeeViewSet,
+    employee_list,
+    employee_add,
+    employee_import,
+    employee_export,
+    employee_detail,
+)
 
 router = DefaultRouter()
 router.register('', UserViewSet, basename='user')
@@ -11,5 +19,7 @@ urlpatterns = [
     path('', include(router.urls)),
     re_path(r'^employee/list/?$', employee_list, name='employee-list'),
     re_path(r'^employee/add/?$', employee_add, name='employee-add'),
+    re_path(r'^employee/import/?$', employee_import, name='employee-import'),
+    re_path(r'^employee/export/?$', employee_export, name='employee-export'),
     re_path(r'^employee/(?P<pk>[^/]+)/?$', employee_detail, name='employee-detail'),
 ]
@@ -2,21 +2,25 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
-from rest_framework.pagination import PageNumberPagination
 from django.contrib.auth.models import User
 from django.shortcuts import get_object_or_404
 
+from apps.common.pagination import BasePage
+from apps.common.rows import FIELDS_QUERY_PARAM
+from apps.common.uploads import EXPORT_CHUNK_SIZE, read_upload_rows, stream_csv
+
+from .importer import import_employees
 from .models import UserProfile, Employee
-from .serializers import UserSerializer, RegisterSerializer, EmployeeSerializer
+from .search import employee_q
+from .serializers import EMPLOYEE_ROW, UserSerializer, RegisterSerializer, EmployeeSerializer
 
 
 def _success(data=None, message="success"):
     return {"code": 200, "message": message, "data": data}
 
 
-class _Page(PageNumberPagination):
-    page_size_query_param = "size"
-    page_query_param = "page"
+class _Page(BasePage):
+    pass
 
 
 class UserViewSet(viewsets.ModelViewSet):
@@ -83,6 +87,28 @@ class UserViewSet(viewsets.ModelViewSet):
         return Response(_success(None, "密码已重置"))
 
 
+def _filter_employees(queryset, params):
+    """
+    按查询参数筛选员工：department、category 精确匹配，enabled 为 1/0（true/false），
+    search（或 q）按工号、手机号前缀及姓名、工号、手机号子串查找
+    """
+    department = params.get('department')
+    if department:
+        queryset = queryset.filter(department=department)
+    category = params.get('category')
+    if category:
+        queryset = queryset.filter(category=category)
+    enabled = str(params.get('enabled') or '').lower()
+    if enabled in ('1', 'true'):
+        queryset = queryset.filter(enabled=True)
+    elif enabled in ('0', 'false'):
+        queryset = queryset.filter(enabled=False)
+    search = params.get('search') or params.get('q')
+    if search:
+        queryset = queryset.filter(employee_q(search))
+    return queryset
+
+
 class EmployeeViewSet(viewsets.ModelViewSet):
     """员工管理视图集"""
     queryset = Employee.objects.all()
@@ -90,6 +116,12 @@ class EmployeeViewSet(viewsets.ModelViewSet):
     permission_classes = [AllowAny]
     ordering_fields = ['work_id', 'name', 'created_at']
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            queryset = _filter_employees(queryset, self.request.query_params)
+        return queryset
+
 
 # ====== Custom endpoints for employee management ======
 
@@ -98,16 +130,10 @@ class EmployeeViewSet(viewsets.ModelViewSet):
 @permission_classes([AllowAny])
 def employee_list(request):
     paginator = _Page()
-    qs = Employee.objects.all().order_by('-created_at')
-    page = paginator.paginate_queryset(qs, request)
-    serializer = EmployeeSerializer(page, many=True)
-    payload = {
-        "list": serializer.data,
-        "total": paginator.page.paginator.count if paginator.page else qs.count(),
-        "page": paginator.page.number if paginator.page else 1,
-        "size": paginator.get_page_size(request),
-    }
-    return Response(_success(payload))
+    qs = _filter_employees(Employee.objects.all(), request.query_params).order_by('-created_at')
+    row = EMPLOYEE_ROW.project(request.query_params.get(FIELDS_QUERY_PARAM))
+    page = paginator.paginate_queryset(row.values(qs), request)
+    return Response(_success(paginator.get_payload(row.many(page))))
 
 
 @api_view(['POST'])
@@ -136,3 +162,41 @@ def employee_detail(request, pk: int):
     
     serializer = EmployeeSerializer(instance)
     return Response(_success(serializer.data))
+
+
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def employee_import(request):
+    """批量导入员工（csv/xlsx/xls），工号按整批校验唯一，返回新增数与逐行错误"""
+    upload = request.FILES.get('file')
+    if not upload:
+        return Response(_success(None, "缺少文件"), status=status.HTTP_400_BAD_REQUEST)
+    rows, err = read_upload_rows(upload)
+    if err:
+        return Response(_success(None, err), status=status.HTTP_400_BAD_REQUEST)
+    result = import_employees(rows)
+    return Response(_success(result, "导入完成"))
+
+
+_EXPORT_COLUMNS = [
+    'work_id',
+    'name',
+    'department',
+    'category',
+    'phone',
+    'enabled',
+    'remark',
+    'created_at',
+    'updated_at',
+]
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def employee_export(request):
+    queryset = Employee.objects.order_by('-id').values_list(*_EXPORT_COLUMNS)
+    rows = (
+        row[:-2] + (row[-2].isoformat(), row[-1].isoformat())
+        for row in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+    return stream_csv(_EXPORT_COLUMNS, rows, "employees.csv")
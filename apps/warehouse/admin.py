@@ -1,11 +1,11 @@
 from django.contrib import admin
-from .models import Item, InboundRecord, OutboundRecord
+from .models import ImportJob, Item, InboundRecord, LowStockEvent, OutboundRecord
 
 
 @admin.register(Item)
 class ItemAdmin(admin.ModelAdmin):
-    list_display = ['item_code', 'item_name', 'category', 'current_stock', 'min_stock', 'location']
-    list_filter = ['category']
+    list_display = ['item_code', 'item_name', 'category', 'current_stock', 'min_stock', 'is_low_stock', 'location']
+    list_filter = ['category', 'is_low_stock']
     search_fields = ['item_code', 'item_name']
 
 
@@ -21,3 +21,15 @@ class OutboundRecordAdmin(admin.ModelAdmin):
     list_display = ['item', 'quantity', 'receiver', 'outbound_date', 'operator']
     list_filter = ['outbound_date']
     search_fields = ['item__item_name', 'receiver']
+
+
+@admin.register(ImportJob)
+class ImportJobAdmin(admin.ModelAdmin):
+    list_display = ['file_name', 'status', 'processed_rows', 'total_rows', 'error_count', 'created_at']
+    list_filter = ['status']
+
+
+@admin.register(LowStockEvent)
+class LowStockEventAdmin(admin.ModelAdmin):
+    list_display = ['item', 'is_low', 'current_stock', 'min_stock', 'created_at']
+    list_filter = ['is_low']
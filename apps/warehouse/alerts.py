@@ -0,0 +1,175 @@
+"""
+低库存变化推送
+
+Item.is_low_stock 标志由库存过账、物品保存与批量导入同步维护；标志翻转时写入一条
+LowStockEvent。客户端先读取一次低库存列表，之后带着游标（最后收到的事件 id）
+通过长轮询或 SSE 接收后续变化，不必反复全量拉取。
+
+等待新事件时按主键做范围查询，代价与物品数、事件总数无关；同一进程内写入的事件
+在事务提交后立即唤醒等待方，其他进程写入的事件在下一个轮询间隔内被发现。
+
+事件在过账事务内写入，主键分配顺序与提交顺序不一定一致：先取得较小 id 的事务可能更晚提交。
+读取时只连续地向前推进——id 与上一条相邻的事件直接返回；遇到 id 空缺（可能是尚未提交的事务），
+空缺之后的事件要写入超过 LOW_STOCK_COMMIT_WINDOW 秒才返回，给空缺处的事务留出提交时间。
+该窗口应大于最长的过账事务；回滚留下的空缺只会让其后的事件晚一个窗口送达。
+
+长轮询为推荐的传输方式；SSE 连接在整个保持期间占用一个同步 worker，
+每个进程同时保持的 SSE 连接数以 LOW_STOCK_MAX_STREAMS 为上限。
+"""
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Item, LowStockEvent
+
+EVENT_BATCH_SIZE = 200
+
+_changed = threading.Condition()
+
+
+def poll_interval() -> float:
+    return getattr(settings, "LOW_STOCK_POLL_INTERVAL", 1.0)
+
+
+def long_poll_timeout() -> float:
+    return getattr(settings, "LOW_STOCK_LONG_POLL_TIMEOUT", 25)
+
+
+def stream_seconds() -> float:
+    return getattr(settings, "LOW_STOCK_STREAM_SECONDS", 300)
+
+
+def commit_window() -> float:
+    return getattr(settings, "LOW_STOCK_COMMIT_WINDOW", 5.0)
+
+
+class StreamSlots:
+    """进程内 SSE 连接名额；acquire 失败时调用方应拒绝连接"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.active = 0
+
+    def acquire(self) -> bool:
+        with self._lock:
+            if self.active >= getattr(settings, "LOW_STOCK_MAX_STREAMS", 4):
+                return False
+            self.active += 1
+            return True
+
+    def release(self) -> None:
+        with self._lock:
+            self.active -= 1
+
+
+stream_slots = StreamSlots()
+
+
+def _notify() -> None:
+    with _changed:
+        _changed.notify_all()
+
+
+def record_crossings(crossings) -> None:
+    """
+    写入低库存变化。crossings 为 (item_id, is_low, current_stock, min_stock) 序列，
+    只应包含标志确实翻转的物品。
+    """
+    events = [
+        LowStockEvent(item_id=item_id, is_low=is_low, current_stock=current_stock, min_stock=min_stock)
+        for item_id, is_low, current_stock, min_stock in crossings
+    ]
+    if not events:
+        return
+    LowStockEvent.objects.bulk_create(events, batch_size=EVENT_BATCH_SIZE)
+    transaction.on_commit(_notify)
+
+
+def record_item_change(item: Item, was_low) -> None:
+    """物品保存后调用；was_low 为保存前的标志，新建物品传 None（视为原先不低）"""
+    if item.is_low_stock != bool(was_low):
+        record_crossings([(item.pk, item.is_low_stock, item.current_stock, item.min_stock)])
+
+
+def on_item_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    # 保存前快照由 summary.on_item_pre_save 暂存
+    before = getattr(instance, "_summary_before", None)
+    record_item_change(instance, before.is_low if before else None)
+
+
+# ====== 读取 ======
+
+
+def _settled(cursor: int, events):
+    """
+    events 为按 id 升序、id 大于 cursor 的事件；返回可安全送达的前缀。
+    遇到 id 空缺后，只有写入时间早于提交窗口的事件才继续送达。
+    """
+    cutoff = timezone.now() - timedelta(seconds=commit_window())
+    settled = []
+    previous = cursor
+    for event in events:
+        if event.id != previous + 1 and event.created_at > cutoff:
+            break
+        settled.append(event)
+        previous = event.id
+    return settled
+
+
+def latest_cursor() -> int:
+    """
+    新客户端的起始游标：提交窗口之前的最后一个事件。窗口内的事件会再次送达一遍，
+    事件描述的是标志的当前状态，重复接收无副作用。
+    """
+    cutoff = timezone.now() - timedelta(seconds=commit_window())
+    return (
+        LowStockEvent.objects.filter(created_at__lte=cutoff)
+        .order_by("-id").values_list("id", flat=True).first() or 0
+    )
+
+
+def events_after(cursor: int, limit: int = EVENT_BATCH_SIZE):
+    events = list(
+        LowStockEvent.objects.filter(id__gt=cursor)
+        .select_related("item")
+        .order_by("id")[:limit]
+    )
+    return _settled(cursor, events)
+
+
+def wait_for_events(cursor: int, timeout: float, limit: int = EVENT_BATCH_SIZE):
+    """阻塞直到有 id 大于 cursor 且可安全送达的事件或超时，返回事件列表（可能为空）"""
+    deadline = time.monotonic() + max(timeout, 0)
+    while True:
+        events = events_after(cursor, limit)
+        remaining = deadline - time.monotonic()
+        if events or remaining <= 0:
+            return events
+        with _changed:
+            _changed.wait(min(poll_interval(), remaining))
+
+
+def event_to_front(event: LowStockEvent) -> dict:
+    return {
+        "id": event.id,
+        "itemId": event.item_id,
+        "itemCode": event.item.item_code,
+        "itemName": event.item.item_name,
+        "isLow": event.is_low,
+        "currentStock": event.current_stock,
+        "minStock": event.min_stock,
+        "createdAt": event.created_at,
+    }
+
+
+def prune(days: int) -> int:
+    """删除早于 days 天的事件，返回删除条数"""
+    cutoff = timezone.now() - timedelta(days=days)
+    deleted, _ = LowStockEvent.objects.filter(created_at__lt=cutoff).delete()
+    return deleted
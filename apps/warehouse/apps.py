@@ -5,3 +5,26 @@ class WarehouseConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.warehouse'
     verbose_name = '仓库管理'
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+
+        from . import alerts, search, summary
+        from .models import InboundRecord, Item, OutboundRecord
+
+        post_save.connect(search.on_item_saved, sender=Item, dispatch_uid='warehouse_search_item')
+        post_save.connect(search.on_inbound_saved, sender=InboundRecord, dispatch_uid='warehouse_search_inbound')
+        post_save.connect(search.on_outbound_saved, sender=OutboundRecord, dispatch_uid='warehouse_search_outbound')
+        for model in (Item, InboundRecord, OutboundRecord):
+            post_delete.connect(search.on_deleted, sender=model, dispatch_uid=f'warehouse_search_delete_{model.__name__}')
+
+        pre_save.connect(summary.on_item_pre_save, sender=Item, dispatch_uid='warehouse_summary_pre_save')
+        post_save.connect(summary.on_item_saved, sender=Item, dispatch_uid='warehouse_summary_saved')
+        pre_delete.connect(summary.on_item_pre_delete, sender=Item, dispatch_uid='warehouse_summary_pre_delete')
+        post_save.connect(alerts.on_item_saved, sender=Item, dispatch_uid='warehouse_alerts_saved')
+
+        from apps.system.flow import flow_finished
+
+        from . import stock
+
+        flow_finished.connect(stock.on_flow_finished, dispatch_uid='warehouse_outbound_flow_finished')
@@ -0,0 +1,188 @@
+"""
+物品批量导入
+
+按块处理上传行：每块用一次查询预加载已存在的物品编号、一次查询预加载重名，
+在内存中划分新增/更新集合，再以 bulk_create 写入新增行；更新行在后端支持
+ON CONFLICT 时以 upsert 写入，否则退回 bulk_update。
+查询次数与块数成正比，而不是与行数成正比。
+"""
+from itertools import islice
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.common.pagination import bump_table_version
+
+from . import alerts, search
+from .models import Item
+from .summary import Snapshot, SummaryDelta
+
+IMPORT_CHUNK_SIZE = 500
+
+_UPDATE_FIELDS = [
+    "item_name",
+    "category",
+    "specification",
+    "unit",
+    "initial_stock",
+    "current_stock",
+    "min_stock",
+    "is_low_stock",
+    "location",
+    "remark",
+    "updated_at",
+]
+
+
+def _to_int(value, default: int = 0) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _text(value) -> str:
+    if value is None:
+        return ""
+    return str(value).strip()
+
+
+def _row_defaults(row, name: str) -> dict:
+    return {
+        "item_name": name,
+        "category": _text(row.get("category")) or "其他",
+        "specification": _text(row.get("specification")),
+        "unit": _text(row.get("unit")) or "个",
+        "initial_stock": _to_int(row.get("initial_stock") or row.get("current_stock"), 0),
+        "current_stock": _to_int(row.get("current_stock"), 0),
+        "min_stock": _to_int(row.get("min_stock"), 10),
+        "location": _text(row.get("location")),
+        "remark": _text(row.get("remark")),
+    }
+
+
+def new_result() -> dict:
+    return {"created": 0, "updated": 0, "errors": []}
+
+
+def import_chunk(rows, start: int, result: dict) -> None:
+    """
+    导入一块行数据并把计数累加到 result；start 为该块首行的行号（从 1 开始）。
+
+    校验规则与逐行导入一致：缺少编号或名称的行报错；名称已被占用的行报错；
+    编号已存在则更新，否则新增。错误按行号顺序追加到 result["errors"]。
+    """
+    parsed, errors = [], []
+    for idx, row in enumerate(rows, start=start):
+        code = _text(row.get("item_code"))
+        name = _text(row.get("item_name"))
+        if not code or not name:
+            errors.append((idx, f"第{idx}行缺少 item_code 或 item_name"))
+            continue
+        parsed.append((idx, code, name, row))
+    if not parsed:
+        result["errors"].extend(message for _, message in errors)
+        return
+
+    existing = {
+        obj.item_code: obj
+        for obj in Item.objects.filter(item_code__in={p[1] for p in parsed}).order_by()
+    }
+    taken_names = set(
+        Item.objects.filter(item_name__in={p[2] for p in parsed}).order_by().values_list("item_name", flat=True)
+    )
+
+    now = timezone.now()
+    to_create, to_update = {}, {}
+    was_low = {}
+    changes = SummaryDelta()
+    for idx, code, name, row in parsed:
+        # 名称重复校验：已存在（含本批次先前行写入的）同名则拒绝导入该行
+        if name in taken_names:
+            errors.append((idx, f"第{idx}行物品名称已存在: {name}"))
+            continue
+
+        defaults = _row_defaults(row, name)
+        obj = to_create.get(code) or existing.get(code)
+        if obj is None:
+            to_create[code] = Item(item_code=code, **defaults)
+            result["created"] += 1
+        else:
+            taken_names.discard(obj.item_name)
+            if code not in to_create and code not in to_update:
+                changes.remove(Snapshot.of(obj))
+                was_low[code] = obj.is_low_stock
+            for field, value in defaults.items():
+                setattr(obj, field, value)
+            if code not in to_create:
+                obj.updated_at = now
+                to_update[code] = obj
+            result["updated"] += 1
+        taken_names.add(name)
+    # 两轮校验分别产生的错误合并后按行号排列
+    errors.sort(key=lambda error: error[0])
+    result["errors"].extend(message for _, message in errors)
+
+    crossed = []
+    for code, obj in [*to_create.items(), *to_update.items()]:
+        # 批量写入绕过 Item.save，在此同步低库存标志
+        if obj.sync_low_stock() != was_low.get(code, False):
+            crossed.append(obj)
+
+    with transaction.atomic():
+        if to_create:
+            Item.objects.bulk_create(to_create.values(), batch_size=IMPORT_CHUNK_SIZE)
+        if to_update:
+            _write_updates(list(to_update.values()))
+        if to_create or to_update:
+            # 批量写入不触发模型信号，显式刷新搜索索引与库存汇总
+            search.index_items(Item.objects.filter(item_code__in=[*to_create, *to_update]))
+            for obj in [*to_create.values(), *to_update.values()]:
+                changes.add(Snapshot.of(obj))
+            changes.apply()
+        if crossed:
+            _record_crossings(crossed)
+    bump_table_version(Item)
+
+
+def _record_crossings(objs) -> None:
+    # 后端不支持 bulk_create 回填主键时按编号补查
+    missing = [obj.item_code for obj in objs if obj.pk is None]
+    ids = dict(Item.objects.filter(item_code__in=missing).order_by().values_list("item_code", "id")) if missing else {}
+    alerts.record_crossings(
+        (obj.pk or ids[obj.item_code], obj.is_low_stock, obj.current_stock, obj.min_stock)
+        for obj in objs
+    )
+
+
+def _write_updates(objs) -> None:
+    if connection.features.supports_update_conflicts_with_target:
+        # 以编号为冲突键 upsert，避免 bulk_update 生成的 CASE WHEN 在大批量下退化
+        # 使用不带主键的副本，冲突判定只落在 item_code 唯一约束上
+        rows = [
+            Item(item_code=obj.item_code, **{f: getattr(obj, f) for f in _UPDATE_FIELDS})
+            for obj in objs
+        ]
+        Item.objects.bulk_create(
+            rows,
+            batch_size=IMPORT_CHUNK_SIZE,
+            update_conflicts=True,
+            unique_fields=["item_code"],
+            update_fields=_UPDATE_FIELDS,
+        )
+    else:
+        Item.objects.bulk_update(objs, _UPDATE_FIELDS, batch_size=100)
+
+
+def import_items(rows, chunk_size: int = IMPORT_CHUNK_SIZE) -> dict:
+    """逐块导入可迭代的行数据，返回 {created, updated, errors} 汇总"""
+    result = new_result()
+    iterator = iter(rows)
+    start = 1
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            break
+        import_chunk(chunk, start, result)
+        start += len(chunk)
+    return result
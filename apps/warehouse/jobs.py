@@ -0,0 +1,180 @@
+"""
+后台导入任务
+
+上传文件先落盘并登记为 ImportJob，由 run_import_jobs 管理命令轮询数据库执行，
+无需外部消息队列。每处理一块数据就把导入结果与任务进度在同一事务中提交，
+进程重启后从 processed_rows 处继续，不会重复或遗漏。
+"""
+import itertools
+import os
+import socket
+from datetime import timedelta
+from types import SimpleNamespace
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from apps.common.uploads import read_upload_rows
+
+from .importer import IMPORT_CHUNK_SIZE, import_chunk, new_result
+from .models import ImportJob
+
+# 每个任务最多保存的错误条数，超出部分只计数
+MAX_STORED_ERRORS = 1000
+
+
+class JobLost(Exception):
+    """任务已被其他执行进程接管"""
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def enqueue_import(upload, operator=None) -> ImportJob:
+    """保存上传文件并登记为待执行任务"""
+    job = ImportJob(file_name=upload.name or "", operator=operator)
+    job.file.save(os.path.basename(upload.name or "upload"), upload, save=False)
+    job.save()
+    return job
+
+
+def claim_next(worker: str, stale_seconds: int = 300):
+    """
+    领取一个待执行任务；心跳超时的执行中任务视为进程已退出，可被重新领取。
+    以带原状态条件的 UPDATE 抢占，多个执行进程并存时同一任务只会被一个领取。
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=stale_seconds)
+    candidates = (
+        ImportJob.objects.filter(
+            Q(status="pending")
+            | Q(status="running", heartbeat_at__lt=stale)
+            | Q(status="running", heartbeat_at__isnull=True)
+        )
+        .order_by("created_at")
+        .values_list("pk", "status", "heartbeat_at")[:5]
+    )
+    for pk, status, heartbeat_at in candidates:
+        claimed = ImportJob.objects.filter(pk=pk, status=status, heartbeat_at=heartbeat_at).update(
+            status="running",
+            worker=worker,
+            heartbeat_at=now,
+            started_at=now if status == "pending" else F("started_at"),
+        )
+        if claimed:
+            return ImportJob.objects.get(pk=pk)
+    return None
+
+
+def _open_rows(job):
+    job.file.open("rb")
+    return read_upload_rows(SimpleNamespace(name=job.file_name, file=job.file.file))
+
+
+def _heartbeat(job: ImportJob, worker: str) -> None:
+    """刷新心跳；任务已被其他执行进程接管时抛出 JobLost"""
+    updated = ImportJob.objects.filter(pk=job.pk, worker=worker, status="running").update(
+        heartbeat_at=timezone.now()
+    )
+    if not updated:
+        raise JobLost(job.pk)
+
+
+def _count_rows(job: ImportJob, worker: str, every: int = IMPORT_CHUNK_SIZE) -> int:
+    """统计总行数；大文件计数耗时较长，每 every 行刷新一次心跳，避免被判为失联而重复领取"""
+    rows, err = _open_rows(job)
+    try:
+        if err:
+            return 0
+        total = 0
+        for total, _ in enumerate(rows, 1):
+            if total % every == 0:
+                _heartbeat(job, worker)
+        return total
+    finally:
+        job.file.close()
+
+
+def run_job(job: ImportJob, worker: str, chunk_size: int = IMPORT_CHUNK_SIZE) -> ImportJob:
+    """执行（或续跑）一个已领取的任务"""
+    try:
+        if job.total_rows is None:
+            job.total_rows = _count_rows(job, worker, chunk_size)
+            if not ImportJob.objects.filter(pk=job.pk, worker=worker, status="running").update(
+                total_rows=job.total_rows, heartbeat_at=timezone.now()
+            ):
+                raise JobLost(job.pk)
+
+        rows, err = _open_rows(job)
+        if err:
+            _finish(job, worker, "failed", err)
+            return job
+        try:
+            iterator = itertools.islice(rows, job.processed_rows, None)
+            while True:
+                chunk = list(itertools.islice(iterator, chunk_size))
+                if not chunk:
+                    break
+                _commit_chunk(job, worker, chunk)
+        finally:
+            job.file.close()
+    except JobLost:
+        return job
+    except Exception as exc:
+        _finish(job, worker, "failed", str(exc)[:200])
+        return job
+
+    _finish(job, worker, "success", "导入完成")
+    return job
+
+
+def _commit_chunk(job: ImportJob, worker: str, chunk) -> None:
+    result = new_result()
+    with transaction.atomic():
+        import_chunk(chunk, job.processed_rows + 1, result)
+        room = MAX_STORED_ERRORS - len(job.errors)
+        errors = job.errors + result["errors"][:max(room, 0)]
+        updated = ImportJob.objects.filter(pk=job.pk, worker=worker, status="running").update(
+            processed_rows=F("processed_rows") + len(chunk),
+            created_count=F("created_count") + result["created"],
+            updated_count=F("updated_count") + result["updated"],
+            error_count=F("error_count") + len(result["errors"]),
+            errors=errors,
+            heartbeat_at=timezone.now(),
+        )
+        if not updated:
+            # 回滚本块，交由接管的进程处理
+            raise JobLost(job.pk)
+    job.processed_rows += len(chunk)
+    job.created_count += result["created"]
+    job.updated_count += result["updated"]
+    job.error_count += len(result["errors"])
+    job.errors = errors
+
+
+def _finish(job: ImportJob, worker: str, status: str, message: str) -> None:
+    now = timezone.now()
+    ImportJob.objects.filter(pk=job.pk, worker=worker).update(
+        status=status, message=message, finished_at=now, heartbeat_at=now,
+    )
+    job.status, job.message, job.finished_at = status, message, now
+
+
+def job_to_front(job: ImportJob) -> dict:
+    return {
+        "id": job.id,
+        "fileName": job.file_name,
+        "status": job.status,
+        "totalRows": job.total_rows,
+        "processedRows": job.processed_rows,
+        "created": job.created_count,
+        "updated": job.updated_count,
+        "errorCount": job.error_count,
+        "errors": job.errors,
+        "message": job.message,
+        "createdAt": job.created_at,
+        "startedAt": job.started_at,
+        "finishedAt": job.finished_at,
+    }
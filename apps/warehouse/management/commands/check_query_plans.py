@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.warehouse.query_plans import check_plans
+
+
+class Command(BaseCommand):
+    help = '对仓库热点查询执行 EXPLAIN，出现全表扫描或临时排序时以非零状态退出'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verbose-plan', action='store_true', help='输出完整执行计划')
+
+    def handle(self, *args, **options):
+        failed = 0
+        for name, plan, problems in check_plans():
+            if problems:
+                failed += 1
+                self.stdout.write(self.style.ERROR(f'✗ {name}: {"；".join(problems)}'))
+            else:
+                self.stdout.write(self.style.SUCCESS(f'✓ {name}'))
+            if problems or options['verbose_plan']:
+                for line in plan.splitlines():
+                    self.stdout.write(f'    {line}')
+        if failed:
+            raise CommandError(f'{failed} 条热点查询执行计划退化')
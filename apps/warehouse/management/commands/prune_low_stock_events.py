@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from apps.warehouse import alerts
+
+
+class Command(BaseCommand):
+    help = '删除过期的低库存变化记录'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=30, help='保留最近多少天的记录')
+
+    def handle(self, *args, **options):
+        deleted = alerts.prune(options['days'])
+        self.stdout.write(self.style.SUCCESS(f'已删除 {deleted} 条低库存变化记录'))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from apps.users import search as employee_search
+from apps.warehouse import search
+
+
+class Command(BaseCommand):
+    help = '清空并重建物品、入库、出库记录与员工的搜索索引'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        search.rebuild(batch_size=options['batch_size'], stdout=self.stdout)
+        employee_search.rebuild(batch_size=options['batch_size'], stdout=self.stdout)
+        if search.backend() != 'fts5':
+            self.stdout.write('当前数据库未使用 FTS5 索引，无需重建')
+        else:
+            self.stdout.write(self.style.SUCCESS('搜索索引重建完成'))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.warehouse import summary
+
+
+class Command(BaseCommand):
+    help = '按物品表全量重算库存汇总（StockSummary）'
+
+    def handle(self, *args, **options):
+        summary.rebuild()
+        self.stdout.write(self.style.SUCCESS('库存汇总重算完成'))
@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.warehouse.jobs import claim_next, default_worker_id, run_job
+
+
+class Command(BaseCommand):
+    help = '轮询并执行后台导入任务'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='处理完当前队列后退出')
+        parser.add_argument('--interval', type=float, default=2.0, help='队列为空时的轮询间隔（秒）')
+        parser.add_argument('--stale', type=int, default=300, help='心跳超过该秒数的执行中任务视为中断并重新领取')
+        parser.add_argument('--worker-id', default=None, help='执行进程标识，默认 主机名:进程号')
+
+    def handle(self, *args, **options):
+        worker = options['worker_id'] or default_worker_id()
+        self.stdout.write(f'导入任务执行进程 {worker} 已启动')
+        while True:
+            close_old_connections()
+            job = claim_next(worker, stale_seconds=options['stale'])
+            if job is None:
+                if options['once']:
+                    return
+                time.sleep(options['interval'])
+                continue
+            self.stdout.write(f'执行任务 #{job.pk} {job.file_name}（从第 {job.processed_rows + 1} 行开始）')
+            run_job(job, worker)
+            self.stdout.write(f'任务 #{job.pk} {job.get_status_display()}：{job.message}')
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:01
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('warehouse', '0003_alter_item_category_alter_item_unit'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file', models.FileField(upload_to='imports/%Y%m%d/', verbose_name='上传文件')),
+                ('file_name', models.CharField(max_length=200, verbose_name='原始文件名')),
+                ('status', models.CharField(choices=[('pending', '等待中'), ('running', '执行中'), ('success', '已完成'), ('failed', '失败')], default='pending', max_length=20, verbose_name='状态')),
+                ('total_rows', models.IntegerField(blank=True, null=True, verbose_name='总行数')),
+                ('processed_rows', models.IntegerField(default=0, verbose_name='已处理行数')),
+                ('created_count', models.IntegerField(default=0, verbose_name='新增数')),
+                ('updated_count', models.IntegerField(default=0, verbose_name='更新数')),
+                ('error_count', models.IntegerField(default=0, verbose_name='错误数')),
+                ('errors', models.JSONField(default=list, verbose_name='错误信息')),
+                ('message', models.CharField(blank=True, max_length=200, verbose_name='说明')),
+                ('worker', models.CharField(blank=True, max_length=100, verbose_name='执行进程')),
+                ('heartbeat_at', models.DateTimeField(blank=True, null=True, verbose_name='心跳时间')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='开始时间')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='结束时间')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='创建时间')),
+                ('operator', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL, verbose_name='操作员')),
+            ],
+            options={
+                'verbose_name': '导入任务',
+                'verbose_name_plural': '导入任务列表',
+                'db_table': 'warehouse_import_job',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='import_job_status_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('warehouse', '0004_import_job'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='inboundrecord',
+            index=models.Index(fields=['-inbound_date', '-id'], name='wh_inbound_date_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='outboundrecord',
+            index=models.Index(fields=['-outbound_date', '-id'], name='wh_outbound_date_id_idx'),
+        ),
+    ]
@@ -0,0 +1,87 @@
+# 搜索索引：SQLite 使用 FTS5 虚拟表，PostgreSQL 使用 pg_trgm 三元组索引
+
+import re
+
+from django.db import migrations
+
+FTS_TABLES = ('warehouse_item_fts', 'warehouse_inbound_fts', 'warehouse_outbound_fts')
+
+TRIGRAM_INDEXES = (
+    ('warehouse_item_code_trgm', 'warehouse_item', 'item_code'),
+    ('warehouse_item_name_trgm', 'warehouse_item', 'item_name'),
+    ('warehouse_inbound_supplier_trgm', 'warehouse_inbound', 'supplier'),
+    ('warehouse_outbound_receiver_trgm', 'warehouse_outbound', 'receiver'),
+)
+
+
+# 分词规则的固定副本（与 apps.common.search 当时的实现一致）：迁移不依赖会变化的业务代码
+MAX_SUFFIX_RUN = 32
+_CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uac00-\ud7af"
+_TOKEN_RE = re.compile(f"([{_CJK}]+)|([^\\W_{_CJK}]+)")
+
+
+def segment(*texts):
+    parts = []
+    for text in texts:
+        for cjk, word in _TOKEN_RE.findall((text or "").lower()):
+            if cjk:
+                parts.append(" ".join(cjk))
+            elif len(word) <= MAX_SUFFIX_RUN:
+                parts.extend(word[i:] for i in range(len(word)))
+            else:
+                parts.append(word)
+    return " ".join(parts)
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        for name, table, column in TRIGRAM_INDEXES:
+            schema_editor.execute(
+                f'CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin (UPPER({column}) gin_trgm_ops)'
+            )
+        return
+    if connection.vendor != 'sqlite':
+        return
+
+    with connection.cursor() as cursor:
+        try:
+            for table in FTS_TABLES:
+                cursor.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5(doc, tokenize='unicode61')")
+        except Exception:
+            # 未编译 FTS5 的 SQLite：不建索引，搜索回退为 icontains
+            return
+
+        Item = apps.get_model('warehouse', 'Item')
+        InboundRecord = apps.get_model('warehouse', 'InboundRecord')
+        OutboundRecord = apps.get_model('warehouse', 'OutboundRecord')
+        plan = (
+            ('warehouse_item_fts', Item.objects.values_list('id', 'item_code', 'item_name')),
+            ('warehouse_inbound_fts', InboundRecord.objects.values_list('id', 'supplier', 'operator__username')),
+            ('warehouse_outbound_fts', OutboundRecord.objects.values_list('id', 'receiver')),
+        )
+        for table, rows in plan:
+            docs = [(pk, segment(*texts)) for pk, *texts in rows]
+            cursor.executemany(f'INSERT INTO {table}(rowid, doc) VALUES (%s, %s)', docs)
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        for name, _, _ in TRIGRAM_INDEXES:
+            schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+    elif connection.vendor == 'sqlite':
+        for table in FTS_TABLES:
+            schema_editor.execute(f'DROP TABLE IF EXISTS {table}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('warehouse', '0005_record_cursor_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
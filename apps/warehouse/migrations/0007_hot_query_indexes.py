@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:08
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('warehouse', '0006_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='inboundrecord',
+            index=models.Index(fields=['-inbound_date', '-created_at'], name='wh_inbound_date_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['-created_at'], name='wh_item_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['item_name'], name='wh_item_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(condition=models.Q(('current_stock__lte', models.F('min_stock'))), fields=['-created_at'], name='wh_item_low_stock_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='outboundrecord',
+            index=models.Index(fields=['-outbound_date', '-created_at'], name='wh_outbound_date_created_idx'),
+        ),
+    ]
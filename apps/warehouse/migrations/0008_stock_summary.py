@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:09
+
+from django.db import migrations, models
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Coalesce
+
+
+def build_summary(apps, schema_editor):
+    Item = apps.get_model('warehouse', 'Item')
+    StockSummary = apps.get_model('warehouse', 'StockSummary')
+    aggregates = {
+        'item_count': Count('id'),
+        'total_stock': Coalesce(Sum('current_stock'), 0),
+        'low_stock_count': Count('id', filter=Q(current_stock__lte=F('min_stock'))),
+    }
+    rows = [StockSummary(dimension='total', key='', **Item.objects.aggregate(**aggregates))]
+    for dimension in ('category', 'location'):
+        for row in Item.objects.order_by().values(dimension).annotate(**aggregates):
+            rows.append(StockSummary(dimension=dimension, key=row.pop(dimension), **row))
+    StockSummary.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('warehouse', '0007_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(choices=[('total', '合计'), ('category', '分类'), ('location', '存放位置')], max_length=20, verbose_name='维度')),
+                ('key', models.CharField(blank=True, max_length=100, verbose_name='维度值')),
+                ('item_count', models.IntegerField(default=0, verbose_name='物品数')),
+                ('total_stock', models.BigIntegerField(default=0, verbose_name='库存总量')),
+                ('low_stock_count', models.IntegerField(default=0, verbose_name='低库存物品数')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='更新时间')),
+            ],
+            options={
+                'verbose_name': '库存汇总',
+                'verbose_name_plural': '库存汇总列表',
+                'db_table': 'warehouse_stock_summary',
+                'constraints': [models.UniqueConstraint(fields=('dimension', 'key'), name='wh_stock_summary_dim_key_uniq')],
+            },
+        ),
+        migrations.RunPython(build_summary, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import F
+
+
+def fill_low_stock_flag(apps, schema_editor):
+    Item = apps.get_model('warehouse', 'Item')
+    Item.objects.filter(current_stock__lte=F('min_stock')).update(is_low_stock=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('warehouse', '0008_stock_summary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LowStockEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('is_low', models.BooleanField(verbose_name='进入低库存')),
+                ('current_stock', models.IntegerField(verbose_name='当前库存')),
+                ('min_stock', models.IntegerField(verbose_name='最低库存预警')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='发生时间')),
+            ],
+            options={
+                'verbose_name': '低库存变化',
+                'verbose_name_plural': '低库存变化列表',
+                'db_table': 'warehouse_low_stock_event',
+                'ordering': ['id'],
+            },
+        ),
+        migrations.RemoveIndex(
+            model_name='item',
+            name='wh_item_low_stock_idx',
+        ),
+        migrations.AddField(
+            model_name='item',
+            name='is_low_stock',
+            field=models.BooleanField(default=False, editable=False, verbose_name='低库存'),
+        ),
+        migrations.RunPython(fill_low_stock_flag, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(condition=models.Q(('is_low_stock', True)), fields=['-created_at'], name='wh_item_is_low_idx'),
+        ),
+        migrations.AddField(
+            model_name='lowstockevent',
+            name='item',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='low_stock_events', to='warehouse.item', verbose_name='物品'),
+        ),
+    ]
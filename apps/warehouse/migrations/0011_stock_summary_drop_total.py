@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:06
+
+from django.db import migrations, models
+
+
+def drop_total_rows(apps, schema_editor):
+    # 合计改为各分类行之和，旧的合计行不再维护
+    StockSummary = apps.get_model('warehouse', 'StockSummary')
+    StockSummary.objects.filter(dimension='total').delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('warehouse', '0010_search_index_long_runs'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='stocksummary',
+            name='dimension',
+            field=models.CharField(choices=[('category', '分类'), ('location', '存放位置')], max_length=20, verbose_name='维度'),
+        ),
+        migrations.RunPython(drop_total_rows, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('warehouse', '0011_stock_summary_drop_total'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboundrecord',
+            name='voided',
+            field=models.BooleanField(default=False, verbose_name='已作废'),
+        ),
+    ]
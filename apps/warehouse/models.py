@@ -1,4 +1,7 @@
+from functools import partial
+
 from django.db import models
+from django.db.models import Q
 from django.contrib.auth.models import User
 
 
@@ -16,6 +19,8 @@ class Item(models.Model):
     initial_stock = models.IntegerField(default=0, verbose_name='初始库存')
     current_stock = models.IntegerField(default=0, verbose_name='当前库存')
     min_stock = models.IntegerField(default=10, verbose_name='最低库存预警')
+    # current_stock <= min_stock，由 save、库存过账与批量导入同步维护
+    is_low_stock = models.BooleanField(default=False, editable=False, verbose_name='低库存')
     location = models.CharField(max_length=100, blank=True, verbose_name='存放位置')
     remark = models.TextField(blank=True, verbose_name='备注')
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='创建时间')
@@ -26,10 +31,30 @@ class Item(models.Model):
         verbose_name = '物品'
         verbose_name_plural = '物品列表'
         ordering = ['-created_at']
+        indexes = [
+            # 默认排序
+            models.Index(fields=['-created_at'], name='wh_item_created_idx'),
+            # 导入时按名称查重
+            models.Index(fields=['item_name'], name='wh_item_name_idx'),
+            # 低库存预警：只索引 is_low_stock 为真的行，按默认排序直接取出（部分索引，不支持的后端忽略条件）
+            models.Index(fields=['-created_at'], condition=Q(is_low_stock=True), name='wh_item_is_low_idx'),
+        ]
     
     def __str__(self):
         return f"{self.item_code} - {self.item_name}"
 
+    def sync_low_stock(self) -> bool:
+        """按当前库存与预警值刷新低库存标志"""
+        self.is_low_stock = self.current_stock <= self.min_stock
+        return self.is_low_stock
+
+    def save(self, *args, **kwargs):
+        self.sync_low_stock()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'current_stock', 'min_stock'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'is_low_stock'}
+        super().save(*args, **kwargs)
+
 
 class InboundRecord(models.Model):
     """入库记录模型"""
@@ -46,15 +71,21 @@ class InboundRecord(models.Model):
         verbose_name = '入库记录'
         verbose_name_plural = '入库记录列表'
         ordering = ['-inbound_date', '-created_at']
+        indexes = [
+            # 游标分页按 (入库日期, id) 降序取数
+            models.Index(fields=['-inbound_date', '-id'], name='wh_inbound_date_id_idx'),
+            # 默认排序
+            models.Index(fields=['-inbound_date', '-created_at'], name='wh_inbound_date_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.item.item_name} - 入库{self.quantity}{self.item.unit}"
     
     def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
-        # 更新库存
-        self.item.current_stock += self.quantity
-        self.item.save()
+        from .stock import save_record
+
+        # 记录插入与库存增量更新处于同一事务
+        save_record(self, partial(super().save, *args, **kwargs), 1)
 
 
 class OutboundRecord(models.Model):
@@ -65,6 +96,8 @@ class OutboundRecord(models.Model):
     outbound_date = models.DateField(verbose_name='出库日期')
     reason = models.TextField(verbose_name='出库原因')
     operator = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, verbose_name='操作员')
+    # 出库审批被驳回或撤回时作废并退回库存；作废的记录不再参与库存过账
+    voided = models.BooleanField(default=False, verbose_name='已作废')
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='创建时间')
     
     class Meta:
@@ -72,12 +105,102 @@ class OutboundRecord(models.Model):
         verbose_name = '出库记录'
         verbose_name_plural = '出库记录列表'
         ordering = ['-outbound_date', '-created_at']
+        indexes = [
+            # 游标分页按 (出库日期, id) 降序取数
+            models.Index(fields=['-outbound_date', '-id'], name='wh_outbound_date_id_idx'),
+            # 默认排序
+            models.Index(fields=['-outbound_date', '-created_at'], name='wh_outbound_date_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.item.item_name} - 出库{self.quantity}{self.item.unit}"
     
     def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
-        # 更新库存
-        self.item.current_stock -= self.quantity
-        self.item.save()
+        from .stock import allow_negative_stock, save_record
+
+        # 记录插入与库存扣减处于同一事务，可选禁止负库存
+        save_record(self, partial(super().save, *args, **kwargs), -1, guard=not allow_negative_stock())
+
+
+class StockSummary(models.Model):
+    """库存汇总：由库存过账与物品增删改增量维护，统计接口直接读取"""
+    # 合计由各分类行相加得到，不单独保存
+    DIMENSION_CHOICES = [
+        ('category', '分类'),
+        ('location', '存放位置'),
+    ]
+
+    dimension = models.CharField(max_length=20, choices=DIMENSION_CHOICES, verbose_name='维度')
+    key = models.CharField(max_length=100, blank=True, verbose_name='维度值')
+    item_count = models.IntegerField(default=0, verbose_name='物品数')
+    total_stock = models.BigIntegerField(default=0, verbose_name='库存总量')
+    low_stock_count = models.IntegerField(default=0, verbose_name='低库存物品数')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='更新时间')
+
+    class Meta:
+        db_table = 'warehouse_stock_summary'
+        verbose_name = '库存汇总'
+        verbose_name_plural = '库存汇总列表'
+        constraints = [
+            models.UniqueConstraint(fields=['dimension', 'key'], name='wh_stock_summary_dim_key_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_dimension_display()} {self.key}"
+
+
+class LowStockEvent(models.Model):
+    """低库存变化记录：物品进入或离开低库存状态时写入一条，按 id 递增作为推送游标"""
+    item = models.ForeignKey(Item, on_delete=models.CASCADE, related_name='low_stock_events', verbose_name='物品')
+    is_low = models.BooleanField(verbose_name='进入低库存')
+    current_stock = models.IntegerField(verbose_name='当前库存')
+    min_stock = models.IntegerField(verbose_name='最低库存预警')
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='发生时间')
+
+    class Meta:
+        db_table = 'warehouse_low_stock_event'
+        verbose_name = '低库存变化'
+        verbose_name_plural = '低库存变化列表'
+        ordering = ['id']
+
+    def __str__(self):
+        return f"{self.item_id} {'进入' if self.is_low else '解除'}低库存"
+
+
+class ImportJob(models.Model):
+    """后台导入任务"""
+    STATUS_CHOICES = [
+        ('pending', '等待中'),
+        ('running', '执行中'),
+        ('success', '已完成'),
+        ('failed', '失败'),
+    ]
+
+    file = models.FileField(upload_to='imports/%Y%m%d/', verbose_name='上传文件')
+    file_name = models.CharField(max_length=200, verbose_name='原始文件名')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', verbose_name='状态')
+    total_rows = models.IntegerField(null=True, blank=True, verbose_name='总行数')
+    processed_rows = models.IntegerField(default=0, verbose_name='已处理行数')
+    created_count = models.IntegerField(default=0, verbose_name='新增数')
+    updated_count = models.IntegerField(default=0, verbose_name='更新数')
+    error_count = models.IntegerField(default=0, verbose_name='错误数')
+    errors = models.JSONField(default=list, verbose_name='错误信息')
+    message = models.CharField(max_length=200, blank=True, verbose_name='说明')
+    operator = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, verbose_name='操作员')
+    worker = models.CharField(max_length=100, blank=True, verbose_name='执行进程')
+    heartbeat_at = models.DateTimeField(null=True, blank=True, verbose_name='心跳时间')
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name='开始时间')
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name='结束时间')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='创建时间')
+
+    class Meta:
+        db_table = 'warehouse_import_job'
+        verbose_name = '导入任务'
+        verbose_name_plural = '导入任务列表'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='import_job_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.file_name} - {self.get_status_display()}"
@@ -0,0 +1,107 @@
+"""
+热点查询执行计划检查
+
+HOT_QUERIES 列出 apps/warehouse/views 中各接口实际执行的查询；check_plans 对每条查询
+执行 EXPLAIN，出现全表扫描或为 ORDER BY 临时排序时判定为退化。
+由 check_query_plans 管理命令调用，可接入 CI。
+"""
+import re
+from datetime import date
+
+from django.db import connection
+
+from .models import InboundRecord, Item, LowStockEvent, OutboundRecord
+from .views.base import _keyset_filter
+
+# SQLite：SCAN 表名后未跟 USING INDEX 即为全表扫描
+_SQLITE_SCAN = re.compile(r"\bSCAN (?:TABLE )?(\w+)(?! USING (?:COVERING )?INDEX)(?:\s|$)")
+_SQLITE_SORT = "USE TEMP B-TREE FOR ORDER BY"
+_PG_SCAN = re.compile(r"Seq Scan on (\w+)")
+
+
+def _hot_queries():
+    """(名称, 查询集, 允许按主键顺序扫描的表)"""
+    from . import search
+    from .views.inbound import INBOUND_ROW
+    from .views.item import ITEM_ROW
+    from .views.outbound import OUTBOUND_ROW
+
+    today = date.today()
+    queries = [
+        ("stock_list 页码分页", ITEM_ROW.values(Item.objects.order_by("-id"))[:10], {"warehouse_item"}),
+        ("stock_list 游标分页", ITEM_ROW.values(Item.objects.filter(id__lt=10 ** 9).order_by("-id"))[:10], set()),
+        ("ItemViewSet 默认排序", Item.objects.all()[:10], set()),
+        ("low_stock 低库存", Item.objects.filter(is_low_stock=True), set()),
+        ("stock_import 编号查重", Item.objects.filter(item_code__in=["A", "B"]).order_by(), set()),
+        ("stock_import 名称查重", Item.objects.filter(item_name__in=["甲", "乙"]).order_by(), set()),
+        (
+            "inbound_list 页码分页",
+            INBOUND_ROW.values(InboundRecord.objects.order_by("-id"))[:10],
+            {"warehouse_inbound"},
+        ),
+        (
+            "inbound_list 游标分页",
+            INBOUND_ROW.values(
+                InboundRecord.objects.filter(_keyset_filter(("inbound_date", "id"), [today, 10 ** 9]))
+                .order_by("-inbound_date", "-id")
+            )[:10],
+            set(),
+        ),
+        ("InboundRecordViewSet 默认排序", InboundRecord.objects.all()[:10], set()),
+        (
+            "outbound_list 页码分页",
+            OUTBOUND_ROW.values(OutboundRecord.objects.order_by("-id"))[:10],
+            {"warehouse_outbound"},
+        ),
+        (
+            "outbound_list 游标分页",
+            OUTBOUND_ROW.values(
+                OutboundRecord.objects.filter(_keyset_filter(("outbound_date", "id"), [today, 10 ** 9]))
+                .order_by("-outbound_date", "-id")
+            )[:10],
+            set(),
+        ),
+        ("OutboundRecordViewSet 默认排序", OutboundRecord.objects.all()[:10], set()),
+        ("low-stock 变化推送", LowStockEvent.objects.filter(id__gt=0).select_related("item").order_by("id")[:200], set()),
+    ]
+    if search.backend() == "fts5":
+        queries.append(("stock_list 搜索", Item.objects.filter(search.item_q("笔记本")).order_by("-id")[:10], set()))
+    return queries
+
+
+def _explain(queryset) -> str:
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            # 关闭顺序扫描后仍出现 Seq Scan，说明没有可用的索引路径
+            cursor.execute("SET LOCAL enable_seqscan = off")
+    return queryset.explain()
+
+
+def _problems(plan: str, allow_scan) -> list:
+    problems = []
+    if connection.vendor == "sqlite":
+        for line in plan.splitlines():
+            if "VIRTUAL TABLE" in line:
+                continue
+            match = _SQLITE_SCAN.search(line)
+            if match and match.group(1) not in allow_scan:
+                problems.append(f"全表扫描 {match.group(1)}")
+            if _SQLITE_SORT in line:
+                problems.append("ORDER BY 使用临时排序")
+    elif connection.vendor == "postgresql":
+        for table in _PG_SCAN.findall(plan):
+            if table not in allow_scan:
+                problems.append(f"全表扫描 {table}")
+    return problems
+
+
+def check_plans():
+    """返回 [(名称, 执行计划, 问题列表)]"""
+    from django.db import transaction
+
+    results = []
+    for name, queryset, allow_scan in _hot_queries():
+        with transaction.atomic():
+            plan = _explain(queryset)
+        results.append((name, plan, _problems(plan, allow_scan)))
+    return results
@@ -0,0 +1,177 @@
+"""
+仓库搜索索引
+
+SQLite 下为物品、入库记录、出库记录各维护一张 FTS5 虚拟表（rowid 即业务表主键），
+PostgreSQL 下改用 pg_trgm 三元组 GIN 索引加速原有的 icontains 查询。
+
+分词规则见 apps.common.search。FTS 只给出候选行，再以原始关键字的 icontains 过滤，
+结果与 icontains 一致。入库/出库记录的物品名称不重复写入记录索引，
+查询时通过物品索引按 item_id 关联，物品改名无需重建记录索引。
+操作员改名不会自动刷新记录索引，可执行 rebuild_search_index 重建。
+"""
+from django.db import connection, transaction
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from apps.common.search import match_expression, segment
+
+ITEM_TABLE = "warehouse_item_fts"
+INBOUND_TABLE = "warehouse_inbound_fts"
+OUTBOUND_TABLE = "warehouse_outbound_fts"
+TABLES = (ITEM_TABLE, INBOUND_TABLE, OUTBOUND_TABLE)
+
+_available = None
+
+
+def backend():
+    """当前可用的搜索后端：'fts5'、'trigram' 或 None（回退到 icontains）"""
+    global _available
+    if _available is None:
+        if connection.vendor == "postgresql":
+            _available = "trigram"
+        elif connection.vendor == "sqlite":
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT count(*) FROM sqlite_master WHERE type = 'table' AND name = %s", [ITEM_TABLE]
+                )
+                _available = "fts5" if cursor.fetchone()[0] else ""
+        else:
+            _available = ""
+    return _available or None
+
+
+def _match(table: str, expression: str) -> RawSQL:
+    return RawSQL(f"SELECT rowid FROM {table} WHERE {table} MATCH %s", [expression])
+
+
+def item_q(query: str) -> Q:
+    condition = Q(item_code__icontains=query) | Q(item_name__icontains=query)
+    expression = match_expression(query) if backend() == "fts5" else None
+    if expression is None:
+        return condition
+    return Q(id__in=_match(ITEM_TABLE, expression)) & condition
+
+
+def inbound_q(query: str) -> Q:
+    condition = (
+        Q(item__item_name__icontains=query)
+        | Q(supplier__icontains=query)
+        | Q(operator__username__icontains=query)
+    )
+    expression = match_expression(query) if backend() == "fts5" else None
+    if expression is None:
+        return condition
+    candidates = Q(item_id__in=_match(ITEM_TABLE, expression)) | Q(id__in=_match(INBOUND_TABLE, expression))
+    return candidates & condition
+
+
+def outbound_q(query: str) -> Q:
+    condition = Q(item__item_name__icontains=query) | Q(receiver__icontains=query)
+    expression = match_expression(query) if backend() == "fts5" else None
+    if expression is None:
+        return condition
+    candidates = Q(item_id__in=_match(ITEM_TABLE, expression)) | Q(id__in=_match(OUTBOUND_TABLE, expression))
+    return candidates & condition
+
+
+# ====== 索引维护 ======
+
+
+def _write(table: str, docs, replace: bool = True) -> None:
+    docs = list(docs)
+    if docs and backend() == "fts5":
+        verb = "INSERT OR REPLACE" if replace else "INSERT"
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.executemany(f"{verb} INTO {table}(rowid, doc) VALUES (%s, %s)", docs)
+
+
+def _delete(table: str, pk) -> None:
+    if backend() == "fts5":
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {table} WHERE rowid = %s", [pk])
+
+
+def item_docs(rows):
+    """rows: (id, item_code, item_name)"""
+    return ((pk, segment(code, name)) for pk, code, name in rows)
+
+
+def inbound_docs(rows):
+    """rows: (id, supplier, operator__username)"""
+    return ((pk, segment(supplier, operator)) for pk, supplier, operator in rows)
+
+
+def outbound_docs(rows):
+    """rows: (id, receiver)"""
+    return ((pk, segment(receiver)) for pk, receiver in rows)
+
+
+def index_items(queryset) -> None:
+    _write(ITEM_TABLE, item_docs(queryset.values_list("id", "item_code", "item_name")))
+
+
+def index_inbound(queryset) -> None:
+    _write(INBOUND_TABLE, inbound_docs(queryset.values_list("id", "supplier", "operator__username")))
+
+
+def index_outbound(queryset) -> None:
+    _write(OUTBOUND_TABLE, outbound_docs(queryset.values_list("id", "receiver")))
+
+
+def on_item_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    _write(ITEM_TABLE, item_docs([(instance.pk, instance.item_code, instance.item_name)]))
+
+
+def on_inbound_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    index_inbound(sender.objects.filter(pk=instance.pk))
+
+
+def on_outbound_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    _write(OUTBOUND_TABLE, outbound_docs([(instance.pk, instance.receiver)]))
+
+
+def on_deleted(sender, instance, **kwargs):
+    table = {
+        "warehouse_item": ITEM_TABLE,
+        "warehouse_inbound": INBOUND_TABLE,
+        "warehouse_outbound": OUTBOUND_TABLE,
+    }[sender._meta.db_table]
+    _delete(table, instance.pk)
+
+
+def rebuild(batch_size: int = 5000, stdout=None) -> None:
+    """清空并重建全部搜索索引"""
+    from .models import InboundRecord, Item, OutboundRecord
+
+    global _available
+    _available = None
+    if backend() != "fts5":
+        return
+    plan = (
+        (ITEM_TABLE, Item, ("id", "item_code", "item_name"), item_docs),
+        (INBOUND_TABLE, InboundRecord, ("id", "supplier", "operator__username"), inbound_docs),
+        (OUTBOUND_TABLE, OutboundRecord, ("id", "receiver"), outbound_docs),
+    )
+    for table, model, fields, docs in plan:
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {table}")
+        batch = []
+        total = 0
+        for row in model.objects.order_by().values_list(*fields).iterator(chunk_size=batch_size):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                _write(table, docs(batch), replace=False)
+                total += len(batch)
+                batch = []
+        _write(table, docs(batch), replace=False)
+        total += len(batch)
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {table}({table}) VALUES ('optimize')")
+        if stdout:
+            stdout.write(f"{table}: {total}")
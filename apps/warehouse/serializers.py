@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import Item, InboundRecord, OutboundRecord
+from .stock import InsufficientStock
 
 
 class ItemSerializer(serializers.ModelSerializer):
@@ -30,8 +31,17 @@ class OutboundRecordSerializer(serializers.ModelSerializer):
     class Meta:
         model = OutboundRecord
         fields = '__all__'
-        read_only_fields = ['operator', 'created_at']
+        read_only_fields = ['operator', 'voided', 'created_at']
     
     def create(self, validated_data):
         validated_data['operator'] = self.context['request'].user
-        return super().create(validated_data)
+        try:
+            return super().create(validated_data)
+        except InsufficientStock:
+            raise serializers.ValidationError({'quantity': '库存不足'})
+
+    def update(self, instance, validated_data):
+        try:
+            return super().update(instance, validated_data)
+        except InsufficientStock:
+            raise serializers.ValidationError({'quantity': '库存不足'})
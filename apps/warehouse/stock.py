@@ -0,0 +1,111 @@
+"""
+库存过账引擎
+
+所有库存变动都以单条条件 UPDATE（current_stock = current_stock + delta）写入，
+与出入库记录的插入处于同一事务中，避免“读取-修改-整行保存”造成的并发丢失更新；
+同一事务内读取过账后的库存，增量调整库存汇总；低库存标志在同一条 UPDATE 中重算，
+翻转时记录低库存变化。
+
+出库记录创建时即扣减库存；其审批被驳回或撤回（含超时驳回）时，on_flow_finished
+在流程状态写入的同一事务内作废该记录并退回库存，作废的记录此后不再过账。
+"""
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, F, Value, When
+from django.utils import timezone
+
+from apps.common.pagination import bump_table_version
+
+from . import alerts, summary
+from .models import Item, OutboundRecord
+from .summary import Snapshot
+
+# 出库审批实例的业务类型（FlowInstance.target_type）
+OUTBOUND_TARGET_TYPE = "outbound"
+
+
+class InsufficientStock(Exception):
+    """出库数量超过当前库存"""
+
+    def __init__(self, item_id, quantity):
+        self.item_id = item_id
+        self.quantity = quantity
+        super().__init__(f"物品 {item_id} 库存不足，无法出库 {quantity}")
+
+
+def allow_negative_stock() -> bool:
+    return getattr(settings, "WAREHOUSE_ALLOW_NEGATIVE_STOCK", True)
+
+
+def post_stock(item_id, delta: int, guard: bool = False):
+    """
+    对物品库存施加增量 delta，仅写 current_stock、is_low_stock 与 updated_at 三列，并同步库存汇总。
+
+    guard=True 且 delta 为负时，附加 current_stock >= -delta 条件，
+    库存不足则不更新并抛出 InsufficientStock。返回过账后的物品快照。
+    """
+    if not delta:
+        return None
+    queryset = Item.objects.filter(pk=item_id)
+    if guard and delta < 0:
+        queryset = queryset.filter(current_stock__gte=-delta)
+    updated = queryset.update(
+        current_stock=F("current_stock") + delta,
+        # 右侧引用的是更新前的值：新库存 <= 预警值 等价于 旧库存 <= 预警值 - delta
+        is_low_stock=Case(When(current_stock__lte=F("min_stock") - delta, then=Value(True)), default=Value(False)),
+        updated_at=timezone.now(),
+    )
+    if not updated:
+        if guard:
+            raise InsufficientStock(item_id, -delta)
+        return None
+    bump_table_version(Item)
+    row = Item.objects.filter(pk=item_id).values_list("category", "location", "current_stock", "min_stock")
+    snapshot = Snapshot(*row.get())
+    summary.apply_posting(snapshot, delta)
+    was_low = snapshot.current_stock - delta <= snapshot.min_stock
+    if snapshot.is_low != was_low:
+        alerts.record_crossings([(item_id, snapshot.is_low, snapshot.current_stock, snapshot.min_stock)])
+    return snapshot
+
+
+def save_record(record, save, sign: int, guard: bool = False) -> None:
+    """
+    在一个事务内保存出入库记录并过账。
+
+    save 为不带参数的原始保存函数；sign 为 1 表示入库、-1 表示出库。修改已有记录时先冲销旧记录的数量，
+    再按新数量过账，保证多次保存不会重复累计。已作废的记录只保存字段，不再过账。
+    """
+    voidable = hasattr(record, "voided")
+    with transaction.atomic():
+        previous = None
+        if not record._state.adding and record.pk:
+            previous = (
+                type(record).objects.filter(pk=record.pk)
+                .values_list("item_id", "quantity", "voided" if voidable else "pk")
+                .first()
+            )
+        if voidable and previous and previous[2]:
+            # 作废时已退回库存；保存内存中的旧实例也不能把记录改回未作废
+            record.voided = True
+        save()
+        if voidable and record.voided:
+            return
+        if previous:
+            post_stock(previous[0], -sign * previous[1])
+        post_stock(record.item_id, sign * record.quantity, guard=guard)
+
+
+def on_flow_finished(sender, instances, **kwargs):
+    """流程实例结束（apps.system.flow.flow_finished）：驳回或撤回的出库审批作废出库记录并退回库存"""
+    ids = [
+        instance.target_id for instance in instances
+        if instance.target_type == OUTBOUND_TARGET_TYPE and instance.status in ("rejected", "revoked")
+    ]
+    if not ids:
+        return
+    rows = OutboundRecord.objects.filter(pk__in=ids, voided=False).values_list("pk", "item_id", "quantity")
+    for pk, item_id, quantity in rows:
+        # 带原状态条件作废，重复送达的结束通知不会重复退回
+        if OutboundRecord.objects.filter(pk=pk, voided=False).update(voided=True):
+            post_stock(item_id, quantity)
@@ -0,0 +1,220 @@
+"""
+库存汇总维护
+
+StockSummary 按 分类 / 存放位置 两个维度保存物品数、库存总量与低库存物品数；
+每件物品恰好属于一个分类，合计由各分类行相加得到，不单独保存——否则每次过账都要更新
+同一行合计，所有并发过账在这一行上串行。
+库存过账只改动库存数量，用一条 UPDATE 同时调整两行；物品的新增、修改、删除通过模型信号
+按“移除旧快照、加入新快照”的方式调整；批量导入在写入后显式提交增量。
+汇总行缺失时以 bulk_create(ignore_conflicts=True) 补一行零值再更新，并发补行互不冲突。
+rebuild() 以聚合查询全量重算，用于初始化或修复偏差（rebuild_stock_summary 命令）。
+"""
+import logging
+from collections import defaultdict
+from typing import NamedTuple
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Coalesce
+
+from .models import Item, StockSummary
+
+logger = logging.getLogger(__name__)
+
+DIMENSIONS = ("category", "location")
+
+LOW_STOCK = Q(current_stock__lte=F("min_stock"))
+
+
+class Snapshot(NamedTuple):
+    """参与汇总的物品字段"""
+    category: str
+    location: str
+    current_stock: int
+    min_stock: int
+
+    @property
+    def is_low(self) -> bool:
+        return self.current_stock <= self.min_stock
+
+    @classmethod
+    def of(cls, item):
+        return cls(item.category, item.location, item.current_stock, item.min_stock)
+
+
+def _keys(snapshot: Snapshot):
+    return (("category", snapshot.category), ("location", snapshot.location))
+
+
+def _seed(keys) -> None:
+    """补齐缺失的汇总行（零值）；已存在的行不受影响，并发补行不会违反唯一约束"""
+    StockSummary.objects.bulk_create(
+        [StockSummary(dimension=dimension, key=key) for dimension, key in keys], ignore_conflicts=True,
+    )
+
+
+class SummaryDelta:
+    """累积多件物品的汇总增量，最后一次性写入"""
+
+    def __init__(self):
+        self.rows = defaultdict(lambda: [0, 0, 0])
+
+    def add(self, snapshot: Snapshot, sign: int = 1) -> None:
+        for key in _keys(snapshot):
+            row = self.rows[key]
+            row[0] += sign
+            row[1] += sign * snapshot.current_stock
+            row[2] += sign * int(snapshot.is_low)
+
+    def remove(self, snapshot: Snapshot) -> None:
+        self.add(snapshot, -1)
+
+    def apply(self) -> None:
+        changed = {key: row for key, row in self.rows.items() if any(row)}
+        if changed:
+            with transaction.atomic():
+                _seed(changed)
+                for (dimension, key), (items, stock, low) in changed.items():
+                    StockSummary.objects.filter(dimension=dimension, key=key).update(
+                        item_count=F("item_count") + items,
+                        total_stock=F("total_stock") + stock,
+                        low_stock_count=F("low_stock_count") + low,
+                    )
+        self.rows.clear()
+
+
+def apply_posting(snapshot: Snapshot, delta: int) -> None:
+    """
+    库存过账后的汇总调整；snapshot 为过账后的物品状态。
+    两个维度的增量相同，合并为一条 UPDATE。
+    """
+    was_low = snapshot.current_stock - delta <= snapshot.min_stock
+    low_delta = int(snapshot.is_low) - int(was_low)
+    keys = _keys(snapshot)
+    condition = Q()
+    for dimension, key in keys:
+        condition |= Q(dimension=dimension, key=key)
+    changes = {
+        "total_stock": F("total_stock") + delta,
+        "low_stock_count": F("low_stock_count") + low_delta,
+    }
+    if StockSummary.objects.filter(condition).update(**changes) < len(keys):
+        # 物品保存时已建好对应的汇总行，这里缺行说明汇总未初始化或被改动过：
+        # 补零值行后重试，不在过账事务中全量重算；数值偏差由 rebuild_stock_summary 修复
+        logger.warning("库存汇总行缺失 %s，请执行 rebuild_stock_summary 重算", keys)
+        _seed(keys)
+        StockSummary.objects.filter(condition).update(**changes)
+
+
+# ====== 模型信号 ======
+
+
+def _stored_snapshot(pk):
+    row = (
+        Item.objects.filter(pk=pk)
+        .values_list("category", "location", "current_stock", "min_stock")
+        .first()
+    )
+    return Snapshot(*row) if row else None
+
+
+def on_item_pre_save(sender, instance, raw=False, **kwargs):
+    instance._summary_before = None
+    if raw or instance._state.adding or not instance.pk:
+        return
+    instance._summary_before = _stored_snapshot(instance.pk)
+
+
+def on_item_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    changes = SummaryDelta()
+    before = getattr(instance, "_summary_before", None)
+    if before is not None:
+        changes.remove(before)
+    changes.add(Snapshot.of(instance))
+    changes.apply()
+
+
+def on_item_pre_delete(sender, instance, **kwargs):
+    # 内存中的实例可能已落后于库存过账，以数据库中的值为准
+    before = _stored_snapshot(instance.pk)
+    if before is not None:
+        changes = SummaryDelta()
+        changes.remove(before)
+        changes.apply()
+
+
+# ====== 读取与重算 ======
+
+
+def _aggregates():
+    return {
+        "item_count": Count("id"),
+        "total_stock": Coalesce(Sum("current_stock"), 0),
+        "low_stock_count": Count("id", filter=LOW_STOCK),
+    }
+
+
+def rebuild() -> None:
+    """按当前物品表全量重算汇总"""
+    rows = []
+    for dimension in DIMENSIONS:
+        for row in Item.objects.order_by().values(dimension).annotate(**_aggregates()):
+            rows.append(StockSummary(dimension=dimension, key=row.pop(dimension), **row))
+    with transaction.atomic():
+        StockSummary.objects.all().delete()
+        StockSummary.objects.bulk_create(rows)
+
+
+def _breakdown(rows, dimension):
+    return [
+        {
+            dimension: row["key"],
+            "total_items": row["item_count"],
+            "total_stock": row["total_stock"],
+            "low_stock_count": row["low_stock_count"],
+        }
+        for row in rows
+        if row["item_count"]
+    ]
+
+
+def _statistics(total, categories, locations):
+    return {
+        "total_items": total["item_count"],
+        "total_stock": total["total_stock"],
+        "low_stock_count": total["low_stock_count"],
+        "normal_stock_count": total["item_count"] - total["low_stock_count"],
+        "by_category": _breakdown(categories, "category"),
+        "by_location": _breakdown(locations, "location"),
+    }
+
+
+def statistics() -> dict:
+    """从汇总表读取统计，查询量与物品数无关；合计为各分类行之和"""
+    rows = list(
+        StockSummary.objects.filter(dimension__in=DIMENSIONS)
+        .order_by("dimension", "key")
+        .values("dimension", "key", "item_count", "total_stock", "low_stock_count")
+    )
+    total = {"item_count": 0, "total_stock": 0, "low_stock_count": 0}
+    for row in rows:
+        if row["dimension"] == "category":
+            for field in total:
+                total[field] += row[field]
+    return _statistics(
+        total,
+        [r for r in rows if r["dimension"] == "category"],
+        [r for r in rows if r["dimension"] == "location"],
+    )
+
+
+def exact_statistics() -> dict:
+    """直接在物品表上聚合统计"""
+    total = Item.objects.aggregate(**_aggregates())
+    breakdowns = []
+    for dimension in DIMENSIONS:
+        rows = Item.objects.order_by(dimension).values(dimension).annotate(**_aggregates())
+        breakdowns.append([{**row, "key": row[dimension]} for row in rows])
+    return _statistics(total, *breakdowns)
@@ -6,14 +6,19 @@ from .views import (
     ItemViewSet,
     OutboundRecordViewSet,
     inbound_add,
+    inbound_export,
     inbound_list,
     outbound_add,
+    outbound_export,
     outbound_list,
     stock_add,
     stock_detail,
     stock_export,
     stock_import,
+    stock_import_job,
     stock_list,
+    stock_low_events,
+    stock_low_stream,
 )
 
 router = DefaultRouter()
@@ -22,14 +27,20 @@ router.register('inbound', InboundRecordViewSet, basename='inbound')
 router.register('outbound', OutboundRecordViewSet, basename='outbound')
 
 urlpatterns = [
-    path('', include(router.urls)),
+    # 固定路径须排在路由器之前，否则带斜杠的 inbound/export/ 等会被当作详情路由（pk=export）
     re_path(r'^stock/list/?$', stock_list, name='stock-list'),
     re_path(r'^stock/add/?$', stock_add, name='stock-add'),
     re_path(r'^stock/import/?$', stock_import, name='stock-import'),
+    re_path(r'^stock/import/jobs/(?P<pk>\d+)/?$', stock_import_job, name='stock-import-job'),
     re_path(r'^stock/export/?$', stock_export, name='stock-export'),
+    re_path(r'^stock/low-stock/events/?$', stock_low_events, name='stock-low-events'),
+    re_path(r'^stock/low-stock/stream/?$', stock_low_stream, name='stock-low-stream'),
     re_path(r'^stock/(?P<pk>[^/]+)/?$', stock_detail, name='stock-detail'),
     re_path(r'^inbound/list/?$', inbound_list, name='inbound-list'),
     re_path(r'^inbound/add/?$', inbound_add, name='inbound-add'),
+    re_path(r'^inbound/export/?$', inbound_export, name='inbound-export'),
     re_path(r'^outbound/list/?$', outbound_list, name='outbound-list'),
     re_path(r'^outbound/add/?$', outbound_add, name='outbound-add'),
+    re_path(r'^outbound/export/?$', outbound_export, name='outbound-export'),
+    path('', include(router.urls)),
 ]
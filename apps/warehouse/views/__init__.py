@@ -1,14 +1,17 @@
 from .base import _Page, _error, _read_upload_rows, _success, _to_date, _to_int
-from .inbound import InboundRecordViewSet, inbound_add, inbound_list
+from .inbound import InboundRecordViewSet, inbound_add, inbound_export, inbound_list
 from .item import (
     ItemViewSet,
     stock_add,
     stock_detail,
     stock_export,
     stock_import,
+    stock_import_job,
     stock_list,
+    stock_low_events,
+    stock_low_stream,
 )
-from .outbound import OutboundRecordViewSet, outbound_add, outbound_list
+from .outbound import OutboundRecordViewSet, outbound_add, outbound_export, outbound_list
 
 __all__ = [
     "_Page",
@@ -19,14 +22,19 @@ __all__ = [
     "_to_int",
     "InboundRecordViewSet",
     "inbound_add",
+    "inbound_export",
     "inbound_list",
     "ItemViewSet",
     "stock_add",
     "stock_detail",
     "stock_export",
     "stock_import",
+    "stock_import_job",
     "stock_list",
+    "stock_low_events",
+    "stock_low_stream",
     "OutboundRecordViewSet",
     "outbound_add",
+    "outbound_export",
     "outbound_list",
 ]
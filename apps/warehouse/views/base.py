@@ -1,10 +1,20 @@
-import csv
-import io
+import base64
+import json
 from datetime import date
-from typing import Iterable, Tuple, Union
 
-import pandas as pd
-from rest_framework.pagination import PageNumberPagination
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+
+from rest_framework.exceptions import NotFound
+from rest_framework.renderers import BaseRenderer
+
+from apps.common.pagination import BasePage, count_objects
+# 上传解析与 CSV 导出已移至 apps.common.uploads，这里保留原名供各视图模块导入
+from apps.common.uploads import (  # noqa: F401
+    EXPORT_CHUNK_SIZE,
+    read_upload_rows as _read_upload_rows,
+    stream_csv as _stream_csv,
+)
 
 
 def _success(data=None, message: str = "success"):
@@ -31,52 +41,109 @@ def _to_date(value) -> date:
         return date.today()
 
 
-def _read_upload_rows(upload) -> Tuple[Union[Iterable[dict], None], Union[str, None]]:
-    name = (upload.name or "").lower()
-    df = None
-
-    if name.endswith(".csv"):
-        for enc in ["utf-8-sig", "gbk", None]:
-            upload.file.seek(0)
-            try:
-                df = pd.read_csv(upload.file, encoding=enc or "utf-8", engine="python")
-                break
-            except UnicodeDecodeError:
-                continue
-            except Exception:
-                continue
-        if df is None:
-            return None, "CSV 解析失败，请确认编码为 UTF-8/GBK"
-
-    elif name.endswith(".xlsx"):
-        upload.file.seek(0)
-        try:
-            df = pd.read_excel(upload.file, engine="openpyxl")
-        except ImportError:
-            return None, "缺少 openpyxl，请安装后再试"
-        except Exception:
-            return None, "Excel 解析失败，请确认文件未损坏"
-
-    elif name.endswith(".xls"):
-        upload.file.seek(0)
+def _date_range(queryset, field: str, params):
+    """按 start/end（YYYY-MM-DD，含端点）过滤日期字段，非法日期忽略"""
+    for key, lookup in (("start", "gte"), ("end", "lte")):
+        value = params.get(key) or params.get(f"{key}Date")
+        if not value:
+            continue
         try:
-            df = pd.read_excel(upload.file, engine="xlrd")
-        except ImportError:
-            return None, "缺少 xlrd==1.2.0，请安装后再试，或另存为 xlsx/csv"
-        except Exception:
-            return None, "Excel 解析失败，请确认文件未损坏"
+            queryset = queryset.filter(**{f"{field}__{lookup}": date.fromisoformat(str(value)[:10])})
+        except ValueError:
+            continue
+    return queryset
 
-    else:
-        return None, "仅支持 csv、xlsx、xls 文件"
 
-    if df is None:
-        return None, "文件读取失败"
+class _EventStreamRenderer(BaseRenderer):
+    """声明接口可产出 text/event-stream，使内容协商接受 SSE 客户端的 Accept 头"""
+    media_type = "text/event-stream"
+    format = "sse"
+    charset = "utf-8"
 
-    df = df.rename(columns=lambda c: str(c).strip())
-    df = df.fillna("")
-    return df.to_dict(orient="records"), None
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return json.dumps(data, ensure_ascii=False).encode()
 
 
-class _Page(PageNumberPagination):
-    page_size_query_param = "size"
-    page_query_param = "page"
+def _encode_cursor(values) -> str:
+    raw = json.dumps([v.isoformat() if isinstance(v, date) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(value):
+    if not value:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError):
+        return None
+    return values if isinstance(values, list) else None
+
+
+def _keyset_filter(keys, values) -> Q:
+    """
+    降序键集条件：(k1, k2) < (v1, v2)，展开为 k1 < v1 OR (k1 = v1 AND k2 < v2)，
+    并冗余附加 k1 <= v1，使数据库能直接在 (k1, k2) 索引上做范围扫描。
+    """
+    condition = Q()
+    equal = {}
+    for key, value in zip(keys, values):
+        condition |= Q(**equal, **{f"{key}__lt": value})
+        equal[key] = value
+    if len(keys) > 1:
+        condition &= Q(**{f"{keys[0]}__lte": values[0]})
+    return condition
+
+
+class _Page(BasePage):
+    """
+    默认按页码分页；请求带 cursor 参数时改用键集（游标）分页：
+    按 keys 降序取 size 条，返回 nextCursor，不做 OFFSET 扫描，
+    仅在首页（cursor 为空）统计总数。无法解析的游标与 DRF CursorPagination 一样返回 404。
+    """
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "游标无效"
+
+    def paginate(self, queryset, request, keys=("id",)):
+        self.request = request
+        self.queryset = queryset
+        self.keys = keys
+        self.cursor_mode = self.cursor_query_param in request.query_params
+        if not self.cursor_mode:
+            return self.paginate_queryset(queryset, request)
+
+        size = self.get_page_size(request)
+        raw = request.query_params.get(self.cursor_query_param)
+        cursor = _decode_cursor(raw)
+        if raw and (cursor is None or len(cursor) != len(keys)):
+            raise NotFound(self.invalid_cursor_message)
+        self.first_page = cursor is None
+        queryset = queryset.order_by(*[f"-{key}" for key in keys])
+        if cursor is not None:
+            try:
+                queryset = queryset.filter(_keyset_filter(keys, cursor))
+            except (TypeError, ValueError, DjangoValidationError):
+                # 键值类型与字段不符（如 id 位置是字符串）
+                raise NotFound(self.invalid_cursor_message)
+        rows = list(queryset[:size + 1])
+        self.next_cursor = None
+        if len(rows) > size:
+            rows = rows[:size]
+            self.next_cursor = _encode_cursor([getattr(rows[-1], key) for key in keys])
+        return rows
+
+    def get_payload(self, rows):
+        if not self.cursor_mode:
+            return super().get_payload(rows)
+        payload = {
+            "list": rows,
+            "total": None,
+            "page": 1 if self.first_page else None,
+            "size": self.get_page_size(self.request),
+            "nextCursor": self.next_cursor,
+        }
+        if self.first_page:
+            payload["total"], approximate = count_objects(self.queryset)
+            if approximate:
+                payload["approximate"] = True
+        return payload
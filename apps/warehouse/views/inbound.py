@@ -1,4 +1,3 @@
-from django.db.models import Q
 from django.shortcuts import get_object_or_404
 from rest_framework import filters, viewsets
 from django_filters.rest_framework import DjangoFilterBackend
@@ -6,9 +5,35 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 
+from apps.common.rows import FIELDS_QUERY_PARAM, RowSerializer, empty_if_none
+
 from ..models import InboundRecord, Item
+from ..search import inbound_q
 from ..serializers import InboundRecordSerializer
-from .base import _Page, _success, _to_date, _to_int
+from .base import (
+    EXPORT_CHUNK_SIZE,
+    _Page,
+    _date_range,
+    _stream_csv,
+    _success,
+    _to_date,
+    _to_int,
+)
+
+
+INBOUND_ROW = RowSerializer(
+    {
+        "id": "id",
+        "item_id": "itemId",
+        "item__item_name": "itemName",
+        "quantity": "quantity",
+        "inbound_date": "inboundDate",
+        "supplier": "supplier",
+        "operator__username": "operatorName",
+        "remark": "remark",
+    },
+    converters={"operator__username": empty_if_none},
+)
 
 
 class InboundRecordViewSet(viewsets.ModelViewSet):
@@ -24,34 +49,14 @@ class InboundRecordViewSet(viewsets.ModelViewSet):
 @permission_classes([AllowAny])
 def inbound_list(request):
     paginator = _Page()
-    queryset = InboundRecord.objects.select_related("item", "operator").all().order_by("-id")
+    queryset = InboundRecord.objects.all().order_by("-id")
     search = request.query_params.get("search") or request.query_params.get("q")
     if search:
-        queryset = queryset.filter(
-            Q(item__item_name__icontains=search)
-            | Q(supplier__icontains=search)
-            | Q(operator__username__icontains=search)
-        )
-    page = paginator.paginate_queryset(queryset, request)
-    rows = []
-    for rec in page:
-        rows.append({
-            "id": rec.id,
-            "itemId": rec.item_id,
-            "itemName": rec.item.item_name,
-            "quantity": rec.quantity,
-            "inboundDate": rec.inbound_date,
-            "supplier": rec.supplier,
-            "operatorName": rec.operator.username if rec.operator else "",
-            "remark": rec.remark,
-        })
-    payload = {
-        "list": rows,
-        "total": paginator.page.paginator.count if paginator.page else queryset.count(),
-        "page": paginator.page.number if paginator.page else 1,
-        "size": paginator.get_page_size(request),
-    }
-    return Response(_success(payload))
+        queryset = queryset.filter(inbound_q(search))
+    keys = ("inbound_date", "id")
+    row = INBOUND_ROW.project(request.query_params.get(FIELDS_QUERY_PARAM), keep=keys)
+    page = paginator.paginate(row.values(queryset), request, keys)
+    return Response(_success(paginator.get_payload(row.many(page))))
 
 
 @api_view(["POST"])
@@ -69,13 +74,39 @@ def inbound_add(request):
         operator=request.user if getattr(request, "user", None) and request.user.is_authenticated else None,
         remark=request.data.get("remark") or "",
     )
-    return Response(_success({
-        "id": record.id,
-        "itemId": item.id,
-        "itemName": item.item_name,
-        "quantity": record.quantity,
-        "inboundDate": record.inbound_date,
-        "supplier": record.supplier,
-        "operatorName": record.operator.username if record.operator else "",
-        "remark": record.remark,
-    }, "入库成功"))
+    return Response(_success(INBOUND_ROW.from_object(record), "入库成功"))
+
+
+_EXPORT_HEADER = [
+    "id",
+    "item_code",
+    "item_name",
+    "quantity",
+    "supplier",
+    "inbound_date",
+    "operator",
+    "remark",
+    "created_at",
+]
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def inbound_export(request):
+    queryset = _date_range(InboundRecord.objects.order_by("-id"), "inbound_date", request.query_params)
+    queryset = queryset.values_list(
+        "id",
+        "item__item_code",
+        "item__item_name",
+        "quantity",
+        "supplier",
+        "inbound_date",
+        "operator__username",
+        "remark",
+        "created_at",
+    )
+    rows = (
+        row[:-1] + (row[-1].isoformat(),)
+        for row in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+    return _stream_csv(_EXPORT_HEADER, rows, "inbound.csv")
@@ -1,19 +1,34 @@
-import csv
-import io
+import json
+import time
 
-from django.db import models, transaction
-from django.db.models import Q
-from django.http import HttpResponse
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from rest_framework import filters, viewsets
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.decorators import action, api_view, permission_classes, renderer_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 
-from ..models import Item
+from apps.common.rows import FIELDS_QUERY_PARAM, RowSerializer
+
+from .. import alerts, summary
+from ..importer import import_items
+from ..jobs import enqueue_import, job_to_front
+from ..models import ImportJob, Item
+from ..search import item_q
 from ..serializers import ItemSerializer
-from .base import _Page, _error, _read_upload_rows, _success, _to_date, _to_int
+from .base import (
+    EXPORT_CHUNK_SIZE,
+    _EventStreamRenderer,
+    _Page,
+    _error,
+    _read_upload_rows,
+    _stream_csv,
+    _success,
+    _to_date,
+    _to_int,
+)
 
 
 def _normalize_item_payload(data):
@@ -31,22 +46,26 @@ def _normalize_item_payload(data):
     }
 
 
+ITEM_ROW = RowSerializer({
+    "id": "id",
+    "item_code": "itemCode",
+    "item_name": "itemName",
+    "category": "category",
+    "specification": "specification",
+    "unit": "unit",
+    "initial_stock": "initialStock",
+    "current_stock": "currentStock",
+    "min_stock": "minStock",
+    "location": "location",
+    "remark": "remark",
+    "is_low_stock": "isLowStock",
+    "created_at": "createdAt",
+    "updated_at": "updatedAt",
+})
+
+
 def _item_to_front(obj: Item):
-    return {
-        "id": obj.id,
-        "itemCode": obj.item_code,
-        "itemName": obj.item_name,
-        "category": obj.category,
-        "specification": obj.specification,
-        "unit": obj.unit,
-        "initialStock": obj.initial_stock,
-        "currentStock": obj.current_stock,
-        "minStock": obj.min_stock,
-        "location": obj.location,
-        "remark": obj.remark,
-        "createdAt": obj.created_at,
-        "updatedAt": obj.updated_at,
-    }
+    return ITEM_ROW.from_object(obj)
 
 
 class ItemViewSet(viewsets.ModelViewSet):
@@ -59,21 +78,16 @@ class ItemViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=["get"])
     def low_stock(self, request):
-        items = self.queryset.filter(current_stock__lte=models.F("min_stock"))
+        items = self.queryset.filter(is_low_stock=True)
         serializer = self.get_serializer(items, many=True)
         return Response(serializer.data)
 
     @action(detail=False, methods=["get"])
     def statistics(self, request):
-        total_items = self.queryset.count()
-        total_stock = sum(item.current_stock for item in self.queryset)
-        low_stock_count = self.queryset.filter(current_stock__lte=models.F("min_stock")).count()
-        return Response({
-            "total_items": total_items,
-            "total_stock": total_stock,
-            "low_stock_count": low_stock_count,
-            "normal_stock_count": total_items - low_stock_count,
-        })
+        # 默认读取增量维护的汇总表；exact=1 时直接在物品表上聚合
+        if request.query_params.get("exact") in ("1", "true"):
+            return Response(summary.exact_statistics())
+        return Response(summary.statistics())
 
 
 @api_view(["GET"])
@@ -83,16 +97,10 @@ def stock_list(request):
     queryset = Item.objects.all().order_by("-id")
     search = request.query_params.get("search") or request.query_params.get("q")
     if search:
-        queryset = queryset.filter(Q(item_code__icontains=search) | Q(item_name__icontains=search))
-    page = paginator.paginate_queryset(queryset, request)
-    items = [_item_to_front(obj) for obj in page]
-    payload = {
-        "list": items,
-        "total": paginator.page.paginator.count if paginator.page else queryset.count(),
-        "page": paginator.page.number if paginator.page else 1,
-        "size": paginator.get_page_size(request),
-    }
-    return Response(_success(payload))
+        queryset = queryset.filter(item_q(search))
+    row = ITEM_ROW.project(request.query_params.get(FIELDS_QUERY_PARAM))
+    page = paginator.paginate(row.values(queryset), request, ("id",))
+    return Response(_success(paginator.get_payload(row.many(page))))
 
 
 @api_view(["GET", "PUT", "PATCH", "DELETE"])
@@ -134,83 +142,130 @@ def stock_import(request):
     if not upload:
         return Response(_error("缺少文件"), status=400)
 
+    run_async = request.data.get("async") or request.query_params.get("async")
+    if str(run_async).lower() in ("1", "true", "yes"):
+        if not (upload.name or "").lower().endswith((".csv", ".xlsx", ".xls")):
+            return Response(_error("仅支持 csv、xlsx、xls 文件"), status=400)
+        operator = request.user if request.user.is_authenticated else None
+        job = enqueue_import(upload, operator)
+        return Response(_success(job_to_front(job), "导入任务已提交"))
+
     rows, err = _read_upload_rows(upload)
     if err:
         return Response(_error(err), status=400)
 
-    created, updated, errors = 0, 0, []
-    with transaction.atomic():
-        for idx, row in enumerate(rows, start=1):
-            code = (row.get("item_code") or "").strip()
-            name = (row.get("item_name") or "").strip()
-            if not code or not name:
-                errors.append(f"第{idx}行缺少 item_code 或 item_name")
-                continue
+    result = import_items(rows)
+    return Response(_success(result, "导入完成"))
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def stock_import_job(request, pk: int):
+    job = get_object_or_404(ImportJob, pk=pk)
+    return Response(_success(job_to_front(job)))
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def stock_low_events(request):
+    """
+    低库存变化长轮询。不带 cursor 时立即返回当前游标；带 cursor 时等待其后的事件，
+    超时返回空列表。客户端以返回的 cursor 发起下一次请求。
+    """
+    cursor = request.query_params.get("cursor")
+    if cursor in (None, ""):
+        return Response(_success({"list": [], "cursor": alerts.latest_cursor()}))
+    cursor = _to_int(cursor, 0)
+    limit = alerts.long_poll_timeout()
+    timeout = min(max(_to_int(request.query_params.get("timeout"), limit), 0), limit)
+    events = alerts.wait_for_events(cursor, timeout)
+    return Response(_success({
+        "list": [alerts.event_to_front(event) for event in events],
+        "cursor": events[-1].id if events else cursor,
+    }))
+
 
-            # 名称重复校验：数据库已存在同名则拒绝导入该行
-            if Item.objects.filter(item_name=name).exists():
-                errors.append(f"第{idx}行物品名称已存在: {name}")
+_STREAM_KEEPALIVE = 15
+
+
+def _sse_message(event) -> str:
+    data = json.dumps(alerts.event_to_front(event), cls=DjangoJSONEncoder, ensure_ascii=False)
+    return f"id: {event.id}\nevent: low_stock\ndata: {data}\n\n"
+
+
+class _SlotStream:
+    """SSE 内容迭代器：响应关闭时（含客户端断开）结束生成器并归还连接名额"""
+
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self._closed = False
+
+    def __iter__(self):
+        return self._chunks
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self._chunks.close()
+            alerts.stream_slots.release()
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+@renderer_classes([_EventStreamRenderer])
+def stock_low_stream(request):
+    """
+    低库存变化 SSE 推送。断线重连时浏览器会带上 Last-Event-ID，从该事件之后继续；
+    连接保持 LOW_STOCK_STREAM_SECONDS 秒后由服务端关闭，客户端自动重连。
+    每个连接占用一个 worker，进程内连接数达到 LOW_STOCK_MAX_STREAMS 时返回 503，客户端应改用长轮询。
+    """
+    if not alerts.stream_slots.acquire():
+        return Response(_error("推送连接数已满，请改用长轮询 /stock/low-stock/events/", 503), status=503)
+    cursor = request.headers.get("Last-Event-ID") or request.query_params.get("cursor")
+    cursor = alerts.latest_cursor() if cursor in (None, "") else _to_int(cursor, 0)
+
+    def generate(cursor):
+        deadline = time.monotonic() + alerts.stream_seconds()
+        yield "retry: 3000\n\n"
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            events = alerts.wait_for_events(cursor, min(_STREAM_KEEPALIVE, remaining))
+            if not events:
+                yield ": keep-alive\n\n"
                 continue
+            yield "".join(_sse_message(event) for event in events)
+            cursor = events[-1].id
+
+    response = StreamingHttpResponse(_SlotStream(generate(cursor)), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
 
-            defaults = {
-                "item_name": name,
-                "category": (row.get("category") or "其他").strip(),
-                "specification": (row.get("specification") or "").strip(),
-                "unit": (row.get("unit") or "个").strip(),
-                "initial_stock": _to_int(row.get("initial_stock") or row.get("current_stock"), 0),
-                "current_stock": _to_int(row.get("current_stock"), 0),
-                "min_stock": _to_int(row.get("min_stock"), 10),
-                "location": (row.get("location") or "").strip(),
-                "remark": (row.get("remark") or "").strip(),
-            }
-
-            obj, created_flag = Item.objects.update_or_create(
-                item_code=code,
-                defaults=defaults,
-            )
-            if created_flag:
-                created += 1
-            else:
-                updated += 1
-
-    result = {"created": created, "updated": updated, "errors": errors}
-    return Response(_success(result, "导入完成"))
+
+_EXPORT_COLUMNS = [
+    "item_code",
+    "item_name",
+    "category",
+    "specification",
+    "unit",
+    "initial_stock",
+    "current_stock",
+    "min_stock",
+    "location",
+    "remark",
+    "created_at",
+    "updated_at",
+]
 
 
 @api_view(["GET"])
 @permission_classes([AllowAny])
 def stock_export(request):
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow([
-        "item_code",
-        "item_name",
-        "category",
-        "specification",
-        "unit",
-        "initial_stock",
-        "current_stock",
-        "min_stock",
-        "location",
-        "remark",
-        "created_at",
-        "updated_at",
-    ])
-    for item in Item.objects.all().order_by("-id"):
-        writer.writerow([
-            item.item_code,
-            item.item_name,
-            item.category,
-            item.specification,
-            item.unit,
-            item.initial_stock,
-            item.current_stock,
-            item.min_stock,
-            item.location,
-            item.remark,
-            item.created_at.isoformat(),
-            item.updated_at.isoformat(),
-        ])
-    response = HttpResponse(output.getvalue(), content_type="text/csv")
-    response["Content-Disposition"] = 'attachment; filename="stock.csv"'
-    return response
+    queryset = Item.objects.order_by("-id").values_list(*_EXPORT_COLUMNS)
+    rows = (
+        row[:-2] + (row[-2].isoformat(), row[-1].isoformat())
+        for row in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+    return _stream_csv(_EXPORT_COLUMNS, rows, "stock.csv")
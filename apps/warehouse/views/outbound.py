@@ -1,4 +1,4 @@
-from django.db.models import Q
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 from rest_framework import filters, viewsets
 from django_filters.rest_framework import DjangoFilterBackend
@@ -6,9 +6,55 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 
+from apps.common.rows import FIELDS_QUERY_PARAM, RowSerializer
+from apps.system.flow import instance_to_front, start_for_type
+
 from ..models import Item, OutboundRecord
+from ..search import outbound_q
 from ..serializers import OutboundRecordSerializer
-from .base import _Page, _success, _to_date, _to_int
+from ..stock import OUTBOUND_TARGET_TYPE, InsufficientStock
+from .base import (
+    EXPORT_CHUNK_SIZE,
+    _Page,
+    _date_range,
+    _error,
+    _stream_csv,
+    _success,
+    _to_date,
+    _to_int,
+)
+
+
+# 出库记录创建后按此类型查找启用的审批流程
+OUTBOUND_FLOW_TYPE = "出库审批"
+
+
+def _start_approval(record, item, request):
+    item.refresh_from_db(fields=["current_stock"])
+    context = {
+        "quantity": record.quantity,
+        "item_code": item.item_code,
+        "item_name": item.item_name,
+        "category": item.category,
+        "unit": item.unit,
+        "receiver": record.receiver,
+        "reason": record.reason,
+        "current_stock": item.current_stock,
+        "min_stock": item.min_stock,
+    }
+    applicant = request.user.username if request.user.is_authenticated else ""
+    return start_for_type(OUTBOUND_FLOW_TYPE, OUTBOUND_TARGET_TYPE, record.id, context, applicant)
+
+
+OUTBOUND_ROW = RowSerializer({
+    "id": "id",
+    "item_id": "itemId",
+    "item__item_name": "itemName",
+    "quantity": "quantity",
+    "outbound_date": "outboundDate",
+    "receiver": "receiver",
+    "reason": "reason",
+})
 
 
 class OutboundRecordViewSet(viewsets.ModelViewSet):
@@ -24,31 +70,14 @@ class OutboundRecordViewSet(viewsets.ModelViewSet):
 @permission_classes([AllowAny])
 def outbound_list(request):
     paginator = _Page()
-    queryset = OutboundRecord.objects.select_related("item").all().order_by("-id")
+    queryset = OutboundRecord.objects.all().order_by("-id")
     search = request.query_params.get("search") or request.query_params.get("q")
     if search:
-        queryset = queryset.filter(
-            Q(item__item_name__icontains=search) | Q(receiver__icontains=search)
-        )
-    page = paginator.paginate_queryset(queryset, request)
-    rows = []
-    for rec in page:
-        rows.append({
-            "id": rec.id,
-            "itemId": rec.item_id,
-            "itemName": rec.item.item_name,
-            "quantity": rec.quantity,
-            "outboundDate": rec.outbound_date,
-            "receiver": rec.receiver,
-            "reason": rec.reason,
-        })
-    payload = {
-        "list": rows,
-        "total": paginator.page.paginator.count if paginator.page else queryset.count(),
-        "page": paginator.page.number if paginator.page else 1,
-        "size": paginator.get_page_size(request),
-    }
-    return Response(_success(payload))
+        queryset = queryset.filter(outbound_q(search))
+    keys = ("outbound_date", "id")
+    row = OUTBOUND_ROW.project(request.query_params.get(FIELDS_QUERY_PARAM), keep=keys)
+    page = paginator.paginate(row.values(queryset), request, keys)
+    return Response(_success(paginator.get_payload(row.many(page))))
 
 
 @api_view(["POST"])
@@ -58,20 +87,55 @@ def outbound_add(request):
     item = get_object_or_404(Item, pk=item_id)
     quantity = _to_int(request.data.get("quantity"), 0)
     outbound_date = _to_date(request.data.get("outboundDate") or request.data.get("date"))
-    record = OutboundRecord.objects.create(
-        item=item,
-        quantity=quantity,
-        outbound_date=outbound_date,
-        receiver=request.data.get("receiver") or "",
-        reason=request.data.get("reason") or "",
-        operator=None,
+    try:
+        # 扣减库存与发起审批同时提交或同时回滚
+        with transaction.atomic():
+            record = OutboundRecord.objects.create(
+                item=item,
+                quantity=quantity,
+                outbound_date=outbound_date,
+                receiver=request.data.get("receiver") or "",
+                reason=request.data.get("reason") or "",
+                operator=None,
+            )
+            approval = _start_approval(record, item, request)
+    except InsufficientStock:
+        return Response(_error("库存不足"), status=400)
+    data = OUTBOUND_ROW.from_object(record)
+    data["approval"] = instance_to_front(approval) if approval else None
+    return Response(_success(data, "出库成功"))
+
+
+_EXPORT_HEADER = [
+    "id",
+    "item_code",
+    "item_name",
+    "quantity",
+    "receiver",
+    "outbound_date",
+    "reason",
+    "operator",
+    "created_at",
+]
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def outbound_export(request):
+    queryset = _date_range(OutboundRecord.objects.order_by("-id"), "outbound_date", request.query_params)
+    queryset = queryset.values_list(
+        "id",
+        "item__item_code",
+        "item__item_name",
+        "quantity",
+        "receiver",
+        "outbound_date",
+        "reason",
+        "operator__username",
+        "created_at",
     )
-    return Response(_success({
-        "id": record.id,
-        "itemId": item.id,
-        "itemName": item.item_name,
-        "quantity": record.quantity,
-        "outboundDate": record.outbound_date,
-        "receiver": record.receiver,
-        "reason": record.reason,
-    }, "出库成功"))
+    rows = (
+        row[:-1] + (row[-1].isoformat(),)
+        for row in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+    return _stream_csv(_EXPORT_HEADER, rows, "outbound.csv")
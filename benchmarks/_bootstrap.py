@@ -0,0 +1,42 @@
+"""
+基准脚本公共初始化
+
+默认使用临时目录下的独立 SQLite 库并执行迁移，避免污染开发数据库；
+设置环境变量 BENCH_USE_SETTINGS_DB=1 时改用 settings 中配置的数据库（例如 PostgreSQL）。
+"""
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+
+def setup():
+    """初始化 Django 并迁移基准数据库，返回数据库名称"""
+    import django
+    from django.conf import settings
+
+    db = settings.DATABASES['default']
+    if os.environ.get('BENCH_USE_SETTINGS_DB') != '1':
+        db['NAME'] = os.path.join(tempfile.mkdtemp(prefix='bench_'), 'bench.sqlite3')
+    if db['ENGINE'].endswith('sqlite3'):
+        db.setdefault('OPTIONS', {})['timeout'] = 60
+    django.setup()
+
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0)
+    return db['NAME']
+
+
+@contextmanager
+def timer(label):
+    """打印代码块耗时"""
+    start = time.perf_counter()
+    yield
+    print(f"{label}: {time.perf_counter() - start:.3f}s")
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+"""
+认证上下文缓存基准：同一个已认证列表接口与 userInfo 接口，
+分别使用 simplejwt 的 JWTAuthentication（每次请求查询用户表）、CachedJWTAuthentication
+与无状态模式 StatelessJWTAuthentication，比较每个请求的数据库查询数与每秒请求数
+运行方式: python benchmarks/bench_auth_context.py [--requests 2000] [--groups 5] [--permissions 20]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks._bootstrap import setup  # noqa: E402
+
+URLS = [
+    '/api/users/employee/list/?page=1&size=10',
+    '/api/auth/userInfo/',
+]
+
+
+def populate(groups, permissions):
+    from django.contrib.auth.models import Group, Permission, User
+    from apps.users.models import Employee, UserProfile
+
+    user = User.objects.create_user('bench', password='bench-pass', first_name='基准')
+    UserProfile.objects.create(user=user, department='仓储部', position='仓库主管')
+    perms = list(Permission.objects.order_by('id')[:permissions])
+    user.user_permissions.add(*perms[: permissions // 2])
+    for i in range(groups):
+        group = Group.objects.create(name=f'角色{i}')
+        group.permissions.add(*perms[permissions // 2:])
+        user.groups.add(group)
+    Employee.objects.bulk_create([
+        Employee(work_id=f'E{i:05d}', name=f'员工{i}', department='仓储部', category='正式员工', phone='13800000000')
+        for i in range(50)
+    ])
+    return user
+
+
+def run(client, url, auth, count):
+    """返回 (每个请求的查询数, 每秒请求数)"""
+    from django.db import connection
+
+    executed = []
+
+    def record(execute, sql, params, many, context):
+        executed.append(sql)
+        return execute(sql, params, many, context)
+
+    client.get(url, **auth)
+    # 请求开始时 Django 会清空 queries_log，这里用 execute_wrapper 计数
+    with connection.execute_wrapper(record):
+        response = client.get(url, **auth)
+    assert response.status_code == 200, response.content
+    start = time.perf_counter()
+    for _ in range(count):
+        client.get(url, **auth)
+    return len(executed), count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--groups', type=int, default=5)
+    parser.add_argument('--permissions', type=int, default=20)
+    args = parser.parse_args()
+
+    setup()
+    from django.test import Client
+    from django.urls import resolve
+    from rest_framework_simplejwt.authentication import JWTAuthentication
+    from apps.users.auth_views import CustomTokenObtainPairSerializer
+    from apps.users.authentication import CachedJWTAuthentication, StatelessJWTAuthentication
+
+    user = populate(args.groups, args.permissions)
+    client = Client()
+    # 与登录接口签发的令牌相同，带角色与 perm_hash 声明
+    token = CustomTokenObtainPairSerializer.get_token(user).access_token
+    auth = {'HTTP_AUTHORIZATION': f'Bearer {token}'}
+
+    print(f'{"接口":<44} {"认证方式":<26} {"查询":>4} {"请求/秒":>10}')
+    for url in URLS:
+        view = resolve(url.split('?')[0]).func.cls
+        for auth_class in (JWTAuthentication, CachedJWTAuthentication, StatelessJWTAuthentication):
+            view.authentication_classes = [auth_class]
+            queries, rate = run(client, url, auth, args.requests)
+            print(f'{url:<44} {auth_class.__name__:<26} {queries:>4} {rate:>10,.0f}')
+
+
+if __name__ == '__main__':
+    main()
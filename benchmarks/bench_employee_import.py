@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+"""
+员工导入导出基准：生成合成 CSV（默认 10 万行，含少量重复工号与缺字段的行），
+经 /api/users/employee/import/ 上传导入，统计 SQL 次数、耗时与报错行数；
+--legacy 另取前若干行走旧的逐行 EmployeeSerializer 校验与保存作对比；
+最后测量 /api/users/employee/export/ 流式导出全部员工的耗时
+运行方式: python benchmarks/bench_employee_import.py [--rows 100000] [--legacy 2000]
+"""
+import argparse
+import csv
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks._bootstrap import setup  # noqa: E402
+
+HEADER = ['工号', '姓名', '作业区/科室', '人员类别', '手机号', '是否启用', '备注']
+CATEGORIES = ['正式员工', '临时员工', '实习生', '合同工']
+
+
+class QueryCounter:
+    """用 execute_wrapper 统计查询数（测试客户端每个请求开始时会清空 queries_log）"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def make_csv(rows, prefix):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(HEADER)
+    for i in range(rows):
+        # 每 1000 行一条重复工号、一条缺手机号，覆盖报错路径
+        work_id = f'{prefix}{i - 1:07d}' if i % 1000 == 999 else f'{prefix}{i:07d}'
+        phone = '' if i % 1000 == 500 else f'138{i:08d}'
+        writer.writerow([work_id, f'员工{i}', f'作业区{i % 40:02d}', CATEGORIES[i % len(CATEGORIES)],
+                         phone, '是', ''])
+    return buf.getvalue().encode('utf-8-sig')
+
+
+def legacy_import(content, limit):
+    from apps.users.importer import _normalize
+    from apps.users.serializers import EmployeeSerializer
+
+    reader = csv.DictReader(io.StringIO(content.decode('utf-8-sig')))
+    errors = 0
+    for index, row in enumerate(reader):
+        if index >= limit:
+            break
+        row = _normalize(row)
+        row['enabled'] = True
+        serializer = EmployeeSerializer(data=row)
+        if serializer.is_valid():
+            serializer.save()
+        else:
+            errors += 1
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--legacy', type=int, default=0, help='逐行导入的行数，0 表示不测')
+    args = parser.parse_args()
+
+    setup()
+    from django.core.files.uploadedfile import SimpleUploadedFile
+    from django.db import connection
+    from django.test import Client
+    from apps.users.models import Employee
+
+    client = Client()
+    if args.legacy:
+        content = make_csv(args.legacy, 'L')
+        counter = QueryCounter()
+        with connection.execute_wrapper(counter):
+            start = time.perf_counter()
+            errors = legacy_import(content, args.legacy)
+            elapsed = time.perf_counter() - start
+        print(f'逐行导入 {args.legacy} 行: {elapsed:.2f}s，{args.legacy / elapsed:,.0f} 行/s，'
+              f'{counter.count} 个查询，报错 {errors} 行')
+
+    content = make_csv(args.rows, 'B')
+    counter = QueryCounter()
+    with connection.execute_wrapper(counter):
+        start = time.perf_counter()
+        response = client.post('/api/users/employee/import/',
+                               {'file': SimpleUploadedFile('employees.csv', content, 'text/csv')})
+        elapsed = time.perf_counter() - start
+    assert response.status_code == 200, response.content
+    result = response.json()['data']
+    print(f'批量导入 {args.rows} 行: {elapsed:.2f}s，{args.rows / elapsed:,.0f} 行/s，'
+          f'{counter.count} 个查询，新增 {result["created"]}，报错 {len(result["errors"])} 行')
+
+    counter = QueryCounter()
+    with connection.execute_wrapper(counter):
+        start = time.perf_counter()
+        response = client.post('/api/users/employee/import/',
+                               {'file': SimpleUploadedFile('employees.csv', content, 'text/csv')})
+        elapsed = time.perf_counter() - start
+    result = response.json()['data']
+    print(f'重复导入同一文件: {elapsed:.2f}s，{counter.count} 个查询，新增 {result["created"]}，'
+          f'报错 {len(result["errors"])} 行')
+
+    start = time.perf_counter()
+    response = client.get('/api/users/employee/export/')
+    size = sum(len(chunk) for chunk in response.streaming_content)
+    elapsed = time.perf_counter() - start
+    total = Employee.objects.count()
+    print(f'流式导出 {total} 行: {elapsed:.2f}s，{total / elapsed:,.0f} 行/s，{size / 1024 / 1024:.1f}MB')
+
+
+if __name__ == '__main__':
+    main()
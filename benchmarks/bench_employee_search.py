@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+"""
+员工选择器基准：在大量员工（默认 20 万）上测量 /api/users/employee/list/ 常见查询的延迟，
+包括按作业区/人员类别/启用状态筛选、工号与手机号前缀、手机号后四位、姓名子串；
+每类查询换用不同关键字连续请求，取 p50/p95（总数缓存命中率与真实输入接近）。
+另在查询集上直接测量数据库耗时；--legacy 同时测量旧的 icontains 全表扫描作对比
+运行方式: python benchmarks/bench_employee_search.py [--rows 200000] [--repeat 50] [--legacy]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks._bootstrap import setup  # noqa: E402
+
+SURNAMES = '王李张刘陈杨黄赵吴周徐孙马朱胡郭何高林罗'
+GIVEN = '伟芳娜敏静丽强磊军洋勇艳杰娟涛明超秀霞平刚桂英华建国志红'
+CATEGORIES = ['正式员工', '临时员工', '实习生', '合同工']
+DEPARTMENTS = [f'作业区{i:02d}' for i in range(60)]
+
+
+def populate(rows):
+    from django.db import transaction
+    from apps.users import search
+    from apps.users.models import Employee
+
+    rnd = random.Random(42)
+    batch = 20000
+    for offset in range(0, rows, batch):
+        with transaction.atomic():
+            Employee.objects.bulk_create([
+                Employee(work_id=f'E{i:07d}',
+                         name=rnd.choice(SURNAMES) + ''.join(rnd.choice(GIVEN) for _ in range(rnd.randint(1, 2))),
+                         department=rnd.choice(DEPARTMENTS),
+                         category=rnd.choice(CATEGORIES),
+                         phone=f'1{rnd.choice("3578")}{rnd.randrange(10 ** 9):09d}',
+                         enabled=rnd.random() < 0.9)
+                for i in range(offset, min(offset + batch, rows))
+            ], batch_size=2000)
+    search.rebuild()
+
+
+def cases(rows, rnd):
+    """(名称, 生成查询参数的函数)"""
+    return [
+        ('启用员工首页', lambda: {'enabled': '1'}),
+        ('作业区 + 启用', lambda: {'department': rnd.choice(DEPARTMENTS), 'enabled': '1'}),
+        ('人员类别 + 启用', lambda: {'category': rnd.choice(CATEGORIES), 'enabled': '1'}),
+        ('工号前缀 5 位', lambda: {'search': f'E{rnd.randrange(rows) // 1000:04d}', 'enabled': '1'}),
+        ('工号完整', lambda: {'search': f'E{rnd.randrange(rows):07d}'}),
+        ('手机号前缀 7 位', lambda: {'search': f'1{rnd.choice("3578")}{rnd.randrange(10 ** 5):05d}'}),
+        ('手机号后四位', lambda: {'search': f'{rnd.randrange(10 ** 4):04d}', 'enabled': '1'}),
+        ('姓氏单字', lambda: {'search': rnd.choice(SURNAMES), 'enabled': '1'}),
+        ('姓名两字', lambda: {'search': rnd.choice(SURNAMES) + rnd.choice(GIVEN)}),
+        ('作业区 + 姓名', lambda: {'department': rnd.choice(DEPARTMENTS), 'search': rnd.choice(SURNAMES)}),
+    ]
+
+
+def percentile(samples, pct):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * pct))]
+
+
+def query_ms(params, legacy=False):
+    """只测数据库：与列表接口相同，统计总数并取首页 20 条；legacy 为旧的 icontains 扫描"""
+    from django.db.models import Q
+    from django.http import QueryDict
+    from apps.users.models import Employee
+    from apps.users.views import _filter_employees
+
+    if legacy:
+        queryset = Employee.objects.all()
+        for key in ('department', 'category'):
+            if key in params:
+                queryset = queryset.filter(**{key: params[key]})
+        if 'enabled' in params:
+            queryset = queryset.filter(enabled=True)
+        if 'search' in params:
+            q = params['search']
+            queryset = queryset.filter(Q(name__icontains=q) | Q(work_id__icontains=q) | Q(phone__icontains=q))
+    else:
+        query = QueryDict(mutable=True)
+        query.update(params)
+        queryset = _filter_employees(Employee.objects.all(), query)
+    start = time.perf_counter()
+    queryset.count()
+    list(queryset.order_by('-created_at')[:20])
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--legacy', action='store_true')
+    args = parser.parse_args()
+
+    setup()
+    from django.db import connection
+    from django.test import Client
+    from apps.users import search
+
+    started = time.perf_counter()
+    populate(args.rows)
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+    print(f'写入 {args.rows} 名员工并建索引: {time.perf_counter() - started:.1f}s，搜索后端: {search.backend()}')
+
+    client = Client()
+    rnd = random.Random(7)
+    header = f'{"查询":<14} {"接口p50":>8} {"接口p95":>8} {"平均命中":>10} {"查询p50":>8}'
+    print(header + (f' {"旧查询p50":>8}' if args.legacy else ''))
+    for label, make in cases(args.rows, rnd):
+        samples, totals, direct, legacy = [], [], [], []
+        for _ in range(args.repeat):
+            params = make()
+            start = time.perf_counter()
+            response = client.get('/api/users/employee/list/', dict(params, size=20))
+            samples.append((time.perf_counter() - start) * 1000)
+            assert response.status_code == 200, response.content
+            totals.append(response.json()['data']['total'])
+            if len(direct) < 5:
+                # 换一组关键字，避免命中接口刚写入的总数缓存
+                params = make()
+                direct.append(query_ms(params))
+                if args.legacy:
+                    legacy.append(query_ms(params, legacy=True))
+        line = (f'{label:<14} {statistics.median(samples):>6.1f}ms {percentile(samples, 0.95):>6.1f}ms '
+                f'{statistics.mean(totals):>10,.0f} {statistics.median(direct):>6.1f}ms')
+        if legacy:
+            line += f' {statistics.median(legacy):>7.1f}ms'
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+"""
+JSON 渲染基准：以 stock_list 的真实响应结构（{code, message, data: {list, total, page, size}}，
+每行含 createdAt/updatedAt 两个 datetime）为负载，对比 DRF 默认 JSONRenderer 与
+FastJSONRenderer 的渲染耗时，以及 JSONParser 与 FastJSONParser 解析同一响应体的耗时；
+同时给出 inbound 记录（含 date 与 Decimal）负载的结果。未安装 orjson 时两者相同
+运行方式: python benchmarks/bench_json_render.py [--rows 10,100,1000] [--repeat 200]
+"""
+import argparse
+import io
+import os
+import sys
+import timeit
+from datetime import date, timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks._bootstrap import setup  # noqa: E402
+
+
+def stock_payload(rows):
+    from django.utils import timezone
+    from apps.warehouse.models import Item
+    from apps.warehouse.views.item import _item_to_front
+
+    now = timezone.now()
+    items = [
+        Item(id=i + 1, item_code=f'ELEC{i:07d}', item_name=f'笔记本电脑支架{i}', category='办公用品',
+             specification='铝合金 可调节', unit='个', initial_stock=100, current_stock=i % 120, min_stock=10,
+             location=f'A库-{i % 50:02d}', remark='常用耗材，按月盘点' if i % 3 else '', is_low_stock=i % 120 < 10,
+             created_at=now - timedelta(minutes=i), updated_at=now)
+        for i in range(rows)
+    ]
+    rows = [_item_to_front(item) for item in items]
+    return {'code': 200, 'message': 'success', 'data': {'list': rows, 'total': 125000, 'page': 1, 'size': len(rows)}}
+
+
+def inbound_payload(rows):
+    from django.utils import timezone
+
+    now = timezone.now()
+    today = date.today()
+    rows = [
+        {'id': i + 1, 'itemId': i % 500 + 1, 'itemName': f'防护手套{i % 500}', 'quantity': i % 40 + 1,
+         'price': Decimal('12.50') + i % 7, 'supplier': '华东劳保用品有限公司', 'inboundDate': today - timedelta(days=i % 90),
+         'operator': 'admin', 'remark': '', 'createdAt': now - timedelta(minutes=i)}
+        for i in range(rows)
+    ]
+    return {'code': 200, 'message': 'success', 'data': {'list': rows, 'total': 480000, 'page': 1, 'size': len(rows)}}
+
+
+def best_of(func, number):
+    """5 轮各执行 number 次，取最快一轮的单次耗时（毫秒）"""
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', default='10,100,1000')
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    setup()
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+    from apps.common.parsers import FastJSONParser
+    from apps.common.renderers import FastJSONRenderer, orjson
+
+    print(f'orjson: {orjson.__version__ if orjson else "未安装，回退到标准库"}')
+    print(f'{"负载":<16} {"JSONRenderer":>13} {"Fast":>9} {"加速":>6} {"JSONParser":>11} {"Fast":>9} {"加速":>6} {"字节":>9}')
+    slow_renderer, fast_renderer = JSONRenderer(), FastJSONRenderer()
+    slow_parser, fast_parser = JSONParser(), FastJSONParser()
+    for name, build in (('stock_list', stock_payload), ('inbound_list', inbound_payload)):
+        for rows in [int(r) for r in args.rows.split(',')]:
+            data = build(rows)
+            body = slow_renderer.render(data)
+            assert fast_renderer.render(data) == body, '输出与 JSONRenderer 不一致'
+            number = max(5, args.repeat * 10 // max(rows, 10))
+            render_slow = best_of(lambda: slow_renderer.render(data), number)
+            render_fast = best_of(lambda: fast_renderer.render(data), number)
+            parse_slow = best_of(lambda: slow_parser.parse(io.BytesIO(body)), number)
+            parse_fast = best_of(lambda: fast_parser.parse(io.BytesIO(body)), number)
+            print(f'{name + " x" + str(rows):<16} {render_slow:>11.3f}ms {render_fast:>7.3f}ms '
+                  f'{render_slow / render_fast:>5.1f}x {parse_slow:>9.3f}ms {parse_fast:>7.3f}ms '
+                  f'{parse_slow / parse_fast:>5.1f}x {len(body):>9,}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+"""
+低库存查询基准：物品数增长时，对比 current_stock <= min_stock 全表扫描与
+is_low_stock 标志索引、低库存变化游标查询的延迟
+运行方式: python benchmarks/bench_low_stock.py [--items 500000] [--low-ratio 0.01]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks._bootstrap import setup  # noqa: E402
+
+
+def populate(start, stop, low_ratio, rnd):
+    from django.db import transaction
+    from apps.warehouse.models import Item
+
+    batch = 20000
+    for offset in range(start, stop, batch):
+        objs = []
+        for i in range(offset, min(offset + batch, stop)):
+            low = rnd.random() < low_ratio
+            stock = rnd.randint(0, 10) if low else rnd.randint(11, 1000)
+            objs.append(Item(item_code=f'LOW{i:07d}', item_name=f'物品{i}', category='其他',
+                             current_stock=stock, min_stock=10, is_low_stock=low))
+        with transaction.atomic():
+            Item.objects.bulk_create(objs)
+
+
+def best_ms(fn, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--items', type=int, default=500000)
+    parser.add_argument('--low-ratio', type=float, default=0.01)
+    parser.add_argument('--events', type=int, default=1000, help='每个规模点新增的低库存变化数')
+    args = parser.parse_args()
+
+    setup()
+    from django.db.models import F
+    from apps.warehouse import alerts
+    from apps.warehouse.models import Item, LowStockEvent
+
+    rnd = random.Random(42)
+    checkpoints = sorted({max(args.items // 10, 1), max(args.items // 2, 1), args.items})
+    done = 0
+    print(f'{"物品数":>8} {"扫描首页":>10} {"扫描全部":>10} {"标志首页":>10} {"标志全部":>10} {"变化游标":>10}')
+    for size in checkpoints:
+        populate(done, size, args.low_ratio, rnd)
+        done = size
+        ids = list(Item.objects.filter(is_low_stock=True).values_list('id', flat=True)[:args.events])
+        LowStockEvent.objects.bulk_create([
+            LowStockEvent(item_id=rnd.choice(ids), is_low=True, current_stock=0, min_stock=10)
+            for _ in range(args.events)
+        ])
+        # 客户端持有的游标落后最新事件 20 条
+        cursor = alerts.latest_cursor() - 20
+
+        scan = Item.objects.filter(current_stock__lte=F('min_stock'))
+        flag = Item.objects.filter(is_low_stock=True)
+        print(
+            f'{size:>10} '
+            f'{best_ms(lambda: list(scan[:20])):>11.2f}ms'
+            f'{best_ms(lambda: list(scan.values_list("id", flat=True))):>11.2f}ms'
+            f'{best_ms(lambda: list(flag[:20])):>11.2f}ms'
+            f'{best_ms(lambda: list(flag.values_list("id", flat=True))):>11.2f}ms'
+            f'{best_ms(lambda: alerts.events_after(cursor)):>11.2f}ms'
+        )
+
+
+if __name__ == '__main__':
+    main()
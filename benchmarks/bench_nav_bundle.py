@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+"""
+登录首屏基准：对比前端逐个请求 userInfo、menu/user、route/list、api/list
+与一次请求 /api/auth/bundle/（首次加载、带 If-None-Match 的重复加载、配置变更后）
+的请求数、数据库查询数、响应字节数与耗时
+运行方式: python benchmarks/bench_nav_bundle.py [--menus 200] [--routes 100] [--apis 300]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks._bootstrap import setup  # noqa: E402
+
+LEGACY_URLS = [
+    '/api/auth/userInfo/',
+    '/api/system/menu/user/',
+    '/api/system/route/list/?size=1000',
+    '/api/system/api/list/?size=1000',
+]
+
+
+def populate(menus, routes, apis):
+    from django.contrib.auth.models import Group, User
+    from apps.system.models import ApiConfig, Menu, RouteConfig
+
+    parents = []
+    for i in range(menus):
+        parent = parents[i % len(parents)] if parents and i % 4 else None
+        menu = Menu.objects.create(name=f'菜单{i}', path=f'/m{i}', sort=i, parent=parent, visible=i % 10 != 0)
+        if parent is None:
+            parents.append(menu)
+    RouteConfig.objects.bulk_create([
+        RouteConfig(path=f'/r{i}', name=f'route{i}', component=f'views/r{i}.vue', title=f'路由{i}')
+        for i in range(routes)
+    ])
+    ApiConfig.objects.bulk_create([
+        ApiConfig(name=f'接口{i}', path=f'/api/x{i}', method='GET', category='演示', params='{"page": 1}')
+        for i in range(apis)
+    ])
+    user = User.objects.create_user('bench', password='bench-pass')
+    user.groups.add(Group.objects.create(name='仓库管理员'))
+    return user
+
+
+def load(client, urls, headers):
+    """依次请求 urls，返回 (请求数, 查询数, 字节数, 毫秒, 最后一个响应)"""
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    queries = size = 0
+    response = None
+    start = time.perf_counter()
+    for url in urls:
+        with CaptureQueriesContext(connection) as captured:
+            response = client.get(url, **headers)
+        queries += len(captured)
+        size += len(response.content)
+    return len(urls), queries, size, (time.perf_counter() - start) * 1000, response
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--menus', type=int, default=200)
+    parser.add_argument('--routes', type=int, default=100)
+    parser.add_argument('--apis', type=int, default=300)
+    args = parser.parse_args()
+
+    setup()
+    from django.test import Client
+    from rest_framework_simplejwt.tokens import RefreshToken
+    from apps.system.models import Menu
+
+    user = populate(args.menus, args.routes, args.apis)
+    client = Client()
+    auth = {'HTTP_AUTHORIZATION': f'Bearer {RefreshToken.for_user(user).access_token}'}
+
+    print(f'{"场景":<22} {"请求":>4} {"查询":>6} {"字节":>10} {"耗时":>10}')
+
+    def report(label, result):
+        requests, queries, size, ms, _ = result
+        print(f'{label:<22} {requests:>4} {queries:>6} {size:>10} {ms:>8.1f}ms')
+
+    report('分别请求（首次）', load(client, LEGACY_URLS, auth))
+    report('分别请求（重复）', load(client, LEGACY_URLS, auth))
+
+    cold = load(client, ['/api/auth/bundle/'], auth)
+    report('导航包（首次）', cold)
+    etag = cold[-1]['ETag']
+    warm = load(client, ['/api/auth/bundle/'], {**auth, 'HTTP_IF_NONE_MATCH': etag})
+    report(f'导航包（重复，{warm[-1].status_code}）', warm)
+
+    Menu.objects.order_by('id').first().save()
+    changed = load(client, ['/api/auth/bundle/'], {**auth, 'HTTP_IF_NONE_MATCH': etag})
+    report(f'导航包（配置变更，{changed[-1].status_code}）', changed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+"""
+分页基准：在大量入库记录上对比页码分页与游标分页的首页/深页延迟
+运行方式: python benchmarks/bench_pagination.py [--rows 1000000] [--size 20] [--page 50000]
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks._bootstrap import setup  # noqa: E402
+
+
+def populate(rows):
+    from django.db import transaction
+    from apps.warehouse.models import InboundRecord, Item
+
+    item = Item.objects.create(item_code='PAGE-BENCH', item_name='分页基准', category='其他')
+    start = date(2020, 1, 1)
+    batch = 20000
+    for offset in range(0, rows, batch):
+        with transaction.atomic():
+            # bulk_create 不触发 save()，不会逐条过账库存
+            InboundRecord.objects.bulk_create([
+                InboundRecord(item=item, quantity=1, supplier=f'供应商{i % 100}',
+                              inbound_date=start + timedelta(days=i // 500))
+                for i in range(offset, min(offset + batch, rows))
+            ])
+
+
+def timed_get(client, params, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = client.get('/api/warehouse/inbound/list', params)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    assert response.status_code == 200
+    return best * 1000, response.json()['data']
+
+
+def cursor_at(offset):
+    from apps.warehouse.models import InboundRecord
+    from apps.warehouse.views.base import _encode_cursor
+
+    if offset == 0:
+        return ''
+    row = (InboundRecord.objects.order_by('-inbound_date', '-id')
+           .values_list('inbound_date', 'id')[offset - 1])
+    return _encode_cursor(list(row))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--size', type=int, default=20)
+    parser.add_argument('--page', type=int, default=50000)
+    args = parser.parse_args()
+
+    setup()
+    from django.test import Client
+
+    started = time.perf_counter()
+    populate(args.rows)
+    print(f'生成 {args.rows} 条入库记录用时 {time.perf_counter() - started:.1f}s')
+
+    client = Client()
+    deep = min(args.page, max(args.rows // args.size, 1))
+    for page in (1, deep):
+        ms, data = timed_get(client, {'page': page, 'size': args.size})
+        print(f'offset page={page:<7} {ms:8.2f}ms rows={len(data["list"])}')
+        cursor = cursor_at((page - 1) * args.size)
+        ms, data = timed_get(client, {'cursor': cursor, 'size': args.size})
+        print(f'cursor page={page:<7} {ms:8.2f}ms rows={len(data["list"])}')
+
+
+if __name__ == '__main__':
+    main()
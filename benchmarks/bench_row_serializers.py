@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+"""
+列表行序列化基准：各 *_list 接口取一页数据（默认 1000 行）并转换为响应字典，
+对比旧实现（模型实例 + 手写字典 / ModelSerializer(many=True)）与 RowSerializer
+（values_list 元组 + 生成的转换函数）的每秒行数；两者输出逐行比对，必须一致
+运行方式: python benchmarks/bench_row_serializers.py [--rows 1000] [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks._bootstrap import setup  # noqa: E402
+
+
+def populate(rows):
+    from django.contrib.auth.models import User
+    from django.db import transaction
+    from apps.system.models import ApiConfig, FlowConfig, FlowInstance, RouteConfig
+    from apps.users.models import Employee
+    from apps.warehouse.models import InboundRecord, Item, OutboundRecord
+
+    operator = User.objects.create_user('bench-operator')
+    today = date.today()
+    with transaction.atomic():
+        Item.objects.bulk_create([
+            Item(item_code=f'ELEC{i:07d}', item_name=f'笔记本电脑支架{i}', category='办公用品', specification='铝合金',
+                 unit='个', initial_stock=100, current_stock=i % 120, min_stock=10, location=f'A库-{i % 50:02d}',
+                 remark='常用耗材' if i % 3 else '')
+            for i in range(rows)
+        ])
+        items = list(Item.objects.values_list('id', flat=True))
+        InboundRecord.objects.bulk_create([
+            InboundRecord(item_id=items[i % len(items)], quantity=i % 40 + 1, supplier='华东劳保用品有限公司',
+                          inbound_date=today - timedelta(days=i % 90), operator=operator if i % 2 else None)
+            for i in range(rows)
+        ])
+        OutboundRecord.objects.bulk_create([
+            OutboundRecord(item_id=items[i % len(items)], quantity=1, receiver='张三', reason='领用',
+                           outbound_date=today - timedelta(days=i % 90))
+            for i in range(rows)
+        ])
+        Employee.objects.bulk_create([
+            Employee(work_id=f'E{i:07d}', name=f'员工{i}', department='作业区01', category='正式员工',
+                     phone=f'138{i:08d}')
+            for i in range(rows)
+        ])
+        RouteConfig.objects.bulk_create([RouteConfig(path=f'/p{i}', name=f'r{i}', component='c') for i in range(rows)])
+        ApiConfig.objects.bulk_create([
+            ApiConfig(name=f'a{i}', path=f'/a{i}', method='GET', category='x') for i in range(rows)
+        ])
+        FlowConfig.objects.bulk_create([
+            FlowConfig(name=f'f{i}', type='出库审批', nodes=[{'name': '开始', 'type': 'start'}]) for i in range(rows)
+        ])
+        FlowInstance.objects.bulk_create([
+            FlowInstance(flow_name='出库', target_type='outbound', target_id=i, node_name='主管',
+                         context={'quantity': i}, applicant='op')
+            for i in range(rows)
+        ])
+
+
+def cases(rows):
+    """(名称, 旧实现, 新实现)：均返回一页的行字典列表"""
+    from apps.system.flow import INSTANCE_ROW
+    from apps.system.models import ApiConfig, FlowConfig, FlowInstance, RouteConfig
+    from apps.system.serializers import (
+        API_ROW, FLOW_ROW, ROUTE_ROW, ApiConfigSerializer, FlowConfigSerializer, RouteConfigSerializer,
+    )
+    from apps.users.models import Employee
+    from apps.users.serializers import EMPLOYEE_ROW, EmployeeSerializer
+    from apps.warehouse.models import InboundRecord, Item, OutboundRecord
+    from apps.warehouse.views.inbound import INBOUND_ROW
+    from apps.warehouse.views.item import ITEM_ROW
+    from apps.warehouse.views.outbound import OUTBOUND_ROW
+
+    def legacy_items():
+        return [ITEM_ROW.from_object(obj) for obj in Item.objects.order_by('-id')[:rows]]
+
+    def legacy_inbound():
+        return [
+            {'id': rec.id, 'itemId': rec.item_id, 'itemName': rec.item.item_name, 'quantity': rec.quantity,
+             'inboundDate': rec.inbound_date, 'supplier': rec.supplier,
+             'operatorName': rec.operator.username if rec.operator else '', 'remark': rec.remark}
+            for rec in InboundRecord.objects.select_related('item', 'operator').order_by('-id')[:rows]
+        ]
+
+    def legacy_outbound():
+        return [
+            {'id': rec.id, 'itemId': rec.item_id, 'itemName': rec.item.item_name, 'quantity': rec.quantity,
+             'outboundDate': rec.outbound_date, 'receiver': rec.receiver, 'reason': rec.reason}
+            for rec in OutboundRecord.objects.select_related('item').order_by('-id')[:rows]
+        ]
+
+    def legacy_instances():
+        return [INSTANCE_ROW.from_object(obj) for obj in FlowInstance.objects.order_by('-id')[:rows]]
+
+    def fast(row_serializer, queryset):
+        return lambda: row_serializer.many(row_serializer.values(queryset)[:rows])
+
+    return [
+        ('stock_list', legacy_items, fast(ITEM_ROW, Item.objects.order_by('-id'))),
+        ('inbound_list', legacy_inbound, fast(INBOUND_ROW, InboundRecord.objects.order_by('-id'))),
+        ('outbound_list', legacy_outbound, fast(OUTBOUND_ROW, OutboundRecord.objects.order_by('-id'))),
+        ('employee_list', lambda: EmployeeSerializer(Employee.objects.order_by('-created_at')[:rows], many=True).data,
+         fast(EMPLOYEE_ROW, Employee.objects.order_by('-created_at'))),
+        ('flow_instance_list', legacy_instances, fast(INSTANCE_ROW, FlowInstance.objects.order_by('-id'))),
+        ('route_list 快照', lambda: RouteConfigSerializer(RouteConfig.objects.order_by('sort', '-created_at')[:rows],
+                                                        many=True).data,
+         fast(ROUTE_ROW, RouteConfig.objects.order_by('sort', '-created_at'))),
+        ('api_list 快照', lambda: ApiConfigSerializer(ApiConfig.objects.order_by('-created_at')[:rows], many=True).data,
+         fast(API_ROW, ApiConfig.objects.order_by('-created_at'))),
+        ('flow_list 快照', lambda: FlowConfigSerializer(FlowConfig.objects.order_by('-created_at')[:rows],
+                                                      many=True).data,
+         fast(FLOW_ROW, FlowConfig.objects.order_by('-created_at'))),
+    ]
+
+
+def rate(func, rows, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return rows / best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    setup()
+    populate(args.rows)
+    print(f'{"列表":<20} {"旧实现":>12} {"RowSerializer":>14} {"加速":>6}')
+    for name, legacy, fast in cases(args.rows):
+        expected = [dict(row) for row in legacy()]
+        assert fast() == expected, f'{name} 输出不一致'
+        old_rate = rate(legacy, args.rows, args.repeat)
+        new_rate = rate(fast, args.rows, args.repeat)
+        print(f'{name:<20} {old_rate:>9,.0f}行/s {new_rate:>11,.0f}行/s {new_rate / old_rate:>5.1f}x')
+
+
+if __name__ == '__main__':
+    main()
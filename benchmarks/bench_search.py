@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+"""
+搜索基准：大量物品上对比 icontains 顺序扫描与 FTS5 索引查询的延迟
+运行方式: python benchmarks/bench_search.py [--rows 1000000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks._bootstrap import setup  # noqa: E402
+
+PREFIXES = ['笔记本', '台式', '显示器', '签字', '打印', '复印', '办公', '工业', '防护', '电动']
+SUFFIXES = ['电脑', '支架', '笔', '纸', '墨盒', '手套', '螺丝刀', '扳手', '胶带', '文件夹']
+QUERIES = ['笔', '显示器支架', '防护手套', 'ELEC0001', '9999']
+
+
+def populate(rows):
+    from django.db import transaction
+    from apps.warehouse.models import Item
+
+    rnd = random.Random(42)
+    batch = 20000
+    for offset in range(0, rows, batch):
+        with transaction.atomic():
+            Item.objects.bulk_create([
+                Item(item_code=f'ELEC{i:07d}',
+                     item_name=f'{rnd.choice(PREFIXES)}{rnd.choice(SUFFIXES)}{i}',
+                     category='其他')
+                for i in range(offset, min(offset + batch, rows))
+            ])
+
+
+def timed(queryset, repeat=3):
+    """与列表接口相同：统计总数并取首页 20 条"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        total = queryset.count()
+        list(queryset.order_by('-id').values_list('id', flat=True)[:20])
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000, total
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=1000000)
+    args = parser.parse_args()
+
+    setup()
+    from django.db.models import Q
+    from apps.warehouse import search
+    from apps.warehouse.models import Item
+
+    started = time.perf_counter()
+    populate(args.rows)
+    print(f'生成 {args.rows} 个物品用时 {time.perf_counter() - started:.1f}s')
+    started = time.perf_counter()
+    search.rebuild()
+    print(f'重建索引用时 {time.perf_counter() - started:.1f}s')
+
+    for query in QUERIES:
+        legacy = Item.objects.filter(Q(item_code__icontains=query) | Q(item_name__icontains=query))
+        ms_legacy, n_legacy = timed(legacy)
+        ms_fts, n_fts = timed(Item.objects.filter(search.item_q(query)))
+        print(f'{query:<10} icontains={ms_legacy:8.2f}ms ({n_legacy})  fts5={ms_fts:8.2f}ms ({n_fts})')
+
+
+if __name__ == '__main__':
+    main()
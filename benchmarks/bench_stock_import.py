@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+"""
+批量导入基准：生成合成 CSV，统计每次导入的 SQL 次数与耗时
+运行方式: python benchmarks/bench_stock_import.py [--rows 10000,100000] [--legacy]
+
+第二轮导入相同编号（名称改变）以覆盖更新路径；--legacy 同时跑旧的逐行 update_or_create。
+"""
+import argparse
+import csv
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks._bootstrap import setup  # noqa: E402
+
+HEADER = ['item_code', 'item_name', 'category', 'specification', 'unit',
+          'initial_stock', 'current_stock', 'min_stock', 'location', 'remark']
+
+
+def make_csv(rows, prefix, name_suffix=''):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(HEADER)
+    for i in range(rows):
+        writer.writerow([f'{prefix}{i:07d}', f'物品{prefix}{i}{name_suffix}', '办公用品', '规格', '个',
+                         i % 100, i % 100, 10, f'A库-{i % 50:02d}', ''])
+    return buf.getvalue()
+
+
+def _legacy_import(rows):
+    from django.db import transaction
+    from apps.warehouse.importer import _row_defaults, _text
+    from apps.warehouse.models import Item
+
+    with transaction.atomic():
+        for row in rows:
+            code, name = _text(row.get('item_code')), _text(row.get('item_name'))
+            if Item.objects.filter(item_name=name).exists():
+                continue
+            Item.objects.update_or_create(item_code=code, defaults=_row_defaults(row, name))
+
+
+def run(label, content, legacy=False):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from apps.warehouse.importer import import_items
+
+    rows = list(csv.DictReader(io.StringIO(content)))
+    with CaptureQueriesContext(connection) as ctx:
+        start = time.perf_counter()
+        if legacy:
+            _legacy_import(rows)
+            summary = ''
+        else:
+            result = import_items(rows)
+            summary = f"created={result['created']} updated={result['updated']} errors={len(result['errors'])}"
+        elapsed = time.perf_counter() - start
+    print(f"{label:<28} rows={len(rows):<7} queries={len(ctx.captured_queries):<7} "
+          f"{elapsed:7.2f}s {len(rows) / elapsed:>9.0f} rows/s {summary}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', default='10000,100000')
+    parser.add_argument('--legacy', action='store_true')
+    args = parser.parse_args()
+
+    setup()
+    for n in [int(r) for r in args.rows.split(',')]:
+        prefix = f'B{n}-'
+        run(f'bulk create {n}', make_csv(n, prefix))
+        run(f'bulk update {n}', make_csv(n, prefix, '-v2'))
+        if args.legacy:
+            legacy_prefix = f'L{n}-'
+            run(f'legacy create {n}', make_csv(n, legacy_prefix), legacy=True)
+
+
+if __name__ == '__main__':
+    main()
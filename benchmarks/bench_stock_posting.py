@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+"""
+库存过账并发基准：多个线程同时对同一物品入库/出库，校验最终库存精确一致
+运行方式: python benchmarks/bench_stock_posting.py [--postings 4000] [--workers 1,2,4,8] [--legacy]
+
+--legacy 使用旧的“读取-修改-整行保存”方式，用于对比丢失更新的数量。
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks._bootstrap import setup  # noqa: E402
+
+
+def _post(item_id, quantities, legacy):
+    from django.db import connection
+    from apps.warehouse.models import InboundRecord, Item, OutboundRecord
+
+    try:
+        for qty in quantities:
+            if legacy:
+                # 旧实现：读取整行，在 Python 中修改后整行写回
+                item = Item.objects.get(pk=item_id)
+                item.current_stock += qty
+                item.save()
+            elif qty >= 0:
+                InboundRecord.objects.create(
+                    item_id=item_id, quantity=qty, supplier='bench', inbound_date=date.today(),
+                )
+            else:
+                OutboundRecord.objects.create(
+                    item_id=item_id, quantity=-qty, receiver='bench', outbound_date=date.today(), reason='bench',
+                )
+    finally:
+        connection.close()
+
+
+def run(postings, workers, legacy):
+    from apps.warehouse.models import Item
+
+    item = Item.objects.create(item_code=f'BENCH-{workers}', item_name=f'并发基准-{workers}',
+                               category='其他', current_stock=1000)
+    quantities = [(i % 7) + 1 if i % 3 else -((i % 5) + 1) for i in range(postings)]
+    expected = item.current_stock + sum(quantities)
+    chunks = [quantities[i::workers] for i in range(workers)]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(lambda chunk: _post(item.pk, chunk, legacy), chunks))
+    elapsed = time.perf_counter() - start
+
+    final = Item.objects.get(pk=item.pk).current_stock
+    status = 'OK' if final == expected else f'LOST {expected - final}'
+    print(f"workers={workers:<3} postings={postings:<6} {postings / elapsed:>9.1f}/s "
+          f"expected={expected} final={final} {status}")
+    return final == expected
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--postings', type=int, default=4000)
+    parser.add_argument('--workers', default='1,2,4,8')
+    parser.add_argument('--legacy', action='store_true')
+    args = parser.parse_args()
+
+    setup()
+    ok = True
+    for workers in [int(w) for w in args.workers.split(',')]:
+        ok = run(args.postings, workers, args.legacy) and ok
+    sys.exit(0 if ok or args.legacy else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+"""
+令牌撤销列表基准：预置大量撤销记录（默认 100 万条，其中一成已过期），测量
+布隆过滤器重建耗时与内存、未撤销 / 已撤销 jti 的检查速度与实际查库次数（误判），
+带轮换的 /api/auth/refresh/ 连续刷新吞吐与每次刷新的查询数，以及过期记录清理耗时
+运行方式: python benchmarks/bench_token_refresh.py [--revoked 1000000] [--refreshes 2000] [--checks 200000]
+"""
+import argparse
+import os
+import sys
+import time
+import uuid
+from datetime import timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks._bootstrap import setup, timer  # noqa: E402
+
+
+class QueryCounter:
+    """用 execute_wrapper 统计查询数（测试客户端每个请求开始时会清空 queries_log）"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def populate(count, user):
+    from django.db import transaction
+    from django.utils import timezone
+    from apps.users.models import RevokedToken
+
+    now = timezone.now()
+    for offset in range(0, count, 20000):
+        rows = [
+            RevokedToken(
+                jti=uuid.uuid4().hex,
+                token_type='refresh',
+                user=user,
+                # 一成已过期，供清理测试
+                expires_at=now + (timedelta(days=-1) if i % 10 == 0 else timedelta(days=7)),
+            )
+            for i in range(offset, min(offset + 20000, count))
+        ]
+        with transaction.atomic():
+            RevokedToken.objects.bulk_create(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--revoked', type=int, default=1000000)
+    parser.add_argument('--refreshes', type=int, default=2000)
+    parser.add_argument('--checks', type=int, default=200000)
+    args = parser.parse_args()
+
+    setup()
+    from django.contrib.auth.models import User
+    from django.db import connection
+    from django.test import Client
+    from django.utils import timezone
+    from apps.users import revocation
+    from apps.users.auth_views import CustomTokenObtainPairSerializer
+    from apps.users.models import RevokedToken
+
+    user = User.objects.create_user('bench', password='bench-pass')
+    with timer(f'写入 {args.revoked} 条撤销记录'):
+        populate(args.revoked, user)
+
+    start = time.perf_counter()
+    revocation.build_filter()
+    bloom = revocation._state.bloom
+    print(f'布隆过滤器重建: {time.perf_counter() - start:.2f}s，{bloom.count} 条，'
+          f'{len(bloom.bits) / 1024 / 1024:.2f}MB，{bloom.hashes} 个散列')
+
+    fresh = [uuid.uuid4().hex for _ in range(args.checks)]
+    counter = QueryCounter()
+    with connection.execute_wrapper(counter):
+        start = time.perf_counter()
+        revoked = sum(revocation.is_revoked(jti) for jti in fresh)
+        elapsed = time.perf_counter() - start
+    print(f'未撤销 jti 检查: {args.checks / elapsed:,.0f} 次/秒，命中 {revoked}，'
+          f'查库 {counter.count} 次（误判率 {counter.count / args.checks:.2%}）')
+
+    sample = list(RevokedToken.objects.filter(expires_at__gt=timezone.now()).values_list('jti', flat=True)[:2000])
+    start = time.perf_counter()
+    confirmed = sum(revocation.is_revoked(jti) for jti in sample)
+    elapsed = time.perf_counter() - start
+    print(f'已撤销 jti 检查: {len(sample) / elapsed:,.0f} 次/秒，确认 {confirmed}/{len(sample)}')
+
+    client = Client()
+    refresh = str(CustomTokenObtainPairSerializer.get_token(user))
+    counter = QueryCounter()
+    with connection.execute_wrapper(counter):
+        start = time.perf_counter()
+        for _ in range(args.refreshes):
+            response = client.post('/api/auth/refresh/', {'refresh': refresh}, content_type='application/json')
+            assert response.status_code == 200, response.content
+            refresh = response.json()['data']['refresh']
+        elapsed = time.perf_counter() - start
+    print(f'轮换刷新: {args.refreshes / elapsed:,.0f} 次/秒，每次 {counter.count / args.refreshes:.1f} 个查询')
+
+    first = client.post('/api/auth/refresh/', {'refresh': refresh}, content_type='application/json')
+    replay = client.post('/api/auth/refresh/', {'refresh': refresh}, content_type='application/json')
+    print(f'同一刷新令牌：首次使用 {first.status_code}，重放 {replay.status_code}')
+
+    with timer('清理过期撤销记录'):
+        deleted = revocation.prune()
+    print(f'删除 {deleted} 条，剩余 {RevokedToken.objects.count()} 条')
+
+
+if __name__ == '__main__':
+    main()
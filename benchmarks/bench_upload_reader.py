@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+"""
+上传文件读取基准：对比旧的 pandas 整表读取与新的流式读取的峰值内存与耗时
+运行方式: python benchmarks/bench_upload_reader.py [--sizes 10,200] [--xlsx]
+
+sizes 单位为 MB；旧实现需要安装 pandas，未安装时只测新实现。
+"""
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks._bootstrap import setup  # noqa: E402
+
+
+class _Upload:
+    """模拟 Django UploadedFile 的最小接口"""
+
+    def __init__(self, path):
+        self.name = path
+        self.file = open(path, 'rb')
+
+
+def _legacy_read_upload_rows(upload):
+    """旧实现：pandas 读取整表并转换为 dict 列表"""
+    import pandas as pd
+
+    df = None
+    if upload.name.endswith('.csv'):
+        for enc in ['utf-8-sig', 'gbk', None]:
+            upload.file.seek(0)
+            try:
+                df = pd.read_csv(upload.file, encoding=enc or 'utf-8', engine='python')
+                break
+            except Exception:
+                continue
+    else:
+        upload.file.seek(0)
+        df = pd.read_excel(upload.file, engine='openpyxl')
+    df = df.rename(columns=lambda c: str(c).strip()).fillna('')
+    return df.to_dict(orient='records'), None
+
+
+def make_csv(path, megabytes):
+    target = megabytes * 1024 * 1024
+    with open(path, 'w', encoding='utf-8', newline='') as fh:
+        writer = csv.writer(fh)
+        writer.writerow(['item_code', 'item_name', 'category', 'specification', 'unit',
+                         'initial_stock', 'current_stock', 'min_stock', 'location', 'remark'])
+        i = 0
+        while fh.tell() < target:
+            for _ in range(1000):
+                writer.writerow([f'C{i:08d}', f'物品名称{i}', '办公用品', '规格型号说明', '个',
+                                 i % 100, i % 100, 10, f'A库-{i % 50:02d}', '备注信息'])
+                i += 1
+    return i
+
+
+def make_xlsx(path, rows):
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(['item_code', 'item_name', 'current_stock'])
+    for i in range(rows):
+        ws.append([f'C{i:08d}', f'物品名称{i}', i % 100])
+    wb.save(path)
+
+
+def measure(label, reader, path):
+    upload = _Upload(path)
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows, err = reader(upload)
+    first = None
+    count = 0
+    for _ in rows:
+        if first is None:
+            first = time.perf_counter() - start
+        count += 1
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    upload.file.close()
+    print(f"{label:<22} rows={count:<9} first_row={first or 0:7.3f}s total={elapsed:7.2f}s "
+          f"peak={peak / 1024 / 1024:8.1f}MB")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', default='10,200')
+    parser.add_argument('--xlsx', action='store_true')
+    args = parser.parse_args()
+
+    setup()
+    from apps.common.uploads import read_upload_rows as _read_upload_rows
+
+    try:
+        import pandas  # noqa: F401
+        legacy = True
+    except ImportError:
+        legacy = False
+        print('未安装 pandas，跳过旧实现对比')
+
+    workdir = tempfile.mkdtemp(prefix='bench_upload_')
+    for mb in [int(s) for s in args.sizes.split(',')]:
+        path = os.path.join(workdir, f'upload_{mb}mb.csv')
+        rows = make_csv(path, mb)
+        print(f'--- csv {mb}MB ({rows} rows)')
+        measure('stream csv', _read_upload_rows, path)
+        if legacy:
+            measure('pandas csv', _legacy_read_upload_rows, path)
+
+    if args.xlsx:
+        path = os.path.join(workdir, 'upload.xlsx')
+        make_xlsx(path, 100000)
+        print('--- xlsx 100000 rows')
+        measure('stream xlsx', _read_upload_rows, path)
+        if legacy:
+            measure('pandas xlsx', _legacy_read_upload_rows, path)
+
+
+if __name__ == '__main__':
+    main()
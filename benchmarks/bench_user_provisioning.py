@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+"""
+用户开通与登录基准：对每种可用的密码哈希算法，比较逐个 create_user 与
+provision_users（进程池哈希 + bulk_create）的开通速度，以及 /api/auth/login/ 的每秒登录数。
+未安装依赖库的算法（argon2-cffi、bcrypt）会跳过
+运行方式: python benchmarks/bench_user_provisioning.py [--users 200] [--serial 20] [--logins 20] [--workers N]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks._bootstrap import setup  # noqa: E402
+
+HASHERS = ['pbkdf2', 'scrypt', 'argon2', 'bcrypt']
+
+
+def available(path):
+    from django.utils.module_loading import import_string
+
+    hasher = import_string(path)()
+    if hasher.library is None:
+        return True
+    try:
+        hasher._load_library()
+    except ValueError:
+        return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--serial', type=int, default=20, help='逐个创建的用户数（按此估算速度）')
+    parser.add_argument('--logins', type=int, default=20)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    setup()
+    from django.conf import settings
+    from django.contrib.auth.hashers import get_hashers
+    from django.contrib.auth.models import User
+    from django.test import Client, override_settings
+    from apps.users.models import UserProfile
+    from apps.users.provisioning import hash_workers, provision_users
+
+    workers = args.workers or hash_workers()
+    print(f'哈希进程数: {workers}')
+    print(f'{"算法":<8} {"逐个创建":>12} {"批量开通":>12} {"登录":>10}')
+    for name in HASHERS:
+        path = settings._PASSWORD_HASHER_CLASSES[name]
+        if not available(path):
+            print(f'{name:<8} 未安装依赖库，跳过')
+            continue
+        with override_settings(PASSWORD_HASHERS=[path]):
+            get_hashers.cache_clear()
+
+            start = time.perf_counter()
+            for i in range(args.serial):
+                user = User.objects.create_user(f'{name}-serial-{i}', password='Op@123456')
+                UserProfile.objects.create(user=user)
+            serial_rate = args.serial / (time.perf_counter() - start)
+
+            rows = [{'username': f'{name}-{i}', 'department': '仓储部', 'position': '仓库操作员'}
+                    for i in range(args.users)]
+            start = time.perf_counter()
+            result = provision_users(rows, default_password='Op@123456', workers=workers)
+            bulk_rate = result['created'] / (time.perf_counter() - start)
+
+            client = Client()
+            start = time.perf_counter()
+            for i in range(args.logins):
+                response = client.post('/api/auth/login/', {'username': f'{name}-{i % args.users}', 'password': 'Op@123456'},
+                                       content_type='application/json')
+                assert response.status_code == 200, response.content
+            login_rate = args.logins / (time.perf_counter() - start)
+        get_hashers.cache_clear()
+        print(f'{name:<8} {serial_rate:>9,.1f}个/s {bulk_rate:>9,.1f}个/s {login_rate:>7,.1f}次/s')
+
+
+if __name__ == '__main__':
+    main()
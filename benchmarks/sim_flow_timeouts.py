@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+"""
+审批超时模拟：用模拟时钟推进时间，按固定步长调用 process_timeouts，
+核对每一步到期处理的实例数与预期一致（驳回 / 升级 / 升级后再次超时），
+并报告每一步的查询数与耗时；最后打印到期查询的执行计划，确认走 (status, deadline) 索引
+运行方式: python benchmarks/sim_flow_timeouts.py [--instances 200000] [--hours 48] [--step 1]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks._bootstrap import setup  # noqa: E402
+
+NODES = [
+    {'name': '开始', 'type': 'start'},
+    {'name': '部门主管审批', 'type': 'approval', 'approvers': ['张三'], 'approvalType': 'or'},
+    {'name': '总经理审批', 'type': 'approval', 'approvers': ['赵六'], 'approvalType': 'or'},
+    {'name': '结束', 'type': 'end'},
+]
+TIMEOUT_HOURS = 8
+
+
+class SimulatedClock:
+    """只在 advance 时前进的时钟"""
+
+    def __init__(self, start):
+        self._now = start
+
+    def now(self):
+        return self._now
+
+    def advance(self, delta):
+        self._now += delta
+
+
+def expected_events(deadlines, origin, step):
+    """
+    按配置推算每次超时被处理的时钟时刻：到期实例在截止时间之后的第一个时钟步被处理。
+    驳回流程超时一次即结束；升级流程进入下一节点，截止时间从处理时刻重新起算，
+    再次超时后被驳回
+    """
+    def tick(moment):
+        return origin + step * -(-(moment - origin) // step)
+
+    events = []
+    for escalate, deadline in deadlines:
+        first = tick(deadline)
+        events.append(first)
+        if escalate:
+            events.append(tick(first + timedelta(hours=TIMEOUT_HOURS)))
+    events.sort()
+    return events
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--instances', type=int, default=200000)
+    parser.add_argument('--hours', type=int, default=48, help='模拟时长（小时）')
+    parser.add_argument('--step', type=float, default=1, help='时钟步长（小时）')
+    parser.add_argument('--batch-size', type=int, default=500)
+    args = parser.parse_args()
+
+    setup()
+    from django.db import connection, transaction
+    from django.test.utils import CaptureQueriesContext
+    from django.utils import timezone
+    from apps.system import flow
+    from apps.system.models import FlowConfig, FlowInstance
+
+    rnd = random.Random(11)
+    reject_flow = FlowConfig.objects.create(name='领用审批', type='领用审批', nodes=NODES,
+                                            timeout=TIMEOUT_HOURS, timeout_action='reject')
+    escalate_flow = FlowConfig.objects.create(name='出库审批流程', type='出库审批', nodes=NODES,
+                                              timeout=TIMEOUT_HOURS, timeout_action='escalate')
+    clock = SimulatedClock(timezone.now().replace(minute=0, second=0, microsecond=0))
+    horizon = timedelta(hours=args.hours)
+
+    # 截止时间分布在整个模拟时长内，另有一部分落在模拟结束之后，不应被处理
+    deadlines = []
+    start = time.perf_counter()
+    for offset in range(0, args.instances, 5000):
+        rows = []
+        for i in range(offset, min(offset + 5000, args.instances)):
+            escalate = i % 2 == 1
+            deadline = clock.now() + timedelta(seconds=rnd.randint(1, int(horizon.total_seconds() * 1.25)))
+            deadlines.append((escalate, deadline))
+            config = escalate_flow if escalate else reject_flow
+            rows.append(FlowInstance(flow_id=config.id, flow_name=config.name, target_type='outbound',
+                                     target_id=i, node_index=1, node_name='部门主管审批', deadline=deadline))
+        with transaction.atomic():
+            FlowInstance.objects.bulk_create(rows)
+    print(f'创建 {args.instances} 个进行中实例: {time.perf_counter() - start:.2f}s')
+
+    end = clock.now() + horizon
+    step = timedelta(hours=args.step)
+    events = expected_events(deadlines, clock.now(), step)
+    processed = expected = 0
+    print(f'{"时钟":<18} {"到期":>7} {"驳回":>7} {"升级":>7} {"查询":>6} {"耗时":>10}')
+    while clock.now() < end:
+        clock.advance(step)
+        with CaptureQueriesContext(connection) as captured:
+            begin = time.perf_counter()
+            result = flow.process_timeouts(now=clock.now(), batch_size=args.batch_size)
+            ms = (time.perf_counter() - begin) * 1000
+        processed += result['expired']
+        while expected < len(events) and events[expected] <= clock.now():
+            expected += 1
+        status = '' if expected == processed else f'  不一致：预期累计 {expected}，实际 {processed}'
+        print(f'{clock.now():%m-%d %H:%M}        {result["expired"]:>7} {result["rejected"]:>7} '
+              f'{result["escalated"]:>7} {len(captured):>6} {ms:>8.1f}ms{status}')
+
+    pending = FlowInstance.objects.filter(status='pending').count()
+    overdue = FlowInstance.objects.filter(status='pending', deadline__lte=clock.now()).count()
+    print(f'模拟结束: 仍在审批中 {pending} 个，其中已过截止时间 {overdue} 个（应为 0）')
+
+    queryset = (
+        FlowInstance.objects.filter(status='pending', deadline__lte=clock.now())
+        .order_by('deadline', 'id').only('id')[:args.batch_size]
+    )
+    print('到期查询执行计划:')
+    print(queryset.explain())
+
+
+if __name__ == '__main__':
+    main()
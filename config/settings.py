@@ -28,6 +28,7 @@ INSTALLED_APPS = [
     'django_filters',
     
     # Local apps
+    'apps.common',
     'apps.warehouse',
     'apps.users',
     'apps.system',
@@ -71,6 +72,21 @@ DATABASES = {
     }
 }
 
+# 新密码使用的哈希算法：pbkdf2（默认）、scrypt、argon2（需安装 argon2-cffi）、bcrypt（需安装 bcrypt）。
+# 其余算法保留用于校验已有密码，用户登录成功后密码哈希自动升级为所选算法
+PASSWORD_HASHER = 'pbkdf2'
+_PASSWORD_HASHER_CLASSES = {
+    'pbkdf2': 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'scrypt': 'django.contrib.auth.hashers.ScryptPasswordHasher',
+    'argon2': 'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'bcrypt': 'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+}
+PASSWORD_HASHERS = [_PASSWORD_HASHER_CLASSES[PASSWORD_HASHER]] + [
+    path for name, path in _PASSWORD_HASHER_CLASSES.items() if name != PASSWORD_HASHER
+] + ['django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher']
+# 批量开通用户时并行哈希密码的进程数，None 表示 CPU 核数
+PASSWORD_HASH_WORKERS = None
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -96,16 +112,32 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# 上传文件（后台导入任务的原始文件）
+MEDIA_URL = 'media/'
+MEDIA_ROOT = BASE_DIR / 'media'
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # REST Framework配置
 REST_FRAMEWORK = {
+    # 改为 apps.users.authentication.StatelessJWTAuthentication 启用无状态模式：
+    # 令牌声明与当前权限一致时不还原 User，直接用声明构造轻量用户
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.users.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    # 安装 orjson 时用它序列化响应、解析 JSON 请求体，未安装时行为与 DRF 默认一致
+    'DEFAULT_RENDERER_CLASSES': (
+        'apps.common.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'apps.common.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
     'DEFAULT_FILTER_BACKENDS': (
@@ -115,11 +147,47 @@ REST_FRAMEWORK = {
     ),
 }
 
+# 列表总数统计
+# 精确总数的缓存秒数（按 SQL 与相关表版本号缓存，写入后自动失效）
+LIST_COUNT_CACHE_TIMEOUT = 60
+# 各进程读取表版本号（数据库中）的最小间隔（秒），即其他 worker 写入后列表总数的最大滞后
+LIST_COUNT_VERSION_POLL_INTERVAL = 1.0
+# 无过滤条件的列表在数据库统计行数达到该值时返回估算总数，None 表示始终精确统计
+LIST_COUNT_ESTIMATE_THRESHOLD = None
+
+# 系统配置缓存：各进程读取 ConfigVersion 版本号的最小间隔（秒），即跨进程配置变更的最大可见延迟
+CONFIG_VERSION_POLL_INTERVAL = 1.0
+
+# 认证上下文缓存（用户行、资料、角色与权限）的秒数；变更经认证版本号失效，该值只决定旧条目占用缓存的时长
+AUTH_CONTEXT_CACHE_TIMEOUT = 300
+# 认证版本号（数据库中）的复用间隔（秒）：0 表示每次读取缓存前都查询，账号停用、权限变更对所有进程立即生效
+AUTH_VERSION_POLL_INTERVAL = 0
+# JWT 撤销列表：各进程从 RevokedToken 表增量加载的最小间隔（秒），即跨进程退出登录的最大生效延迟
+JWT_REVOCATION_REFRESH_INTERVAL = 5.0
+# 撤销列表布隆过滤器：按未过期记录重建的间隔（秒）与目标误判率（误判时多一次按 jti 的查询）
+JWT_REVOCATION_REBUILD_INTERVAL = 3600
+JWT_REVOCATION_FALSE_POSITIVE_RATE = 0.01
+# 重建布隆过滤器时每次刷新最多加载的撤销记录数，限制单个请求内的加载量
+JWT_REVOCATION_REBUILD_BATCH = 20000
+
+# 仓库配置
+# 是否允许出库后库存为负；设为 False 时出库过账附加 current_stock >= 数量 的条件
+WAREHOUSE_ALLOW_NEGATIVE_STOCK = True
+# 低库存推送：等待新事件时的数据库轮询间隔（秒）、长轮询最长等待（秒）、单个 SSE 连接最长保持（秒）
+LOW_STOCK_POLL_INTERVAL = 1.0
+LOW_STOCK_LONG_POLL_TIMEOUT = 25
+LOW_STOCK_STREAM_SECONDS = 300
+# 低库存事件的提交窗口（秒）：id 空缺之后的事件写入超过该时长才送达，应大于最长的过账事务
+LOW_STOCK_COMMIT_WINDOW = 5.0
+# 每个进程同时保持的 SSE 连接数上限；每个连接占用一个同步 worker，超出时返回 503，客户端应改用长轮询
+LOW_STOCK_MAX_STREAMS = 4
+
 # JWT配置
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=24),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
-    'ROTATE_REFRESH_TOKENS': False,
+    # 刷新时签发新的刷新令牌，旧令牌写入撤销列表（apps.users.revocation），不依赖 token_blacklist 应用
+    'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': True,
     'ALGORITHM': 'HS256',
     'SIGNING_KEY': SECRET_KEY,
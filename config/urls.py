@@ -6,6 +6,7 @@ from apps.users.auth_views import (
     refresh_token,
     user_info,
     logout_view,
+    nav_bundle,
 )
 
 urlpatterns = [
@@ -15,6 +16,7 @@ urlpatterns = [
     path('api/auth/login/', CustomTokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('api/auth/refresh/', refresh_token, name='token_refresh'),
     path('api/auth/userInfo/', user_info, name='user_info'),
+    path('api/auth/bundle/', nav_bundle, name='nav_bundle'),
     path('api/auth/logout/', logout_view, name='user_logout'),
     
     # 应用路由